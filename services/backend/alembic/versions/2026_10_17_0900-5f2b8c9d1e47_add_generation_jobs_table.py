@@ -0,0 +1,52 @@
+"""add_generation_jobs_table
+
+Revision ID: 5f2b8c9d1e47
+Revises: 17871d084aab
+Create Date: 2026-10-17 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2b8c9d1e47'
+down_revision: Union[str, Sequence[str], None] = '17871d084aab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Create generation_jobs table used as the worker queue
+    op.create_table(
+        'generation_jobs',
+        sqlmodel.Column('id', sqlmodel.String(), nullable=False),
+        sqlmodel.Column('creation_date', sqlmodel.DateTime(), nullable=False),
+        sqlmodel.Column('updated_date', sqlmodel.DateTime(), nullable=False),
+        sqlmodel.Column('generation_id', sqlmodel.String(), nullable=False),
+        sqlmodel.Column('payload', sa.JSON(), nullable=False),
+        sqlmodel.Column('status', sqlmodel.String(), nullable=False),
+        sqlmodel.Column('attempts', sqlmodel.Integer(), nullable=False),
+        sqlmodel.Column('max_attempts', sqlmodel.Integer(), nullable=False),
+        sqlmodel.Column('available_at', sqlmodel.DateTime(), nullable=False),
+        sqlmodel.Column('locked_at', sqlmodel.DateTime(), nullable=True),
+        sqlmodel.Column('locked_by', sqlmodel.String(), nullable=True),
+        sqlmodel.Column('last_error', sqlmodel.String(), nullable=True),
+        sqlmodel.ForeignKeyConstraint(['generation_id'], ['generations.id'], name=op.f('fk_generation_jobs_generation_id_generations')),
+        sqlmodel.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_generation_jobs_generation_id'), 'generation_jobs', ['generation_id'], unique=False)
+    op.create_index(op.f('ix_generation_jobs_status'), 'generation_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_generation_jobs_available_at'), 'generation_jobs', ['available_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_generation_jobs_available_at'), table_name='generation_jobs')
+    op.drop_index(op.f('ix_generation_jobs_status'), table_name='generation_jobs')
+    op.drop_index(op.f('ix_generation_jobs_generation_id'), table_name='generation_jobs')
+    op.drop_table('generation_jobs')
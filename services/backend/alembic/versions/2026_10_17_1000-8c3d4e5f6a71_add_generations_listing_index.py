@@ -0,0 +1,34 @@
+"""add_generations_listing_index
+
+Revision ID: 8c3d4e5f6a71
+Revises: 5f2b8c9d1e47
+Create Date: 2026-10-17 10:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3d4e5f6a71'
+down_revision: Union[str, Sequence[str], None] = '5f2b8c9d1e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves the newest-first, keyset paginated listing of a user's generations
+    op.create_index(
+        'ix_generations_user_id_status_type_creation_date',
+        'generations',
+        ['user_id', 'status', 'generation_type', sa.text('creation_date DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_generations_user_id_status_type_creation_date', table_name='generations')
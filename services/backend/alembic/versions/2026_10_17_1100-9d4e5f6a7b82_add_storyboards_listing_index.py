@@ -0,0 +1,34 @@
+"""add_storyboards_listing_index
+
+Revision ID: 9d4e5f6a7b82
+Revises: 8c3d4e5f6a71
+Create Date: 2026-10-17 11:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4e5f6a7b82'
+down_revision: Union[str, Sequence[str], None] = '8c3d4e5f6a71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves the most recently updated first, keyset paginated listing of a user's storyboards
+    op.create_index(
+        'ix_storyboards_user_id_updated_date',
+        'storyboards',
+        ['user_id', sa.text('updated_date DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_storyboards_user_id_updated_date', table_name='storyboards')
@@ -0,0 +1,48 @@
+"""add_llm_cache_entries_table
+
+Revision ID: ae5f6a7b8c93
+Revises: 9d4e5f6a7b82
+Create Date: 2026-10-17 12:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ae5f6a7b8c93'
+down_revision: Union[str, Sequence[str], None] = '9d4e5f6a7b82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Create llm_cache_entries table holding cached LLM responses
+    op.create_table(
+        'llm_cache_entries',
+        sqlmodel.Column('id', sqlmodel.String(), nullable=False),
+        sqlmodel.Column('creation_date', sqlmodel.DateTime(), nullable=False),
+        sqlmodel.Column('updated_date', sqlmodel.DateTime(), nullable=False),
+        sqlmodel.Column('cache_key', sqlmodel.String(), nullable=False),
+        sqlmodel.Column('model', sqlmodel.String(), nullable=False),
+        sqlmodel.Column('content', sqlmodel.String(), nullable=False),
+        sqlmodel.Column('expires_at', sqlmodel.DateTime(), nullable=False),
+        sqlmodel.Column('last_hit_at', sqlmodel.DateTime(), nullable=False),
+        sqlmodel.Column('hit_count', sqlmodel.Integer(), nullable=False),
+        sqlmodel.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_llm_cache_entries_cache_key'), 'llm_cache_entries', ['cache_key'], unique=True)
+    op.create_index(op.f('ix_llm_cache_entries_expires_at'), 'llm_cache_entries', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_llm_cache_entries_last_hit_at'), 'llm_cache_entries', ['last_hit_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_llm_cache_entries_last_hit_at'), table_name='llm_cache_entries')
+    op.drop_index(op.f('ix_llm_cache_entries_expires_at'), table_name='llm_cache_entries')
+    op.drop_index(op.f('ix_llm_cache_entries_cache_key'), table_name='llm_cache_entries')
+    op.drop_table('llm_cache_entries')
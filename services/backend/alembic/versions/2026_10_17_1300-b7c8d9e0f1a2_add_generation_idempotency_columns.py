@@ -0,0 +1,47 @@
+"""add_generation_idempotency_columns
+
+Revision ID: b7c8d9e0f1a2
+Revises: ae5f6a7b8c93
+Create Date: 2026-10-17 13:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c8d9e0f1a2'
+down_revision: Union[str, Sequence[str], None] = 'ae5f6a7b8c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Deduplicate identical generation requests and honour Idempotency-Key headers
+    op.add_column('generations', sqlmodel.Column('request_hash', sqlmodel.String(), nullable=True))
+    op.add_column('generations', sqlmodel.Column('idempotency_key', sqlmodel.String(), nullable=True))
+    op.create_index(
+        'ix_generations_user_id_request_hash_creation_date',
+        'generations',
+        ['user_id', 'request_hash', sa.text('creation_date DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_generations_user_id_idempotency_key',
+        'generations',
+        ['user_id', 'idempotency_key'],
+        unique=True,
+        postgresql_where=sa.text('idempotency_key IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_generations_user_id_idempotency_key', table_name='generations')
+    op.drop_index('ix_generations_user_id_request_hash_creation_date', table_name='generations')
+    op.drop_column('generations', 'idempotency_key')
+    op.drop_column('generations', 'request_hash')
@@ -0,0 +1,35 @@
+"""add_generation_job_type
+
+Revision ID: c8d9e0f1a2b3
+Revises: b7c8d9e0f1a2
+Create Date: 2026-10-17 14:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d9e0f1a2b3'
+down_revision: Union[str, Sequence[str], None] = 'b7c8d9e0f1a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Distinguish provider generation jobs from jobs mirroring their output into our bucket
+    op.add_column(
+        'generation_jobs',
+        sqlmodel.Column('job_type', sqlmodel.String(), nullable=False, server_default='generation'),
+    )
+    op.create_index(op.f('ix_generation_jobs_job_type'), 'generation_jobs', ['job_type'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_generation_jobs_job_type'), table_name='generation_jobs')
+    op.drop_column('generation_jobs', 'job_type')
@@ -0,0 +1,43 @@
+"""add_media_derivatives
+
+Revision ID: d9e0f1a2b3c4
+Revises: c8d9e0f1a2b3
+Create Date: 2026-10-17 15:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e0f1a2b3c4'
+down_revision: Union[str, Sequence[str], None] = 'c8d9e0f1a2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Thumbnail, poster and preview URLs of generations and assets
+    op.add_column('generations', sqlmodel.Column('derivatives', sa.JSON(), nullable=True))
+    op.add_column('assets', sqlmodel.Column('derivatives', sa.JSON(), nullable=True))
+
+    # Derive jobs run for assets as well as generations
+    op.alter_column('generation_jobs', 'generation_id', existing_type=sqlmodel.String(), nullable=True)
+    op.add_column('generation_jobs', sqlmodel.Column('asset_id', sqlmodel.String(), nullable=True))
+    op.create_foreign_key(op.f('fk_generation_jobs_asset_id_assets'), 'generation_jobs', 'assets', ['asset_id'], ['id'])
+    op.create_index(op.f('ix_generation_jobs_asset_id'), 'generation_jobs', ['asset_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_generation_jobs_asset_id'), table_name='generation_jobs')
+    op.drop_constraint(op.f('fk_generation_jobs_asset_id_assets'), 'generation_jobs', type_='foreignkey')
+    op.drop_column('generation_jobs', 'asset_id')
+    op.execute("DELETE FROM generation_jobs WHERE generation_id IS NULL")
+    op.alter_column('generation_jobs', 'generation_id', existing_type=sqlmodel.String(), nullable=False)
+    op.drop_column('assets', 'derivatives')
+    op.drop_column('generations', 'derivatives')
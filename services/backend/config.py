@@ -5,10 +5,22 @@ load_dotenv()
 
 WORKOS_CLIENT_ID = os.getenv("WORKOS_CLIENT_ID", "")
 WORKOS_API_KEY = os.getenv("WORKOS_API_KEY", "")
+WORKOS_JWKS_URL = os.getenv("WORKOS_JWKS_URL", f"https://api.workos.com/sso/jwks/{WORKOS_CLIENT_ID}")
+WORKOS_JWT_ISSUER = os.getenv("WORKOS_JWT_ISSUER", "")
+JWKS_CACHE_TTL_SECONDS = float(os.getenv("JWKS_CACHE_TTL_SECONDS", "3600"))
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://videostack_user:videostack_password@db:5432/videostack")
 
+# Database connection pool (per process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+DB_PGBOUNCER_MODE = os.getenv("DB_PGBOUNCER_MODE", "false").lower() == "true"
+
 # Your frontend URL, for redirects
 CLIENT_URL = "http://localhost:3000"
 
@@ -16,6 +28,19 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
 
 RUNWARE_API_KEY = os.getenv("RUNWARE_API_KEY", "")
+RUNWARE_WS_URL = os.getenv("RUNWARE_WS_URL", "wss://ws-api.runware.ai/v1")  # e.g. ws://localhost:8765 for scripts/runware_stub_server.py
+
+# Runware websocket connection pool (per process)
+RUNWARE_POOL_SIZE = int(os.getenv("RUNWARE_POOL_SIZE", "2"))
+RUNWARE_MAX_IN_FLIGHT_PER_CONNECTION = int(os.getenv("RUNWARE_MAX_IN_FLIGHT_PER_CONNECTION", "8"))
+RUNWARE_HEALTH_CHECK_INTERVAL = float(os.getenv("RUNWARE_HEALTH_CHECK_INTERVAL", "5"))
+RUNWARE_CONNECT_TIMEOUT = float(os.getenv("RUNWARE_CONNECT_TIMEOUT", "10"))
+RUNWARE_ACQUIRE_TIMEOUT = float(os.getenv("RUNWARE_ACQUIRE_TIMEOUT", "30"))
+RUNWARE_RECONNECT_MAX_BACKOFF = float(os.getenv("RUNWARE_RECONNECT_MAX_BACKOFF", "60"))
+
+# Batched Runware image inference
+RUNWARE_IMAGE_BATCH_WINDOW_MS = float(os.getenv("RUNWARE_IMAGE_BATCH_WINDOW_MS", "50"))
+RUNWARE_IMAGE_BATCH_MAX_SIZE = int(os.getenv("RUNWARE_IMAGE_BATCH_MAX_SIZE", "16"))
 
 # Bytedance
 ARK_API_KEY = os.getenv("ARK_API_KEY", "")
@@ -26,22 +51,105 @@ AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID", "")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY", "")
 S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "videostack-uploads")
 AWS_REGION = os.getenv("AWS_REGION", "eu-central-1")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", "")  # e.g. http://localhost:9000 for MinIO
+S3_PUBLIC_URL = os.getenv("S3_PUBLIC_URL", "")  # Base URL of public objects, defaults to the AWS bucket URL
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "50"))
+S3_MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024)))
+S3_MULTIPART_CHUNK_SIZE = int(os.getenv("S3_MULTIPART_CHUNK_SIZE", str(8 * 1024 * 1024)))
+S3_UPLOAD_MAX_CONCURRENCY = int(os.getenv("S3_UPLOAD_MAX_CONCURRENCY", "4"))
+S3_UPLOAD_MAX_BYTES = int(os.getenv("S3_UPLOAD_MAX_BYTES", str(20 * 1024 * 1024)))
+S3_VIDEO_UPLOAD_MAX_BYTES = int(os.getenv("S3_VIDEO_UPLOAD_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+S3_PRESIGNED_URL_EXPIRY_SECONDS = int(os.getenv("S3_PRESIGNED_URL_EXPIRY_SECONDS", "3600"))
+
+# Identity cache for authenticated requests
+IDENTITY_CACHE_TTL_SECONDS = float(os.getenv("IDENTITY_CACHE_TTL_SECONDS", "300"))
+IDENTITY_CACHE_REFRESH_AFTER_SECONDS = float(os.getenv("IDENTITY_CACHE_REFRESH_AFTER_SECONDS", "240"))
+IDENTITY_CACHE_MAX_ENTRIES = int(os.getenv("IDENTITY_CACHE_MAX_ENTRIES", "10000"))
+
+# LLM response cache
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+
+# Outbound HTTP connection pool (one pool per upstream host)
+HTTP_POOL_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "100"))
+HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_POOL_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", "60"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "10"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+
+# Storyboard image generation
+STORYBOARD_IMAGE_CONCURRENCY = int(os.getenv("STORYBOARD_IMAGE_CONCURRENCY", "16"))
+STORYBOARD_IMAGE_CONCURRENCY_PER_USER = int(os.getenv("STORYBOARD_IMAGE_CONCURRENCY_PER_USER", "4"))
+
+# Generation worker
+GENERATION_WORKER_CONCURRENCY = int(os.getenv("GENERATION_WORKER_CONCURRENCY", "8"))
+GENERATION_WORKER_POLL_INTERVAL = float(os.getenv("GENERATION_WORKER_POLL_INTERVAL", "1.0"))
+GENERATION_JOB_MAX_ATTEMPTS = int(os.getenv("GENERATION_JOB_MAX_ATTEMPTS", "3"))
+GENERATION_JOB_STALE_AFTER_SECONDS = int(os.getenv("GENERATION_JOB_STALE_AFTER_SECONDS", "900"))
+GENERATION_DEDUP_WINDOW_SECONDS = int(os.getenv("GENERATION_DEDUP_WINDOW_SECONDS", "300"))
+
+# Mirroring of provider-hosted outputs into our bucket
+MIRROR_OUTPUTS_ENABLED = os.getenv("MIRROR_OUTPUTS_ENABLED", "true").lower() == "true"
+MIRROR_PART_CONCURRENCY = int(os.getenv("MIRROR_PART_CONCURRENCY", "4"))
+MIRROR_PART_ATTEMPTS = int(os.getenv("MIRROR_PART_ATTEMPTS", "3"))
+
+# Routing between equivalent model backends
+PROVIDER_ROUTER_WINDOW_SIZE = int(os.getenv("PROVIDER_ROUTER_WINDOW_SIZE", "100"))
+PROVIDER_ROUTER_WINDOW_SECONDS = float(os.getenv("PROVIDER_ROUTER_WINDOW_SECONDS", "900"))
+PROVIDER_ROUTER_MIN_SAMPLES = int(os.getenv("PROVIDER_ROUTER_MIN_SAMPLES", "5"))
+PROVIDER_ROUTER_ERROR_THRESHOLD = float(os.getenv("PROVIDER_ROUTER_ERROR_THRESHOLD", "0.5"))
+PROVIDER_ROUTER_COST_WEIGHT = float(os.getenv("PROVIDER_ROUTER_COST_WEIGHT", "60"))  # Latency-seconds per USD
+PROVIDER_ROUTER_MAX_ATTEMPTS = int(os.getenv("PROVIDER_ROUTER_MAX_ATTEMPTS", "2"))
+
+# Thumbnails, poster frames and previews
+DERIVATIVES_ENABLED = os.getenv("DERIVATIVES_ENABLED", "true").lower() == "true"
+DERIVATIVE_PROCESS_WORKERS = int(os.getenv("DERIVATIVE_PROCESS_WORKERS", "2"))
+THUMBNAIL_SIZES = [int(size) for size in os.getenv("THUMBNAIL_SIZES", "256,512").split(",")]
+PREVIEW_SECONDS = int(os.getenv("PREVIEW_SECONDS", "4"))
+PREVIEW_BITRATE = os.getenv("PREVIEW_BITRATE", "300k")
+DERIVATIVE_MAX_SOURCE_MB = int(os.getenv("DERIVATIVE_MAX_SOURCE_MB", "512"))
 
 class Settings:
     """Application settings."""
 
     # Database
     database_url: str = DATABASE_URL
+    db_pool_size: int = DB_POOL_SIZE
+    db_max_overflow: int = DB_MAX_OVERFLOW
+    db_pool_timeout: float = DB_POOL_TIMEOUT
+    db_pool_recycle: int = DB_POOL_RECYCLE
+    db_pool_pre_ping: bool = DB_POOL_PRE_PING
+    db_statement_timeout_ms: int = DB_STATEMENT_TIMEOUT_MS
+    db_pgbouncer_mode: bool = DB_PGBOUNCER_MODE
 
     # Auth
     workos_client_id: str = WORKOS_CLIENT_ID
     workos_api_key: str = WORKOS_API_KEY
+    workos_jwks_url: str = WORKOS_JWKS_URL
+    workos_jwt_issuer: str = WORKOS_JWT_ISSUER
+    jwks_cache_ttl_seconds: float = JWKS_CACHE_TTL_SECONDS
 
     # APIs
     openai_api_key: str = OPENAI_API_KEY
     groq_api_key: str = GROQ_API_KEY
     groq_api_url: str = GROQ_API_URL
     runware_api_key: str = RUNWARE_API_KEY
+    runware_ws_url: str = RUNWARE_WS_URL
+
+    # Runware connection pool
+    runware_pool_size: int = RUNWARE_POOL_SIZE
+    runware_max_in_flight_per_connection: int = RUNWARE_MAX_IN_FLIGHT_PER_CONNECTION
+    runware_health_check_interval: float = RUNWARE_HEALTH_CHECK_INTERVAL
+    runware_connect_timeout: float = RUNWARE_CONNECT_TIMEOUT
+    runware_acquire_timeout: float = RUNWARE_ACQUIRE_TIMEOUT
+    runware_reconnect_max_backoff: float = RUNWARE_RECONNECT_MAX_BACKOFF
+
+    # Batched Runware image inference
+    runware_image_batch_window_ms: float = RUNWARE_IMAGE_BATCH_WINDOW_MS
+    runware_image_batch_max_size: int = RUNWARE_IMAGE_BATCH_MAX_SIZE
 
     # Bytedance
     ark_api_key: str = ARK_API_KEY
@@ -52,6 +160,66 @@ class Settings:
     aws_secret_access_key: str = AWS_SECRET_ACCESS_KEY
     s3_bucket_name: str = S3_BUCKET_NAME
     aws_region: str = AWS_REGION
+    s3_endpoint_url: str = S3_ENDPOINT_URL
+    s3_public_url: str = S3_PUBLIC_URL
+    s3_max_pool_connections: int = S3_MAX_POOL_CONNECTIONS
+    s3_multipart_threshold: int = S3_MULTIPART_THRESHOLD
+    s3_multipart_chunk_size: int = S3_MULTIPART_CHUNK_SIZE
+    s3_upload_max_concurrency: int = S3_UPLOAD_MAX_CONCURRENCY
+    s3_upload_max_bytes: int = S3_UPLOAD_MAX_BYTES
+    s3_video_upload_max_bytes: int = S3_VIDEO_UPLOAD_MAX_BYTES
+    s3_presigned_url_expiry_seconds: int = S3_PRESIGNED_URL_EXPIRY_SECONDS
+
+    # Identity cache
+    identity_cache_ttl_seconds: float = IDENTITY_CACHE_TTL_SECONDS
+    identity_cache_refresh_after_seconds: float = IDENTITY_CACHE_REFRESH_AFTER_SECONDS
+    identity_cache_max_entries: int = IDENTITY_CACHE_MAX_ENTRIES
+
+    # LLM response cache
+    llm_cache_enabled: bool = LLM_CACHE_ENABLED
+    llm_cache_ttl_seconds: int = LLM_CACHE_TTL_SECONDS
+    llm_cache_max_entries: int = LLM_CACHE_MAX_ENTRIES
+
+    # Outbound HTTP connection pool
+    http_pool_max_connections: int = HTTP_POOL_MAX_CONNECTIONS
+    http_pool_max_keepalive_connections: int = HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS
+    http_pool_keepalive_expiry: float = HTTP_POOL_KEEPALIVE_EXPIRY
+    http_connect_timeout: float = HTTP_CONNECT_TIMEOUT
+    http_read_timeout: float = HTTP_READ_TIMEOUT
+    http_pool_timeout: float = HTTP_POOL_TIMEOUT
+    http2_enabled: bool = HTTP2_ENABLED
+
+    # Storyboard image generation
+    storyboard_image_concurrency: int = STORYBOARD_IMAGE_CONCURRENCY
+    storyboard_image_concurrency_per_user: int = STORYBOARD_IMAGE_CONCURRENCY_PER_USER
+
+    # Generation worker
+    generation_worker_concurrency: int = GENERATION_WORKER_CONCURRENCY
+    generation_worker_poll_interval: float = GENERATION_WORKER_POLL_INTERVAL
+    generation_job_max_attempts: int = GENERATION_JOB_MAX_ATTEMPTS
+    generation_job_stale_after_seconds: int = GENERATION_JOB_STALE_AFTER_SECONDS
+    generation_dedup_window_seconds: int = GENERATION_DEDUP_WINDOW_SECONDS
+
+    # Output mirroring
+    mirror_outputs_enabled: bool = MIRROR_OUTPUTS_ENABLED
+    mirror_part_concurrency: int = MIRROR_PART_CONCURRENCY
+    mirror_part_attempts: int = MIRROR_PART_ATTEMPTS
+
+    # Provider routing
+    provider_router_window_size: int = PROVIDER_ROUTER_WINDOW_SIZE
+    provider_router_window_seconds: float = PROVIDER_ROUTER_WINDOW_SECONDS
+    provider_router_min_samples: int = PROVIDER_ROUTER_MIN_SAMPLES
+    provider_router_error_threshold: float = PROVIDER_ROUTER_ERROR_THRESHOLD
+    provider_router_cost_weight: float = PROVIDER_ROUTER_COST_WEIGHT
+    provider_router_max_attempts: int = PROVIDER_ROUTER_MAX_ATTEMPTS
+
+    # Derivatives
+    derivatives_enabled: bool = DERIVATIVES_ENABLED
+    derivative_process_workers: int = DERIVATIVE_PROCESS_WORKERS
+    thumbnail_sizes: list = THUMBNAIL_SIZES
+    preview_seconds: int = PREVIEW_SECONDS
+    preview_bitrate: str = PREVIEW_BITRATE
+    derivative_max_source_mb: int = DERIVATIVE_MAX_SOURCE_MB
 
     # Client
     client_url: str = CLIENT_URL
@@ -5,9 +5,11 @@ from sqlmodel import SQLModel
 from models.user import User  # noqa: F401
 from models.asset import Asset  # noqa: F401
 from models.generation import Generation  # noqa: F401
+from models.generation_job import GenerationJob  # noqa: F401
 from models.storyboard import Storyboard  # noqa: F401
 from models.storyboard_scene import StoryboardScene  # noqa: F401
 from models.shot import Shot  # noqa: F401
+from models.llm_cache_entry import LlmCacheEntry  # noqa: F401
 
 # SQLModel uses SQLAlchemy's declarative base under the hood
 # This is compatible with Alembic migrations
@@ -0,0 +1,153 @@
+"""Connection pool telemetry for the application database engine.
+
+Records how long checkouts wait for a pooled connection, how far the pool runs
+into overflow, how long connections stay checked out and how old they are, so
+pool exhaustion (e.g. sessions held across slow provider calls) is visible.
+"""
+import logging
+import time
+from typing import Any, Dict
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Checkouts held longer than this are counted as long holds
+LONG_HOLD_SECONDS = 10.0
+
+
+class PoolMetrics:
+    """Counters fed by pool events and MeteredAsyncQueuePool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.checkins = 0
+        self.total_hold_ms = 0.0
+        self.max_hold_ms = 0.0
+        self.long_holds = 0
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.invalidations = 0
+        self._connected_at: Dict[int, float] = {}
+
+    def record_wait(self, wait_ms: float, timed_out: bool = False) -> None:
+        """Record the time a checkout waited for a connection."""
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        if timed_out:
+            self.checkout_timeouts += 1
+            logger.warning(f"Database pool checkout timed out after {wait_ms:.0f}ms")
+
+    def attach(self, engine: Engine) -> None:
+        """Listen to the pool events of a (sync) engine."""
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            self.connections_opened += 1
+            self._connected_at[id(connection_record)] = time.monotonic()
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            self.checkouts += 1
+            connection_record.info["checked_out_at"] = time.monotonic()
+
+            pool = engine.pool
+            if isinstance(pool, QueuePool):
+                self.peak_checked_out = max(self.peak_checked_out, pool.checkedout())
+                self.peak_overflow = max(self.peak_overflow, pool.overflow())
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            checked_out_at = connection_record.info.pop("checked_out_at", None)
+            if checked_out_at is None:
+                return
+
+            held_seconds = time.monotonic() - checked_out_at
+            self.checkins += 1
+            self.total_hold_ms += held_seconds * 1000
+            self.max_hold_ms = max(self.max_hold_ms, held_seconds * 1000)
+            if held_seconds > LONG_HOLD_SECONDS:
+                self.long_holds += 1
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            self.invalidations += 1
+
+        @event.listens_for(engine, "close")
+        def on_close(dbapi_connection, connection_record):
+            self.connections_closed += 1
+            self._connected_at.pop(id(connection_record), None)
+
+        @event.listens_for(engine, "close_detached")
+        def on_close_detached(dbapi_connection):
+            self.connections_closed += 1
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Current pool state and accumulated counters.
+
+        Args:
+            pool: Pool of the engine the metrics are attached to
+
+        Returns:
+            Dictionary of pool statistics
+        """
+        now = time.monotonic()
+        ages = [now - connected_at for connected_at in self._connected_at.values()]
+
+        stats: Dict[str, Any] = {
+            "pool_class": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "avg_checkout_wait_ms": round(self.total_wait_ms / self.checkouts, 2) if self.checkouts else 0.0,
+            "max_checkout_wait_ms": round(self.max_wait_ms, 2),
+            "avg_hold_ms": round(self.total_hold_ms / self.checkins, 2) if self.checkins else 0.0,
+            "max_hold_ms": round(self.max_hold_ms, 2),
+            "long_holds": self.long_holds,
+            "connections_opened": self.connections_opened,
+            "connections_closed": self.connections_closed,
+            "invalidations": self.invalidations,
+            "open_connections": len(ages),
+            "oldest_connection_age_seconds": round(max(ages), 1) if ages else 0.0,
+            "avg_connection_age_seconds": round(sum(ages) / len(ages), 1) if ages else 0.0,
+        }
+
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": max(self.peak_overflow, 0),
+            })
+
+        return stats
+
+
+# Process-wide metrics for db.session.engine
+pool_metrics = PoolMetrics()
+
+
+class MeteredAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waits for a connection.
+
+    The wait includes opening a new connection when the pool has to grow.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_wait((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+
+        pool_metrics.record_wait((time.perf_counter() - started) * 1000)
+        return connection
@@ -1,18 +1,64 @@
 #db/session.py
-from sqlmodel import create_engine, Session
-from config import DATABASE_URL
+import uuid
+from typing import Any, Dict
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlmodel.ext.asyncio.session import AsyncSession
+from db.pool_metrics import MeteredAsyncQueuePool, pool_metrics
+from config import DATABASE_URL, get_settings
 
-# Create engine for SQLModel (uses SQLAlchemy 2.0 engine)
-engine = create_engine(DATABASE_URL, echo=False)
+settings = get_settings()
 
+# DATABASE_URL stays a plain postgresql:// URL (used by Alembic and the event listener),
+# the application engine talks to Postgres through asyncpg
+ASYNC_DATABASE_URL = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
 
-def get_session():
+
+def _engine_options() -> Dict[str, Any]:
+    """Pool and connection options from the DB_* settings."""
+    if settings.db_pgbouncer_mode:
+        # PgBouncer (transaction mode) pools the server connections: keep no client-side pool
+        # and no cached prepared statements, which are not valid across server connections.
+        # Set statement_timeout on the database role, PgBouncer rejects it as a startup parameter.
+        return {
+            "poolclass": NullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            },
+        }
+
+    connect_args: Dict[str, Any] = {}
+    if settings.db_statement_timeout_ms:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+
+    return {
+        "poolclass": MeteredAsyncQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+# Create async engine for SQLModel (uses SQLAlchemy 2.0 asyncio engine)
+engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, **_engine_options())
+pool_metrics.attach(engine.sync_engine)
+
+# Objects stay usable after commit; attribute access must not trigger IO on an AsyncSession
+async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def get_session():
     """
     Dependency function to get database session.
-    
+
     Usage in FastAPI routes:
-        async def route(session: Session = Depends(get_session)):
+        async def route(session: AsyncSession = Depends(get_session)):
             ...
     """
-    with Session(engine) as session:
-        yield session   
\ No newline at end of file
+    async with async_session_maker() as session:
+        yield session
@@ -0,0 +1,258 @@
+"""Shared poller for ByteDance Ark generation tasks.
+
+Instead of every generation running its own polling loop, callers register the
+Ark task ID here and await a future. A single background loop polls all
+outstanding tasks: it batches them into list requests, polls new tasks quickly
+and backs off (with jitter) as they age, and pauses when Ark signals rate limits.
+"""
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List
+import httpx
+
+from config import ARK_API_KEY, ARK_BASE_URL
+from dependencies.http_client_dependencies import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Ark task states that will not change anymore
+TERMINAL_TASK_STATUSES = {"succeeded", "failed", "cancelled", "expired"}
+
+
+@dataclass
+class _PendingTask:
+    future: asyncio.Future
+    interval: float
+    next_poll_at: float
+    waiters: int = 0  # Callers currently awaiting the future
+
+
+class ArkTaskPoller:
+    """Tracks outstanding Ark task IDs and resolves a future per task once it finishes."""
+
+    def __init__(
+        self,
+        base_url: str = ARK_BASE_URL,
+        api_key: str = ARK_API_KEY,
+        initial_interval: float = 2.0,
+        max_interval: float = 20.0,
+        backoff_factor: float = 1.5,
+        jitter: float = 0.2,
+        coalesce_window: float = 1.0,
+        batch_size: int = 100,
+        max_concurrent_requests: int = 4,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.coalesce_window = coalesce_window
+        self.batch_size = batch_size
+
+        self._tasks: Dict[str, _PendingTask] = {}
+        self._wakeup = asyncio.Event()
+        self._request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._runner: Optional[asyncio.Task] = None
+        self._client = client
+        self._paused_until = 0.0
+        self._supports_batch = True
+
+    @property
+    def pending_count(self) -> int:
+        """Number of tasks currently being polled."""
+        return len(self._tasks)
+
+    async def wait_for_task(self, task_id: str, timeout: float = 300.0) -> Dict[str, Any]:
+        """
+        Wait until an Ark task reaches a terminal state.
+
+        Args:
+            task_id: Ark task ID returned when the task was created
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            The final task payload returned by Ark (check its "status")
+
+        Raises:
+            asyncio.TimeoutError: If the task does not finish within the timeout
+        """
+        self._ensure_running()
+        loop = asyncio.get_running_loop()
+
+        pending = self._tasks.get(task_id)
+        if pending is None:
+            pending = _PendingTask(
+                future=loop.create_future(),
+                interval=self.initial_interval,
+                next_poll_at=loop.time() + self.initial_interval,
+            )
+            self._tasks[task_id] = pending
+            self._wakeup.set()
+
+        pending.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(pending.future), timeout=timeout)
+        finally:
+            # Stop polling only once the last caller waiting for the task gave up
+            pending.waiters -= 1
+            if pending.waiters == 0 and self._tasks.get(task_id) is pending and not pending.future.done():
+                pending.future.cancel()
+                self._tasks.pop(task_id, None)
+
+    async def close(self) -> None:
+        """Stop the polling loop and fail any tasks that are still waiting."""
+        if self._runner:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+
+        for pending in self._tasks.values():
+            if not pending.future.done():
+                pending.future.set_exception(RuntimeError("Ark task poller closed"))
+        self._tasks.clear()
+
+    def _ensure_running(self) -> None:
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            if not self._tasks:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = loop.time()
+            next_poll_at = max(min(task.next_poll_at for task in self._tasks.values()), self._paused_until)
+
+            if next_poll_at > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=next_poll_at - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Poll every task that is due soon together, so they share list requests
+            due_task_ids = [
+                task_id for task_id, task in self._tasks.items()
+                if task.next_poll_at <= now + self.coalesce_window
+            ]
+
+            try:
+                await self._poll(due_task_ids)
+            except Exception as e:
+                logger.error(f"Error polling Ark tasks: {str(e)}")
+                for task_id in due_task_ids:
+                    self._reschedule(task_id)
+
+    async def _poll(self, task_ids: List[str]) -> None:
+        if self._supports_batch:
+            chunks = [task_ids[i:i + self.batch_size] for i in range(0, len(task_ids), self.batch_size)]
+            results = await asyncio.gather(*(self._fetch_batch(chunk) for chunk in chunks))
+        else:
+            results = await asyncio.gather(*(self._fetch_single(task_id) for task_id in task_ids))
+
+        statuses: Dict[str, Dict[str, Any]] = {}
+        for result in results:
+            statuses.update(result)
+
+        for task_id in task_ids:
+            status_data = statuses.get(task_id)
+            if status_data and status_data.get("status") in TERMINAL_TASK_STATUSES:
+                self._resolve(task_id, status_data)
+            else:
+                self._reschedule(task_id)
+
+    async def _fetch_batch(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        params = [("page_size", str(len(task_ids)))] + [("filter.task_ids", task_id) for task_id in task_ids]
+        response = await self._request(f"{self.base_url}/tasks", params=params)
+
+        if response is None:
+            return {}
+
+        if response.status_code in (400, 404, 405):
+            # Endpoint without task list filtering, fall back to one request per task
+            logger.warning(f"Ark task list endpoint rejected batch polling ({response.status_code}), polling tasks individually")
+            self._supports_batch = False
+            results = await asyncio.gather(*(self._fetch_single(task_id) for task_id in task_ids))
+            return {task_id: data for result in results for task_id, data in result.items()}
+
+        if response.status_code != 200:
+            return {}
+
+        return {item.get("id"): item for item in response.json().get("items", []) if item.get("id")}
+
+    async def _fetch_single(self, task_id: str) -> Dict[str, Dict[str, Any]]:
+        response = await self._request(f"{self.base_url}/tasks/{task_id}")
+
+        if response is None or response.status_code != 200:
+            return {}
+
+        return {task_id: response.json()}
+
+    async def _request(self, url: str, params: Optional[List] = None) -> Optional[httpx.Response]:
+        client = self._client or get_http_client(self.base_url)
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+
+        async with self._request_semaphore:
+            try:
+                response = await client.get(url, params=params, headers=headers)
+            except httpx.HTTPError as e:
+                logger.error(f"HTTP error polling Ark tasks: {str(e)}")
+                return None
+
+        self._apply_rate_limit_headers(response)
+        return response
+
+    def _apply_rate_limit_headers(self, response: httpx.Response) -> None:
+        """Pause all polling when Ark reports that the rate limit is exhausted."""
+        pause_seconds = 0.0
+
+        if response.status_code == 429:
+            pause_seconds = self.max_interval
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    pause_seconds = float(retry_after)
+                except ValueError:
+                    pass
+        elif response.headers.get("x-ratelimit-remaining-requests") == "0":
+            reset = response.headers.get("x-ratelimit-reset-requests", "")
+            try:
+                pause_seconds = float(reset.rstrip("s"))
+            except ValueError:
+                pause_seconds = self.initial_interval
+
+        if pause_seconds > 0:
+            logger.warning(f"Ark rate limit reached, pausing task polling for {pause_seconds:.1f}s")
+            loop = asyncio.get_running_loop()
+            self._paused_until = max(self._paused_until, loop.time() + pause_seconds)
+
+    def _resolve(self, task_id: str, status_data: Dict[str, Any]) -> None:
+        pending = self._tasks.pop(task_id, None)
+        if pending and not pending.future.done():
+            pending.future.set_result(status_data)
+
+    def _reschedule(self, task_id: str) -> None:
+        pending = self._tasks.get(task_id)
+        if not pending:
+            return
+
+        pending.interval = min(pending.interval * self.backoff_factor, self.max_interval)
+        jittered_interval = pending.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+        pending.next_poll_at = asyncio.get_running_loop().time() + jittered_interval
+
+
+# Process-wide poller shared by all Ark callers
+ark_task_poller = ArkTaskPoller()
@@ -2,22 +2,46 @@
 from typing import Optional
 import jwt
 from fastapi import Depends, HTTPException, status, Header
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from schemas.auth_schemas import UserProfile
 from services.workos_service import get_user_profile
 from services.user_service import get_or_create_user
-from db.session import get_session
+from services.identity_cache import identity_cache
+from services.jwks_service import jwks_verifier
+from db.session import get_session, async_session_maker
+
+
+async def _load_identity(user_id: str, session: AsyncSession) -> UserProfile:
+    """Fetch the WorkOS profile and ensure the user exists in the database."""
+    user_data = await get_user_profile(user_id)
+    user_profile = UserProfile(**user_data)
+
+    # Ensure user exists in database (create/update) and get the database user
+    db_user = await get_or_create_user(session, user_profile)
+
+    # Add the database UUID to the user profile
+    user_profile.database_id = db_user.id
+
+    return user_profile
+
+
+async def _reload_identity(user_id: str) -> UserProfile:
+    """Reload an identity outside of a request, for background cache refreshes."""
+    async with async_session_maker() as session:
+        return await _load_identity(user_id, session)
 
 
 async def get_current_user(
     authorization: Optional[str] = Header(None),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ) -> UserProfile:
     """
     Dependency to get current authenticated user from JWT token.
     
-    Validates the JWT access token from WorkOS, fetches the user profile,
-    and ensures the user exists in the database.
+    Verifies the JWT access token signature against the WorkOS JWKS, fetches the user profile,
+    and ensures the user exists in the database. Verified identities are
+    cached by user ID (see services/identity_cache.py), so repeat requests
+    skip the WorkOS call and the database upsert.
     
     Args:
         authorization: Authorization header with Bearer token
@@ -52,13 +76,9 @@ async def get_current_user(
         )
     
     try:
-        # Decode JWT token without verification for now
-        # In production, you should verify the signature using WorkOS public keys
+        # Verify the signature locally against the cached WorkOS JWKS
         # See: https://workos.com/docs/user-management/guide/jwt-verification
-        decoded_token = jwt.decode(
-            token, 
-            options={"verify_signature": False}  # TODO: Verify signature in production
-        )
+        decoded_token = await jwks_verifier.verify(token)
         
         # Extract user_id from token (WorkOS uses 'sub' for user ID, 'sid' is session ID)
         user_id = decoded_token.get('sub')
@@ -69,16 +89,16 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Fetch user profile from WorkOS
-        user_data = await get_user_profile(user_id)
-        user_profile = UserProfile(**user_data)
-        
-        # Ensure user exists in database (create/update) and get the database user
-        db_user = get_or_create_user(session, user_profile)
-        
-        # Add the database UUID to the user profile
-        user_profile.database_id = db_user.id
-        
+        session_id = decoded_token.get('sid')
+
+        cached_profile = identity_cache.get(user_id, session_id)
+        if cached_profile:
+            identity_cache.refresh_in_background(user_id, lambda: _reload_identity(user_id))
+            return cached_profile
+
+        user_profile = await _load_identity(user_id, session)
+        identity_cache.set(user_id, user_profile, session_id)
+
         return user_profile
         
     except jwt.DecodeError:
@@ -93,6 +113,12 @@ async def get_current_user(
             detail="Token has expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    except jwt.InvalidTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Invalid token: {str(e)}",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -103,7 +129,7 @@ async def get_current_user(
 
 async def get_current_user_optional(
     authorization: Optional[str] = Header(None),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ) -> Optional[UserProfile]:
     """
     Optional authentication dependency.
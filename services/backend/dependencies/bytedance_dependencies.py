@@ -4,11 +4,24 @@ import logging
 from typing import Optional, Dict, Any, List
 
 from config import ARK_API_KEY
+from dependencies.ark_task_poller import ark_task_poller
+from dependencies.http_client_dependencies import get_http_client
 
 logger = logging.getLogger(__name__)
 
 ARK_API_BASE_URL = "https://ark.ap-southeast.bytepluses.com/api/v3"
 
+# Maximum time to wait for an Ark task to finish
+TASK_TIMEOUT_SECONDS = 300
+
+
+class ArkTaskOutcomeUnknownError(Exception):
+    """Ark accepted the task, but its result is not known; the video may still be rendered (and billed)."""
+
+    def __init__(self, task_id: Optional[str], message: str):
+        self.task_id = task_id
+        super().__init__(f"Ark task {task_id}: {message}" if task_id else f"Ark task creation: {message}")
+
 
 async def generate_video(
     text: Optional[str] = None,
@@ -19,6 +32,7 @@ async def generate_video(
     resolution: str = "720p",
     duration: int = 5,
     camera_fixed: bool = False,
+    client: Optional[httpx.AsyncClient] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Generate a video using ByteDance ARK API with polling for completion.
@@ -32,10 +46,16 @@ async def generate_video(
         resolution: Video resolution (default: 720p)
         duration: Video duration in seconds (default: 5)
         camera_fixed: Whether camera should be fixed (default: False)
+        client: Optional HTTP client (default: the shared pooled client for Ark)
 
     Returns:
-        Dictionary containing video_url and task_id, or None if generation failed
-        Polls for up to 5 minutes waiting for task completion.
+        Dictionary containing video_url and task_id, or None if Ark rejected the
+        request or the task ended without a video (failed, cancelled, expired).
+        Waits up to 5 minutes for the shared Ark task poller to report completion.
+
+    Raises:
+        ArkTaskOutcomeUnknownError: If the task was created but its result could not be
+            determined (polling timed out or failed, or no video URL despite success)
     """
     try:
         # Build content array based on provided parameters
@@ -96,81 +116,59 @@ async def generate_video(
 
         print(f"ByteDance video generation task created: {payload}")
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        client = client or get_http_client(ARK_API_BASE_URL)
+        try:
             response = await client.post(
                 f"{ARK_API_BASE_URL}/contents/generations/tasks",
                 json=payload,
                 headers=headers
             )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            logger.info(f"ByteDance video generation task created: {result}")
-        
-        
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+            raise
+        except httpx.TransportError as e:
+            # The request was sent, Ark may have created the task without us learning its ID
+            raise ArkTaskOutcomeUnknownError(None, f"no response: {e!r}") from e
+
+        response.raise_for_status()
+        result = response.json()
 
-            # Extract task ID and start polling
-            task_id = result.get("id")
-            if not task_id:
-                logger.error("No task ID returned from ByteDance API")
-                return None
-
-            logger.info(f"ByteDance video generation task created: {task_id}")
-
-            # Poll for task completion
-            max_polls = 60  # Maximum 5 minutes (60 * 5 second intervals)
-            poll_interval = 5  # Poll every 5 seconds
-
-            for _ in range(max_polls):
-                try:
-                    # Check task status
-                    status_response = await client.get(
-                        f"{ARK_API_BASE_URL}/contents/generations/tasks/{task_id}",
-                        headers=headers
-                    )
-
-                    if status_response.status_code == 200:
-                        status_data = status_response.json()
-
-                        # Check if task is completed
-                        if status_data.get("status") == "succeeded":
-                            # try to get a single video url from the response
-                            video_url = status_data.get("content", {}).get("video_url")
-                            if video_url:
-                                logger.info(f"Video generation completed for task {task_id}")
-                                return {"video_url": video_url, "task_id": task_id}
-                            
-                            # Extract video URL from the response
-                            contents = status_data.get("contents", [])
-                            if contents and len(contents) > 0:
-                                video_url = contents[0].get("url")
-                                if video_url:
-                                    logger.info(f"Video generation completed for task {task_id}")
-                                    return {"video_url": video_url, "task_id": task_id}
-
-                        # If task is still processing, wait and poll again
-                        elif status_data.get("status") in ["pending", "processing"]:
-                            await asyncio.sleep(poll_interval)
-                            continue
-
-                        # If task failed, log error and return None
-                        elif status_data.get("status") == "failed":
-                            logger.error(f"Video generation failed for task {task_id}: {status_data.get('error', 'Unknown error')}")
-                            return None
-
-                    # If status check fails, wait and try again
-                    await asyncio.sleep(poll_interval)
-
-                except Exception as e:
-                    logger.error(f"Error polling task status for {task_id}: {str(e)}")
-                    await asyncio.sleep(poll_interval)
-
-            # If we reach here, polling timed out
+        logger.info(f"ByteDance video generation task created: {result}")
+
+        # Extract task ID and wait for the shared poller to report completion
+        task_id = result.get("id")
+        if not task_id:
+            logger.error("No task ID returned from ByteDance API")
+            return None
+
+        try:
+            status_data = await ark_task_poller.wait_for_task(task_id, timeout=TASK_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
             logger.error(f"Video generation polling timed out for task {task_id}")
+            raise ArkTaskOutcomeUnknownError(task_id, f"no result within {TASK_TIMEOUT_SECONDS}s")
+        except Exception as e:
+            raise ArkTaskOutcomeUnknownError(task_id, f"polling failed: {e!r}") from e
+
+        if status_data.get("status") != "succeeded":
+            logger.error(f"Video generation failed for task {task_id}: {status_data.get('error', 'Unknown error')}")
             return None
-        
-            
+
+        # try to get a single video url from the response
+        video_url = status_data.get("content", {}).get("video_url")
+        if video_url:
+            logger.info(f"Video generation completed for task {task_id}")
+            return {"video_url": video_url, "task_id": task_id}
+
+        # Extract video URL from the response
+        contents = status_data.get("contents", [])
+        if contents and contents[0].get("url"):
+            logger.info(f"Video generation completed for task {task_id}")
+            return {"video_url": contents[0].get("url"), "task_id": task_id}
+
+        logger.error(f"Task {task_id} succeeded but no video URL found: {status_data}")
+        raise ArkTaskOutcomeUnknownError(task_id, "succeeded without a video URL")
+
+    except ArkTaskOutcomeUnknownError:
+        raise
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error during ByteDance video generation: {e.response.status_code} - {e.response.text}")
         return None
@@ -183,6 +181,7 @@ async def generate_image(
     text: str,
     model: str = "seedance-1-0-lite-t2i",
     resolution: str = "1024x1024",
+    client: Optional[httpx.AsyncClient] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Generate an image using ByteDance ARK API.
@@ -191,6 +190,7 @@ async def generate_image(
         text: Text prompt for image generation
         model: Model to use (default: seedance-1-0-lite-t2i)
         resolution: Image resolution (default: 1024x1024)
+        client: Optional HTTP client (default: the shared pooled client for Ark)
         
     Returns:
         API response as a dictionary, or None if generation failed
@@ -215,71 +215,43 @@ async def generate_image(
             "Authorization": f"Bearer {ARK_API_KEY}"
         }
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{ARK_API_BASE_URL}/contents/generations/tasks",
-                json=payload,
-                headers=headers 
-            )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            logger.info(f"ByteDance image generation task created: {result}")
-                # Extract task ID and start polling
-            task_id = result.get("id")
-            if not task_id:
-                logger.error("No task ID returned from ByteDance API")
-                return None
-
-            logger.info(f"ByteDance video generation task created: {task_id}")
-
-            # Poll for task completion
-            max_polls = 60  # Maximum 5 minutes (60 * 5 second intervals)
-            poll_interval = 5  # Poll every 5 seconds
-
-            for _ in range(max_polls):
-                try:
-                    # Check task status
-                    status_response = await client.get(
-                        f"{ARK_API_BASE_URL}/contents/generations/tasks/{task_id}",
-                        headers=headers
-                    )
-
-                    if status_response.status_code == 200:
-                        status_data = status_response.json()
-
-                        # Check if task is completed
-                        if status_data.get("status") == "succeeded":
-                            # Extract video URL from the response
-                            contents = status_data.get("contents", [])
-                            if contents and len(contents) > 0:
-                                video_url = contents[0].get("url")
-                                if video_url:
-                                    logger.info(f"Video generation completed for task {task_id}")
-                                    return {"video_url": video_url, "task_id": task_id}
-
-                        # If task is still processing, wait and poll again
-                        elif status_data.get("status") in ["pending", "processing"]:
-                            await asyncio.sleep(poll_interval)
-                            continue
-
-                        # If task failed, log error and return None
-                        elif status_data.get("status") == "failed":
-                            logger.error(f"Video generation failed for task {task_id}: {status_data.get('error', 'Unknown error')}")
-                            return None
-
-                    # If status check fails, wait and try again
-                    await asyncio.sleep(poll_interval)
-
-                except Exception as e:
-                    logger.error(f"Error polling task status for {task_id}: {str(e)}")
-                    await asyncio.sleep(poll_interval)
-
-            # If we reach here, polling timed out
-            logger.error(f"Video generation polling timed out for task {task_id}")
+        client = client or get_http_client(ARK_API_BASE_URL)
+        response = await client.post(
+            f"{ARK_API_BASE_URL}/contents/generations/tasks",
+            json=payload,
+            headers=headers
+        )
+
+        response.raise_for_status()
+        result = response.json()
+
+        logger.info(f"ByteDance image generation task created: {result}")
+
+        # Extract task ID and wait for the shared poller to report completion
+        task_id = result.get("id")
+        if not task_id:
+            logger.error("No task ID returned from ByteDance API")
             return None
-            
+
+        try:
+            status_data = await ark_task_poller.wait_for_task(task_id, timeout=TASK_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.error(f"Image generation polling timed out for task {task_id}")
+            return None
+
+        if status_data.get("status") != "succeeded":
+            logger.error(f"Image generation failed for task {task_id}: {status_data.get('error', 'Unknown error')}")
+            return None
+
+        # Extract video URL from the response
+        contents = status_data.get("contents", [])
+        if contents and contents[0].get("url"):
+            logger.info(f"Image generation completed for task {task_id}")
+            return {"video_url": contents[0].get("url"), "task_id": task_id}
+
+        logger.error(f"Task {task_id} succeeded but no URL found: {status_data}")
+        return None
+
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error during ByteDance image generation: {e.response.status_code} - {e.response.text}")
         return None
@@ -0,0 +1,175 @@
+"""Shared HTTP clients for outbound provider calls.
+
+One keep-alive, HTTP/2-enabled httpx.AsyncClient is kept per upstream origin for
+the lifetime of the process, so provider calls reuse connections instead of
+paying TCP+TLS setup on every request. URLs that come from provider responses
+or users may point at any origin; they share a single client instead, so the
+registry does not grow with every host they name. The registry also records
+pool statistics to help size the pool limits.
+"""
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+import httpx
+from fastapi import Request
+
+from config import get_settings
+
+settings = get_settings()
+
+# Registry key of the client shared by all untrusted origins
+UNTRUSTED_ORIGINS = "untrusted"
+
+
+@dataclass
+class _PoolStats:
+    requests: int = 0
+    timed_requests: int = 0
+    new_connections: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    total_connect_ms: float = 0.0
+
+
+class HttpClientRegistry:
+    """Creates and owns one pooled AsyncClient per upstream origin."""
+
+    def __init__(
+        self,
+        max_connections: int = settings.http_pool_max_connections,
+        max_keepalive_connections: int = settings.http_pool_max_keepalive_connections,
+        keepalive_expiry: float = settings.http_pool_keepalive_expiry,
+        connect_timeout: float = settings.http_connect_timeout,
+        read_timeout: float = settings.http_read_timeout,
+        pool_timeout: float = settings.http_pool_timeout,
+        http2: bool = settings.http2_enabled,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=read_timeout,
+            pool=pool_timeout,
+        )
+        self.http2 = http2
+
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, httpx.AsyncHTTPTransport] = {}
+        self._stats: Dict[str, _PoolStats] = {}
+
+    def get_client(self, url: str, untrusted: bool = False) -> httpx.AsyncClient:
+        """
+        Get the shared client for the origin of a URL, creating it on first use.
+
+        Args:
+            url: Any URL on the upstream host (e.g. the provider's base URL)
+            untrusted: The URL is not on a provider API or our bucket (e.g. a
+                provider output URL); all such URLs share one client
+
+        Returns:
+            Pooled AsyncClient for that origin
+        """
+        parts = urlsplit(url)
+        origin = UNTRUSTED_ORIGINS if untrusted else f"{parts.scheme}://{parts.netloc}"
+
+        client = self._clients.get(origin)
+        if client is not None and not client.is_closed:
+            return client
+
+        stats = self._stats.setdefault(origin, _PoolStats())
+        transport = httpx.AsyncHTTPTransport(http2=self.http2, limits=self.limits)
+
+        async def on_request(request: httpx.Request) -> None:
+            request.extensions["trace"] = self._make_trace(stats)
+            stats.requests += 1
+
+        client = httpx.AsyncClient(
+            transport=transport,
+            timeout=self.timeout,
+            event_hooks={"request": [on_request]},
+        )
+        self._clients[origin] = client
+        self._transports[origin] = transport
+        return client
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get pool statistics per upstream origin.
+
+        Returns:
+            Dictionary keyed by origin with connection counts and wait times
+        """
+        result = {}
+        for origin, client in self._clients.items():
+            stats = self._stats[origin]
+            # httpx does not expose its connection pool publicly
+            pool = getattr(self._transports[origin], "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+            idle = sum(1 for connection in connections if connection.is_idle())
+            closed = sum(1 for connection in connections if connection.is_closed())
+
+            result[origin] = {
+                "http2": self.http2,
+                "closed": client.is_closed,
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "active_connections": len(connections) - idle - closed,
+                "idle_connections": idle,
+                "requests": stats.requests,
+                "new_connections": stats.new_connections,
+                "avg_pool_wait_ms": round(stats.total_wait_ms / max(stats.timed_requests, 1), 2),
+                "max_pool_wait_ms": round(stats.max_wait_ms, 2),
+                "avg_connect_ms": round(stats.total_connect_ms / max(stats.new_connections, 1), 2),
+            }
+        return result
+
+    async def aclose(self) -> None:
+        """Close all clients and their connection pools."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        self._transports.clear()
+
+    @staticmethod
+    def _make_trace(stats: _PoolStats):
+        """Build an httpcore trace callback that splits pool wait time from connection setup."""
+        started_at = time.perf_counter()
+        state: Dict[str, Optional[float]] = {"connect_started": None, "connect_ms": 0.0, "recorded": None}
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            now = time.perf_counter()
+
+            if event_name == "connection.connect_tcp.started":
+                state["connect_started"] = now
+                stats.new_connections += 1
+            elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+                if state["connect_started"] is not None:
+                    state["connect_ms"] = (now - state["connect_started"]) * 1000
+            elif event_name.endswith("send_request_headers.started") and state["recorded"] is None:
+                state["recorded"] = now
+                stats.timed_requests += 1
+                wait_ms = max((now - started_at) * 1000 - state["connect_ms"], 0.0)
+                stats.total_wait_ms += wait_ms
+                stats.max_wait_ms = max(stats.max_wait_ms, wait_ms)
+                stats.total_connect_ms += state["connect_ms"]
+
+        return trace
+
+
+# Process-wide registry, closed in the application lifespan
+http_clients = HttpClientRegistry()
+
+
+def get_http_client(url: str, untrusted: bool = False) -> httpx.AsyncClient:
+    """Get the shared pooled client for the host of a URL, or the client shared by untrusted origins."""
+    return http_clients.get_client(url, untrusted=untrusted)
+
+
+def get_http_client_registry(request: Request) -> HttpClientRegistry:
+    """Get the HTTP client registry for dependency injection."""
+    return request.app.state.http_clients
@@ -1,12 +1,64 @@
 import json
+import re
 
 from pydantic import BaseModel
 from config import GROQ_API_KEY, GROQ_API_URL
-from groq import Groq
-from typing import List, Optional
+from groq import AsyncGroq
+from typing import Any, AsyncIterator, List, Optional, Tuple, Type, TypeVar, Union
+import httpx
+from dependencies.http_client_dependencies import get_http_client
+from services.llm_cache import llm_cache, llm_cache_key
 
 
-client = Groq(api_key=GROQ_API_KEY)
+_groq_client: Optional[Tuple[httpx.AsyncClient, AsyncGroq]] = None
+
+ResponseModel = TypeVar("ResponseModel", bound=BaseModel)
+
+
+def get_groq_client() -> AsyncGroq:
+    """
+    Get the async Groq client.
+
+    The client sends its requests through the shared pooled HTTP client for the
+    Groq origin, so LLM calls reuse keep-alive connections and never block the
+    event loop. It is recreated if the registry replaced the pooled client.
+    """
+    global _groq_client
+    http_client = get_http_client(GROQ_API_URL)
+    if _groq_client is None or _groq_client[0] is not http_client:
+        _groq_client = (http_client, AsyncGroq(api_key=GROQ_API_KEY, http_client=http_client))
+    return _groq_client[1]
+
+
+async def _cached_completion(
+    response_model: Type[ResponseModel],
+    bypass_cache: bool = False,
+    **request: Any,
+) -> ResponseModel:
+    """
+    Run a chat completion through the LLM cache and parse the message content.
+
+    The cache key covers every request argument (model, system and master prompts,
+    user input, temperature and response schema), and concurrent identical
+    requests share one upstream call. Only responses that validate against
+    response_model are cached.
+
+    Args:
+        response_model: Model the JSON message content must validate against
+        bypass_cache: Skip the cache lookup and fetch a fresh response
+        request: Arguments of the chat completion call
+
+    Raises:
+        ValueError: If the response is not valid JSON for response_model
+    """
+    async def create() -> str:
+        response = await get_groq_client().chat.completions.create(**request)
+        return response.choices[0].message.content
+
+    def parse(content: str) -> ResponseModel:
+        return response_model.model_validate(json.loads(content))
+
+    return await llm_cache.get_or_create(llm_cache_key(request), request["model"], create, parse, bypass=bypass_cache)
 
 
 class StoryboardShot(BaseModel): 
@@ -43,12 +95,16 @@ MASTER_PROMPT = (
     "User prompt: \"{user_prompt}\""
 )
 
-async def generate_storyboard_scenes(user_input: str): 
+SCENES_SYSTEM_PROMPT = "You are a world-class cinematic video director. Come up with a short storyboard with maximum 6 scenes. For every scene, you must provide atleast a single shot and that shot should contain a prompt that will be used to generate the scene. YOU MUST PROVIDE AT LEAST ONE SCENE; MAKE SURE TO WRITE THE SCENES BASED ON THE USER PROMPT. IT IS VERY IMPORTANT TO GROUP THE SHOTS TOGETHER INTO SCENES THAT MAKE SENSE AND ARE VISUALLY COHERENT."
+
+async def generate_storyboard_scenes(user_input: str, bypass_cache: bool = False): 
 
-    response = client.chat.completions.create(
+    storyboard = await _cached_completion(
+        StoryBoard,
+        bypass_cache,
         model="openai/gpt-oss-120b",
         messages=[
-            {"role": "system", "content": "You are a world-class cinematic video director. Come up with a short storyboard with maximum 6 scenes. For every scene, you must provide atleast a single shot and that shot should contain a prompt that will be used to generate the scene. YOU MUST PROVIDE AT LEAST ONE SCENE; MAKE SURE TO WRITE THE SCENES BASED ON THE USER PROMPT. IT IS VERY IMPORTANT TO GROUP THE SHOTS TOGETHER INTO SCENES THAT MAKE SENSE AND ARE VISUALLY COHERENT."}, 
+            {"role": "system", "content": SCENES_SYSTEM_PROMPT}, 
             {
                 "role": "user",
                 "content": MASTER_PROMPT.format(user_prompt=user_input),
@@ -63,11 +119,132 @@ async def generate_storyboard_scenes(user_input: str):
         }, 
         temperature=0.8
     )
-    
-    storyboard = StoryBoard.model_validate(json.loads(response.choices[0].message.content))
     return storyboard
 
 
+class SceneStreamParser:
+    """
+    Incrementally extracts complete scenes from a streamed StoryBoard JSON document.
+
+    Text chunks are scanned once, tracking string and nesting state, and every
+    object of the top-level "scenes" array is validated as soon as its closing
+    brace arrives.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._position = 0
+        self._in_scenes = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._object_start = 0
+
+    def feed(self, chunk: str) -> List[StoryboardScene]:
+        """
+        Add a chunk of model output.
+
+        Returns:
+            Scenes completed by this chunk, in document order
+        """
+        self.buffer += chunk
+        scenes: List[StoryboardScene] = []
+
+        if not self._in_scenes:
+            # A literal "scenes": [ cannot occur inside a JSON string, its quotes would be escaped
+            match = re.search(r'"scenes"\s*:\s*\[', self.buffer)
+            if not match:
+                return scenes
+            self._in_scenes = True
+            self._position = match.end()
+
+        while not self._done and self._position < len(self.buffer):
+            char = self.buffer[self._position]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 0:
+                    self._object_start = self._position
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # Closing bracket of the scenes array
+                    self._done = True
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        scene_json = self.buffer[self._object_start:self._position + 1]
+                        scenes.append(StoryboardScene.model_validate_json(scene_json))
+
+            self._position += 1
+
+        return scenes
+
+
+async def stream_storyboard_scenes(user_input: str, bypass_cache: bool = False) -> AsyncIterator[Union[StoryboardScene, StoryBoard]]:
+    """
+    Generate a storyboard, yielding every scene as soon as the model has written it.
+
+    Groq does not stream structured outputs, so the JSON schema is passed in the
+    prompt and the streamed text is parsed incrementally. A cached response is
+    replayed through the same parser.
+
+    Args:
+        user_input: Storyline to turn into scenes
+        bypass_cache: Skip the cache lookup and generate a fresh storyboard
+
+    Yields:
+        Each StoryboardScene in order, then the complete StoryBoard
+    """
+    schema_instruction = (
+        " Respond only with a JSON object, without any surrounding text, that matches this JSON schema: "
+        + json.dumps(StoryBoard.model_json_schema())
+    )
+    request = {
+        "model": "openai/gpt-oss-120b",
+        "messages": [
+            {"role": "system", "content": SCENES_SYSTEM_PROMPT + schema_instruction},
+            {
+                "role": "user",
+                "content": MASTER_PROMPT.format(user_prompt=user_input),
+            },
+        ],
+        "temperature": 0.8,
+    }
+    cache_key = llm_cache_key(request)
+
+    parser = SceneStreamParser()
+    cached = None if bypass_cache else await llm_cache.get(cache_key)
+    if cached is not None:
+        for scene in parser.feed(cached):
+            yield scene
+    else:
+        stream = await get_groq_client().chat.completions.create(**request, stream=True)
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                for scene in parser.feed(content):
+                    yield scene
+
+    # Tolerate a code fence or other text around the JSON object
+    document = parser.buffer[parser.buffer.find("{"):parser.buffer.rfind("}") + 1]
+    storyboard = StoryBoard.model_validate_json(document)
+    if cached is None:
+        await llm_cache.set(cache_key, request["model"], parser.buffer)
+    yield storyboard
+
+
 
 class StoryboardOption(BaseModel): 
     title: str
@@ -77,8 +254,10 @@ class StoryboardOptions(BaseModel):
     options: List[StoryboardOption]
 
 
-async def generate_storyboard_options(user_input: str): 
-    response = client.chat.completions.create(
+async def generate_storyboard_options(user_input: str, bypass_cache: bool = False): 
+    storyboard_options = await _cached_completion(
+        StoryboardOptions,
+        bypass_cache,
         model="openai/gpt-oss-120b",
         messages=[
             {"role": "system", "content": """
@@ -105,5 +284,4 @@ YOU ARE ONLY ALLOWED TO RETURN TWO OPTIONS, NOT MORE.
         },
         temperature=0.8
     )
-    storyboard_options = StoryboardOptions.model_validate(json.loads(response.choices[0].message.content))
     return storyboard_options
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""Batched Runware image inference.
+
+Generating a whole storyboard fires one image request per shot. Instead of a
+websocket message and a listener per image, requests for the same model and
+size that arrive within RUNWARE_IMAGE_BATCH_WINDOW_MS are collected and sent as
+one message carrying one imageInference task per prompt (identical prompts
+share a task with numberResults > 1). A single listener demultiplexes the
+results back to the callers by taskUUID, and a failed task only fails its own
+callers.
+"""
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+from runware import Runware, RunwareAPIError
+
+from config import get_settings
+from dependencies.runware_pool import RunwarePool, runware_pool
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Maximum time to wait for the results of a batch (the SDK's default request timeout)
+IMAGE_BATCH_TIMEOUT_SECONDS = 240
+
+# Batch key: (model, width, height)
+BatchKey = Tuple[str, int, int]
+
+
+@dataclass
+class _PendingImage:
+    prompt: str
+    future: asyncio.Future
+
+
+class RunwareImageBatcher:
+    """Collects image requests per model and size and submits them to Runware in batches."""
+
+    def __init__(
+        self,
+        pool: RunwarePool = runware_pool,
+        window: float = settings.runware_image_batch_window_ms / 1000,
+        max_batch_size: int = settings.runware_image_batch_max_size,
+        timeout: float = IMAGE_BATCH_TIMEOUT_SECONDS,
+    ):
+        self.pool = pool
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+
+        self._pending: Dict[BatchKey, List[_PendingImage]] = {}
+        self._flush_timers: Dict[BatchKey, asyncio.TimerHandle] = {}
+        self._batches: Set[asyncio.Task] = set()
+
+    async def generate(self, prompt: str, model: str, width: int, height: int) -> Optional[str]:
+        """
+        Generate one image as part of the next batch for its model and size.
+
+        Args:
+            prompt: Text prompt for the image
+            model: Runware image model
+            width: Image width in pixels
+            height: Image height in pixels
+
+        Returns:
+            URL of the generated image, or None if Runware returned no image
+
+        Raises:
+            RunwareAPIError: If Runware rejected the image's task
+            RunwareUnavailableError: If no Runware connection was available for the batch
+            asyncio.TimeoutError: If the image did not arrive in time
+        """
+        loop = asyncio.get_running_loop()
+        key = (model, width, height)
+        pending = _PendingImage(prompt=prompt, future=loop.create_future())
+
+        batch = self._pending.setdefault(key, [])
+        batch.append(pending)
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._flush_timers[key] = loop.call_later(self.window, self._flush, key)
+
+        return await pending.future
+
+    async def close(self) -> None:
+        """Submit the requests still collecting and wait for every running batch."""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+    def _flush(self, key: BatchKey) -> None:
+        timer = self._flush_timers.pop(key, None)
+        if timer:
+            timer.cancel()
+
+        # Callers that were cancelled while collecting are left out
+        batch = [pending for pending in self._pending.pop(key, []) if not pending.future.done()]
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._submit(key, batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _submit(self, key: BatchKey, batch: List[_PendingImage]) -> None:
+        model, width, height = key
+
+        # One task per distinct prompt; identical prompts share a task's results
+        by_prompt: Dict[str, List[_PendingImage]] = {}
+        for pending in batch:
+            by_prompt.setdefault(pending.prompt, []).append(pending)
+
+        callers: Dict[str, List[_PendingImage]] = {}
+        tasks: List[Dict[str, Any]] = []
+        for prompt, requests in by_prompt.items():
+            task_uuid = str(uuid.uuid4())
+            callers[task_uuid] = requests
+            tasks.append({
+                "taskType": "imageInference",
+                "taskUUID": task_uuid,
+                "model": model,
+                "positivePrompt": prompt.strip(),
+                "width": width,
+                "height": height,
+                "numberResults": len(requests),
+                "outputType": "URL",
+            })
+
+        logger.info(f"Submitting {len(tasks)} image tasks ({len(batch)} images) for {model} {width}x{height}")
+
+        try:
+            images, errors = await self.pool.run(lambda client: self._send_batch(client, tasks))
+        except Exception as e:
+            logger.error(f"Image batch for {model} {width}x{height} failed: {e!r}")
+            for pending in batch:
+                self._resolve(pending, error=e)
+            return
+
+        # Images that arrived go to the task's callers in order, the rest get the task's error
+        for task_uuid, requests in callers.items():
+            for index, pending in enumerate(requests):
+                if index < len(images[task_uuid]):
+                    self._resolve(pending, result=images[task_uuid][index].get("imageURL"))
+                else:
+                    self._resolve(pending, error=errors[task_uuid])
+
+    async def _send_batch(
+        self,
+        client: Runware,
+        tasks: List[Dict[str, Any]],
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Exception]]:
+        """Send all tasks in one message and collect their images, and errors of incomplete tasks, by taskUUID."""
+        expected = {task["taskUUID"]: task["numberResults"] for task in tasks}
+        images: Dict[str, List[Dict[str, Any]]] = {task_uuid: [] for task_uuid in expected}
+        errors: Dict[str, Exception] = {}
+        finished = asyncio.Event()
+
+        def items(message: Dict[str, Any], field: str) -> List[Dict[str, Any]]:
+            value = message.get(field)
+            return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+        def check(message: Dict[str, Any]) -> bool:
+            return any(
+                item.get("taskUUID") in expected
+                for item in items(message, "data") + items(message, "errors")
+            )
+
+        def listener(message: Dict[str, Any]) -> None:
+            for item in items(message, "data"):
+                if item.get("taskUUID") in expected and item.get("taskType") == "imageInference":
+                    images[item["taskUUID"]].append(item)
+            for item in items(message, "errors"):
+                if item.get("taskUUID") in expected:
+                    errors.setdefault(item["taskUUID"], RunwareAPIError(item))
+
+            if all(task_uuid in errors or len(images[task_uuid]) >= count for task_uuid, count in expected.items()):
+                finished.set()
+
+        subscription = client.addListener(check=check, lis=listener)
+        try:
+            await client.send(tasks)
+            await asyncio.wait_for(finished.wait(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            subscription["destroy"]()
+
+        for task_uuid, count in expected.items():
+            if task_uuid not in errors and len(images[task_uuid]) < count:
+                errors[task_uuid] = asyncio.TimeoutError(
+                    f"Received {len(images[task_uuid])}/{count} images of task {task_uuid} within {self.timeout}s"
+                )
+        return images, errors
+
+    @staticmethod
+    def _resolve(pending: _PendingImage, result: Optional[str] = None, error: Optional[Exception] = None) -> None:
+        if pending.future.done():
+            return
+        if error is not None:
+            pending.future.set_exception(error)
+        else:
+            pending.future.set_result(result)
+
+
+# Process-wide image batcher on the shared Runware pool
+image_batcher = RunwareImageBatcher()
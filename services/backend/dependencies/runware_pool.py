@@ -0,0 +1,286 @@
+"""Pool of Runware websocket connections.
+
+The Runware SDK talks to the API over one authenticated websocket per client.
+Instead of a single client connected at import time, the pool keeps
+RUNWARE_POOL_SIZE clients that are connected in the app (or worker) lifespan.
+Requests go to the healthy connection with the fewest requests in flight, and a
+connection carries at most RUNWARE_MAX_IN_FLIGHT_PER_CONNECTION requests; further
+requests wait for a free slot. A background loop checks every connection and
+replaces dropped ones, backing off (with jitter) while Runware is unreachable.
+RUNWARE_WS_URL points the pool at another endpoint, e.g. the offline stub in
+scripts/runware_stub_server.py.
+"""
+import asyncio
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, TypeVar
+from runware import Runware
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class RunwareUnavailableError(ConnectionError):
+    """No Runware connection became available, or the connection was lost mid-request."""
+
+
+class RunwareRequestLostError(RunwareUnavailableError):
+    """The connection was lost after the request was sent; Runware may still run (and bill) it."""
+
+
+@dataclass
+class _Connection:
+    index: int
+    client: Optional[Runware] = None
+    healthy: bool = False
+    in_flight: int = 0  # Reserved request slots
+    requests: Set[asyncio.Task] = field(default_factory=set)  # Running requests, cancelled if the connection drops
+    failures: int = 0  # Consecutive failed connection attempts
+    next_attempt_at: float = 0.0
+    connected_at: Optional[float] = None
+    reconnects: int = 0
+
+
+class RunwarePool:
+    """Keeps a set of connected Runware clients and spreads requests across them."""
+
+    def __init__(
+        self,
+        api_key: str = settings.runware_api_key,
+        url: str = settings.runware_ws_url,
+        size: int = settings.runware_pool_size,
+        max_in_flight: int = settings.runware_max_in_flight_per_connection,
+        health_check_interval: float = settings.runware_health_check_interval,
+        connect_timeout: float = settings.runware_connect_timeout,
+        acquire_timeout: float = settings.runware_acquire_timeout,
+        initial_backoff: float = 1.0,
+        max_backoff: float = settings.runware_reconnect_max_backoff,
+        jitter: float = 0.2,
+    ):
+        self.api_key = api_key
+        self.url = url
+        self.max_in_flight = max_in_flight
+        self.health_check_interval = health_check_interval
+        self.connect_timeout = connect_timeout
+        self.acquire_timeout = acquire_timeout
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+        self._connections = [_Connection(index=i) for i in range(max(size, 1))]
+        self._available = asyncio.Condition()
+        self._health_task: Optional[asyncio.Task] = None
+
+    @property
+    def started(self) -> bool:
+        return self._health_task is not None
+
+    async def start(self) -> None:
+        """
+        Connect the pool and start the health check loop.
+
+        Connections that fail here do not fail startup; the health check loop keeps
+        retrying them and requests wait (up to RUNWARE_ACQUIRE_TIMEOUT) meanwhile.
+        """
+        if self._health_task is not None:
+            return
+
+        await asyncio.gather(*(self._connect(connection) for connection in self._connections))
+        healthy = sum(connection.healthy for connection in self._connections)
+        logger.info(f"Runware pool connected {healthy}/{len(self._connections)} connections to {self.url}")
+        self._health_task = asyncio.create_task(self._health_loop())
+
+    async def close(self) -> None:
+        """Stop the health check loop, fail requests in flight and disconnect every client."""
+        if self._health_task:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+        await asyncio.gather(*(self._drop(connection) for connection in self._connections))
+        for connection in self._connections:
+            connection.failures = 0
+            connection.next_attempt_at = 0.0
+
+    async def run(self, request: Callable[[Runware], Awaitable[T]]) -> T:
+        """
+        Run a request on the least busy healthy connection.
+
+        Args:
+            request: Function that performs the request with the given client,
+                e.g. lambda client: client.imageInference(requestImage=...)
+
+        Returns:
+            The request's result
+
+        Raises:
+            RunwareUnavailableError: If no connection frees up within the acquire
+                timeout, or the connection is lost before the request is sent
+            RunwareRequestLostError: If the connection is lost while the request runs
+        """
+        connection = await self._acquire()
+        task: Optional[asyncio.Task] = None
+        try:
+            if connection.client is None:
+                raise RunwareUnavailableError(f"Runware connection {connection.index} was lost before the request")
+            task = asyncio.ensure_future(request(connection.client))
+            connection.requests.add(task)
+            await asyncio.wait([task])
+        except asyncio.CancelledError:
+            if task is not None:
+                task.cancel()
+            raise
+        finally:
+            if task is not None:
+                connection.requests.discard(task)
+            async with self._available:
+                connection.in_flight -= 1
+                self._available.notify()
+
+        if task.cancelled():
+            raise RunwareRequestLostError(f"Runware connection {connection.index} was lost during the request")
+        try:
+            return task.result()
+        except Exception:
+            if connection.healthy and not connection.client.connected():
+                await self._mark_unhealthy(connection)
+            raise
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with the state of every connection
+        """
+        loop_time = asyncio.get_running_loop().time() if self._health_task else None
+        connections: List[Dict[str, Any]] = []
+        for connection in self._connections:
+            connections.append({
+                "index": connection.index,
+                "healthy": connection.healthy,
+                "in_flight": connection.in_flight,
+                "reconnects": connection.reconnects,
+                "failed_attempts": connection.failures,
+                "connected_seconds": round(loop_time - connection.connected_at, 1)
+                if loop_time is not None and connection.connected_at is not None else None,
+            })
+
+        return {
+            "url": self.url,
+            "started": self.started,
+            "max_in_flight_per_connection": self.max_in_flight,
+            "connections": connections,
+        }
+
+    async def _acquire(self) -> _Connection:
+        if self._health_task is None:
+            raise RunwareUnavailableError("Runware pool is not started")
+
+        async def wait_for_slot() -> _Connection:
+            async with self._available:
+                while True:
+                    candidates = [
+                        connection for connection in self._connections
+                        if connection.healthy and connection.in_flight < self.max_in_flight
+                    ]
+                    if candidates:
+                        connection = min(candidates, key=lambda connection: connection.in_flight)
+                        connection.in_flight += 1
+                        return connection
+                    await self._available.wait()
+
+        try:
+            return await asyncio.wait_for(wait_for_slot(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise RunwareUnavailableError(
+                f"No Runware connection available after {self.acquire_timeout}s "
+                f"({sum(connection.healthy for connection in self._connections)} healthy)"
+            )
+
+    async def _connect(self, connection: _Connection) -> None:
+        loop = asyncio.get_running_loop()
+        client = Runware(api_key=self.api_key, url=self.url)
+        try:
+            await asyncio.wait_for(client.connect(), timeout=self.connect_timeout)
+            if not client.connected():
+                raise ConnectionError(client._invalidAPIkey or "Runware did not authenticate the connection")
+        except Exception as e:
+            await self._disconnect_client(client)
+            connection.failures += 1
+            backoff = min(self.initial_backoff * 2 ** (connection.failures - 1), self.max_backoff)
+            connection.next_attempt_at = loop.time() + backoff * random.uniform(1 - self.jitter, 1 + self.jitter)
+            logger.warning(
+                f"Runware connection {connection.index} failed (attempt {connection.failures}), "
+                f"retrying in {backoff:.1f}s: {e!r}"
+            )
+            return
+
+        if connection.connected_at is not None:
+            connection.reconnects += 1
+        connection.client = client
+        connection.healthy = True
+        connection.failures = 0
+        connection.connected_at = loop.time()
+        async with self._available:
+            self._available.notify_all()
+
+    async def _mark_unhealthy(self, connection: _Connection) -> None:
+        """Take a dropped connection out of rotation; the health check loop reconnects it."""
+        if not connection.healthy:
+            return
+        logger.warning(f"Runware connection {connection.index} lost, reconnecting")
+        await self._drop(connection)
+        connection.next_attempt_at = 0.0
+
+    async def _drop(self, connection: _Connection) -> None:
+        connection.healthy = False
+        client, connection.client = connection.client, None
+
+        # Requests on a dropped websocket never get their results, fail them now
+        for task in list(connection.requests):
+            task.cancel()
+
+        if client is not None:
+            await self._disconnect_client(client)
+
+    @staticmethod
+    async def _disconnect_client(client: Runware) -> None:
+        try:
+            await client.disconnect()
+        except Exception as e:
+            logger.debug(f"Error disconnecting Runware client: {e!r}")
+
+    async def _health_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+
+            for connection in self._connections:
+                if connection.healthy and not connection.client.connected():
+                    await self._mark_unhealthy(connection)
+
+            now = loop.time()
+            due = [
+                connection for connection in self._connections
+                if not connection.healthy and connection.next_attempt_at <= now
+            ]
+            if due:
+                try:
+                    await asyncio.gather(*(self._connect(connection) for connection in due))
+                except Exception as e:
+                    logger.error(f"Error reconnecting Runware connections: {str(e)}")
+
+
+# Process-wide Runware connection pool, started and closed in the app/worker lifespan
+runware_pool = RunwarePool()
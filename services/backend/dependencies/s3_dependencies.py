@@ -1,14 +1,41 @@
 """S3 upload dependencies for handling file uploads."""
+import asyncio
 import os
 import uuid
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from fastapi import UploadFile, File, HTTPException, status
 from pathlib import Path
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from schemas.asset_schemas import CompletedPart
 from config import get_settings
 
 settings = get_settings()
 
+# Large uploads are sent as multipart uploads. At most chunk size x concurrency
+# bytes of an upload are held in memory, the rest stays in the spooled upload file.
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=settings.s3_multipart_threshold,
+    multipart_chunksize=settings.s3_multipart_chunk_size,
+    max_concurrency=settings.s3_upload_max_concurrency,
+    use_threads=True,
+)
+
+# Content types accepted for direct (presigned) uploads, by asset type
+DIRECT_UPLOAD_TYPES = {
+    "image": ["image/jpeg", "image/png", "image/gif", "image/webp"],
+    "video": ["video/mp4", "video/quicktime", "video/webm"],
+    "audio": ["audio/mpeg", "audio/wav", "audio/ogg"],
+}
+
+# S3 limits: minimum size of every part but the last, and maximum number of parts
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10000
+
+
 async def upload_file_to_s3(
     file: UploadFile = File(...),
     folder: str = "uploads"
@@ -16,6 +43,10 @@ async def upload_file_to_s3(
     """
     Upload a file to S3 and return the public URL.
 
+    The upload is streamed from the request's spooled temporary file in chunks
+    (multipart for large files) on a worker thread, so neither the whole file
+    nor the blocking S3 calls end up on the event loop.
+
     Args:
         file: The uploaded file
         folder: Folder within the bucket to store the file
@@ -32,36 +63,31 @@ async def upload_file_to_s3(
                 detail=f"Invalid file type. Allowed types: {', '.join(allowed_types)}"
             )
 
+        if file.size is not None and file.size > settings.s3_upload_max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large. Maximum size: {settings.s3_upload_max_bytes} bytes"
+            )
+
         # Generate unique filename
         file_extension = Path(file.filename).suffix.lower()
         unique_filename = f"{uuid.uuid4()}{file_extension}"
         s3_key = f"{folder}/{unique_filename}"
 
-        # Create S3 client
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.aws_region
-        )
-
-        # Read file content
-        file_content = await file.read()
-
         # Upload to S3
         # Note: ACL parameter removed as it's not supported when bucket ACLs are disabled
         # Ensure your S3 bucket has a bucket policy that allows public read access to objects
-        s3_client.put_object(
-            Bucket=settings.s3_bucket_name,
-            Key=s3_key,
-            Body=file_content,
-            ContentType=file.content_type
+        await file.seek(0)
+        await asyncio.to_thread(
+            get_s3_client().upload_fileobj,
+            file.file,
+            settings.s3_bucket_name,
+            s3_key,
+            ExtraArgs={"ContentType": file.content_type},
+            Config=TRANSFER_CONFIG,
         )
 
-        # Generate public URL
-        public_url = f"https://{settings.s3_bucket_name}.s3.{settings.aws_region}.amazonaws.com/{s3_key}"
-
-        return public_url
+        return get_public_url(s3_key)
 
     except HTTPException:
         raise
@@ -71,11 +97,202 @@ async def upload_file_to_s3(
             detail=f"Failed to upload file: {str(e)}"
         )
 
+
+def get_public_url(s3_key: str) -> str:
+    """Get the public URL of an object in the bucket."""
+    if settings.s3_public_url:
+        return f"{settings.s3_public_url.rstrip('/')}/{s3_key}"
+    return f"https://{settings.s3_bucket_name}.s3.{settings.aws_region}.amazonaws.com/{s3_key}"
+
+
+@lru_cache
 def get_s3_client():
-    """Get S3 client for dependency injection."""
+    """
+    Get the shared S3 client for dependency injection.
+
+    boto3 clients are thread-safe, so one client with a connection pool sized
+    for concurrent multipart transfers is built per process. S3_ENDPOINT_URL
+    points it at an S3-compatible stand-in such as MinIO.
+    """
     return boto3.client(
         's3',
         aws_access_key_id=settings.aws_access_key_id,
         aws_secret_access_key=settings.aws_secret_access_key,
-        region_name=settings.aws_region
+        region_name=settings.aws_region,
+        endpoint_url=settings.s3_endpoint_url or None,
+        config=Config(
+            max_pool_connections=settings.s3_max_pool_connections,
+            s3={"addressing_style": "path"} if settings.s3_endpoint_url else None,
+        ),
     )
+
+
+def _direct_upload_limits(content_type: Optional[str]) -> Tuple[str, int]:
+    """Get the asset type and maximum size in bytes for a direct upload's content type."""
+    for asset_type, content_types in DIRECT_UPLOAD_TYPES.items():
+        if content_type in content_types:
+            max_bytes = settings.s3_upload_max_bytes if asset_type == "image" else settings.s3_video_upload_max_bytes
+            return asset_type, max_bytes
+
+    allowed_types = [content_type for content_types in DIRECT_UPLOAD_TYPES.values() for content_type in content_types]
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Invalid file type. Allowed types: {', '.join(allowed_types)}"
+    )
+
+
+def _direct_upload_prefix(user_id: str) -> str:
+    """Key prefix of a user's direct uploads, used to verify ownership on completion."""
+    return f"user-uploads/{user_id}/"
+
+
+async def create_presigned_upload(user_id: str, filename: str, content_type: str, size: int) -> Dict[str, Any]:
+    """
+    Prepare a direct upload from the client to S3.
+
+    Files up to S3_MULTIPART_THRESHOLD get a presigned POST that S3 only accepts
+    with the declared content type and at most the declared size. Larger files
+    get a multipart upload with a presigned PUT URL per part, which the client
+    can upload in parallel.
+
+    Args:
+        user_id: Database ID of the uploading user
+        filename: Original file name, used for the extension
+        content_type: MIME type of the file
+        size: File size in bytes
+
+    Returns:
+        Fields of UploadUrlResponse
+    """
+    _, max_bytes = _direct_upload_limits(content_type)
+    if size > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Maximum size: {max_bytes} bytes"
+        )
+
+    s3_key = f"{_direct_upload_prefix(user_id)}{uuid.uuid4()}{Path(filename).suffix.lower()}"
+    s3_client = get_s3_client()
+    expires_in = settings.s3_presigned_url_expiry_seconds
+
+    if size <= settings.s3_multipart_threshold:
+        presigned = await asyncio.to_thread(
+            s3_client.generate_presigned_post,
+            settings.s3_bucket_name,
+            s3_key,
+            Fields={"Content-Type": content_type},
+            Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, size]],
+            ExpiresIn=expires_in,
+        )
+        return {
+            "key": s3_key,
+            "method": "post",
+            "url": presigned["url"],
+            "fields": presigned["fields"],
+            "expires_in": expires_in,
+        }
+
+    part_size = max(settings.s3_multipart_chunk_size, MIN_PART_SIZE, -(-size // MAX_PARTS))
+    part_count = -(-size // part_size)
+
+    upload = await asyncio.to_thread(
+        s3_client.create_multipart_upload,
+        Bucket=settings.s3_bucket_name,
+        Key=s3_key,
+        ContentType=content_type,
+    )
+
+    def presign_parts() -> List[str]:
+        return [
+            s3_client.generate_presigned_url(
+                "upload_part",
+                Params={
+                    "Bucket": settings.s3_bucket_name,
+                    "Key": s3_key,
+                    "UploadId": upload["UploadId"],
+                    "PartNumber": part_number,
+                },
+                ExpiresIn=expires_in,
+            )
+            for part_number in range(1, part_count + 1)
+        ]
+
+    return {
+        "key": s3_key,
+        "method": "multipart",
+        "upload_id": upload["UploadId"],
+        "part_size": part_size,
+        "part_urls": await asyncio.to_thread(presign_parts),
+        "expires_in": expires_in,
+    }
+
+
+async def complete_presigned_upload(
+    user_id: str,
+    s3_key: str,
+    upload_id: Optional[str] = None,
+    parts: Optional[List[CompletedPart]] = None,
+) -> Tuple[str, str]:
+    """
+    Finish a direct upload and verify the stored object.
+
+    Multipart uploads are completed from the client's part ETags. The object's
+    content type and size are checked against the upload limits, since
+    presigned part URLs cannot enforce them; violating objects are deleted.
+
+    Args:
+        user_id: Database ID of the uploading user
+        s3_key: Object key from create_presigned_upload
+        upload_id: Multipart upload ID, for multipart uploads
+        parts: Uploaded parts, for multipart uploads
+
+    Returns:
+        Tuple of (public URL, asset type)
+    """
+    if not s3_key.startswith(_direct_upload_prefix(user_id)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found",
+        )
+
+    s3_client = get_s3_client()
+
+    try:
+        if upload_id:
+            if not parts:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Parts are required to complete a multipart upload",
+                )
+            await asyncio.to_thread(
+                s3_client.complete_multipart_upload,
+                Bucket=settings.s3_bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": part.part_number, "ETag": part.etag}
+                        for part in sorted(parts, key=lambda part: part.part_number)
+                    ]
+                },
+            )
+
+        head = await asyncio.to_thread(s3_client.head_object, Bucket=settings.s3_bucket_name, Key=s3_key)
+    except ClientError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Upload not completed: {str(e)}",
+        )
+
+    try:
+        asset_type, max_bytes = _direct_upload_limits(head.get("ContentType"))
+        if head["ContentLength"] > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large. Maximum size: {max_bytes} bytes"
+            )
+    except HTTPException:
+        await asyncio.to_thread(s3_client.delete_object, Bucket=settings.s3_bucket_name, Key=s3_key)
+        raise
+
+    return get_public_url(s3_key), asset_type
@@ -0,0 +1,111 @@
+"""Ownership resolution dependencies for nested storyboard routes."""
+from typing import Optional, Tuple
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import and_
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.storyboard import Storyboard
+from models.storyboard_scene import StoryboardScene
+from models.shot import Shot
+from schemas.auth_schemas import UserProfile
+from dependencies.auth_dependencies import get_current_user
+from db.session import get_session
+
+
+async def resolve_storyboard_path(
+    session: AsyncSession,
+    user_id: str,
+    storyboard_id: str,
+    scene_id: str,
+    shot_id: Optional[str] = None,
+    load_shots: bool = False,
+) -> Tuple[StoryboardScene, Optional[Shot]]:
+    """
+    Validate the storyboard -> scene (-> shot) ownership chain with a single query.
+
+    The scene and shot are LEFT JOINed onto the user's storyboard, so a missing
+    link is reported with the same 404 as a step-by-step lookup.
+
+    Args:
+        session: Database session
+        user_id: Database ID of the requesting user
+        storyboard_id: ID of the storyboard
+        scene_id: ID of the scene within the storyboard
+        shot_id: Optional ID of the shot within the scene
+        load_shots: Also load the scene's shots (one additional query)
+
+    Returns:
+        Tuple of (scene, shot); shot is None when no shot_id is given
+
+    Raises:
+        HTTPException: 404 if the storyboard, scene or shot does not exist for this user
+    """
+    if shot_id:
+        statement = select(Storyboard.id, StoryboardScene, Shot)
+    else:
+        statement = select(Storyboard.id, StoryboardScene)
+
+    statement = statement.select_from(Storyboard).outerjoin(
+        StoryboardScene,
+        and_(StoryboardScene.id == scene_id, StoryboardScene.storyboard_id == Storyboard.id),
+    )
+    if shot_id:
+        statement = statement.outerjoin(
+            Shot,
+            and_(Shot.id == shot_id, Shot.scene_id == StoryboardScene.id),
+        )
+    statement = statement.where(Storyboard.id == storyboard_id, Storyboard.user_id == user_id)
+    if load_shots:
+        statement = statement.options(selectinload(StoryboardScene.shots))
+
+    row = (await session.exec(statement)).first()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Storyboard not found",
+        )
+
+    scene = row[1]
+    shot = row[2] if shot_id else None
+    if not scene:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scene not found",
+        )
+
+    if shot_id and not shot:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Shot not found",
+        )
+
+    return scene, shot
+
+
+async def get_owned_scene(
+    storyboard_id: str,
+    scene_id: str,
+    current_user: UserProfile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> StoryboardScene:
+    """Dependency resolving a scene of one of the current user's storyboards, with its shots loaded."""
+    scene, _ = await resolve_storyboard_path(
+        session, current_user.database_id, storyboard_id, scene_id, load_shots=True
+    )
+    return scene
+
+
+async def get_owned_shot(
+    storyboard_id: str,
+    scene_id: str,
+    shot_id: str,
+    current_user: UserProfile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> Shot:
+    """Dependency resolving a shot of one of the current user's storyboards."""
+    _, shot = await resolve_storyboard_path(
+        session, current_user.database_id, storyboard_id, scene_id, shot_id=shot_id
+    )
+    return shot
@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 import os
 import logging
+import re
 import time
 from contextlib import asynccontextmanager
 from alembic.config import Config
@@ -14,6 +15,12 @@ from routers.generation_router import generation_router
 from routers.story_board_router import story_board_router
 from routers.storyboard_v2_router import storyboard_v2_router
 from routers.debug_router import debug_router
+from routers.event_router import event_router
+from dependencies.ark_task_poller import ark_task_poller
+from dependencies.http_client_dependencies import http_clients
+from dependencies.runware_pool import runware_pool
+from dependencies.runware_image_batcher import image_batcher
+from services.event_service import event_broker
     
 # Database setup
 from db.session import engine
@@ -25,6 +32,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Query parameters and headers carrying credentials, masked in request logs
+REDACTED_QUERY_PARAMS = {"access_token"}
+REDACTED_HEADERS = {"authorization", "cookie"}
+
+
+def _redact(items, names) -> dict:
+    return {key: "[redacted]" if key.lower() in names else value for key, value in items}
+
+
+class RedactQueryTokenFilter(logging.Filter):
+    """Masks access tokens in uvicorn's access log, whose request line includes the query string."""
+
+    PATTERN = re.compile(r"((?:%s)=)[^&\s]+" % "|".join(REDACTED_QUERY_PARAMS))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.args, tuple):
+            record.args = tuple(
+                self.PATTERN.sub(r"\1[redacted]", arg) if isinstance(arg, str) else arg for arg in record.args
+            )
+        return True
+
+
+logging.getLogger("uvicorn.access").addFilter(RedactQueryTokenFilter())
+
+
 class LoggingMiddleware:
     """Middleware to log all incoming requests."""
 
@@ -33,8 +65,8 @@ class LoggingMiddleware:
 
         # Log request details
         logger.info(f"Request: {request.method} {request.url.path}")
-        logger.debug(f"Request headers: {dict(request.headers)}")
-        logger.debug(f"Request query params: {dict(request.query_params)}")
+        logger.debug(f"Request headers: {_redact(request.headers.items(), REDACTED_HEADERS)}")
+        logger.debug(f"Request query params: {_redact(request.query_params.items(), REDACTED_QUERY_PARAMS)}")
 
         # Log request body for debugging (only for small requests to avoid memory issues)
         if request.method in ["POST", "PUT", "PATCH"]:
@@ -72,8 +104,29 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"Error running migrations: {e}")
 
+    # Shared pooled HTTP clients for outbound provider calls
+    app.state.http_clients = http_clients
+
+    # Listen for generation and shot status events published by any process;
+    # an unreachable database is retried in the background
+    await event_broker.start()
+
+    # Runware websocket connections; unreachable connections are retried in the background
+    try:
+        await runware_pool.start()
+    except Exception as e:
+        print(f"Error starting Runware connection pool: {e}")
+
     yield
-    pass
+
+    await event_broker.close()
+    await image_batcher.close()
+    await runware_pool.close()
+
+    # Stop the shared Ark task poller, then close the pooled HTTP clients it uses
+    await ark_task_poller.close()
+    await http_clients.aclose()
+    await engine.dispose()
 
 app = FastAPI(title="VideoStack API", version="1.0.0", lifespan=lifespan)
 
@@ -99,6 +152,7 @@ app.include_router(generation_router, prefix="/api/generations", tags=["generati
 app.include_router(story_board_router, prefix="/api/storyboard", tags=["storyboard"])
 app.include_router(storyboard_v2_router, prefix="/api/storyboard_v2", tags=["storyboards-v2"])
 app.include_router(debug_router, prefix="/api/debug", tags=["debug"])
+app.include_router(event_router, prefix="/api/events", tags=["events"])
 
 
 
@@ -1,4 +1,5 @@
-from typing import Optional, TYPE_CHECKING
+from typing import Dict, Optional, TYPE_CHECKING
+from sqlalchemy import Column, JSON
 from sqlmodel import Field, SQLModel, Relationship
 from models.base_model import BasicModel
 
@@ -14,6 +15,7 @@ class Asset(BasicModel, table=True):
     link: str = Field(..., index=True)  # Required field
     type: str = Field(..., index=True)  # Required field - values: "image", "audio", "video"
     status: str = Field(default="active", index=True)  # Required field with default - values: "active", "deleted"
+    derivatives: Optional[Dict[str, str]] = Field(default=None, sa_column=Column(JSON))  # Thumbnail, poster and preview URLs by name
 
     # Many-to-one relationship: Asset belongs to one user
     user: Optional["User"] = Relationship(back_populates="assets")
@@ -1,16 +1,34 @@
 import uuid
 from datetime import datetime, timezone
 
+from sqlalchemy import DateTime
+from sqlalchemy.types import TypeDecorator
 from sqlmodel import Field, SQLModel
 from pydantic import ConfigDict
 
 
+class UTCDateTime(TypeDecorator):
+    """`timestamp without time zone` column holding UTC, accepting timezone-aware datetimes.
+
+    asyncpg rejects aware datetimes for naive timestamp columns, so they are
+    converted to naive UTC before being sent.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
 class BasicModel(SQLModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    creation_date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    creation_date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=UTCDateTime)
     updated_date: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
-        sa_column_kwargs={"onupdate": datetime.now(timezone.utc)},
+        sa_type=UTCDateTime,
+        sa_column_kwargs={"onupdate": lambda: datetime.now(timezone.utc)},
     )
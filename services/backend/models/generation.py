@@ -1,4 +1,5 @@
-from typing import Optional, TYPE_CHECKING
+from typing import Dict, Optional, TYPE_CHECKING
+from sqlalchemy import Column, Index, JSON, text
 from sqlmodel import Field, SQLModel, Relationship
 from models.base_model import BasicModel
 
@@ -9,6 +10,14 @@ if TYPE_CHECKING:
 class Generation(BasicModel, table=True):
     """Generation model with SQLModel for database and Pydantic validation."""
     __tablename__: str = "generations"
+    __table_args__ = (
+        # Newest-first, keyset paginated listing of a user's generations
+        Index("ix_generations_user_id_status_type_creation_date", "user_id", "status", "generation_type", text("creation_date DESC")),
+        # Duplicate detection for identical requests of a user
+        Index("ix_generations_user_id_request_hash_creation_date", "user_id", "request_hash", text("creation_date DESC")),
+        # An Idempotency-Key identifies at most one generation per user
+        Index("ix_generations_user_id_idempotency_key", "user_id", "idempotency_key", unique=True, postgresql_where=text("idempotency_key IS NOT NULL")),
+    )
 
     user_id: Optional[str] = Field(default=None, foreign_key="users.id", index=True)
     prompt: str = Field(..., index=True)  # Required field
@@ -18,6 +27,9 @@ class Generation(BasicModel, table=True):
     status: str = Field(default="pending", index=True)  # Required field with default - values: "pending", "processing", "completed", "failed"
     generated_content_url: Optional[str] = Field(default=None)  # URL where the generated content is stored
     error_message: Optional[str] = Field(default=None)  # Error message if generation failed
+    request_hash: Optional[str] = Field(default=None)  # SHA-256 of the normalized generation request
+    idempotency_key: Optional[str] = Field(default=None)  # Client-supplied Idempotency-Key header
+    derivatives: Optional[Dict[str, str]] = Field(default=None, sa_column=Column(JSON))  # Thumbnail, poster and preview URLs by name
 
     # Many-to-one relationship: Generation belongs to one user
     user: Optional["User"] = Relationship(back_populates="generations")
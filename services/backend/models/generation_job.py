@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any
+from sqlalchemy import Column, JSON
+from sqlmodel import Field
+from models.base_model import BasicModel, UTCDateTime
+
+
+class GenerationJob(BasicModel, table=True):
+    """GenerationJob model - a queued unit of work executed by the generation worker."""
+    __tablename__: str = "generation_jobs"
+
+    generation_id: Optional[str] = Field(default=None, foreign_key="generations.id", index=True)
+    asset_id: Optional[str] = Field(default=None, foreign_key="assets.id", index=True)  # Set instead of generation_id for asset derive jobs
+    job_type: str = Field(default="generation", index=True)  # generation, mirror, derive
+    payload: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))  # Normalized GenerationRequest, or the source URL of a mirror job
+    status: str = Field(default="queued", index=True)  # queued, running, completed, failed, cancelled
+    attempts: int = Field(default=0)  # Number of times a worker has claimed this job
+    max_attempts: int = Field(default=3)  # Attempts before the job is marked as failed
+    available_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=UTCDateTime, index=True)  # Earliest time a worker may claim the job
+    locked_at: Optional[datetime] = Field(default=None, sa_type=UTCDateTime)  # When the current worker claimed the job
+    locked_by: Optional[str] = Field(default=None)  # Identifier of the worker holding the job
+    last_error: Optional[str] = Field(default=None)  # Error from the most recent failed attempt
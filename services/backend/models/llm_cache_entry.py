@@ -0,0 +1,15 @@
+from datetime import datetime, timezone
+from sqlmodel import Field
+from models.base_model import BasicModel, UTCDateTime
+
+
+class LlmCacheEntry(BasicModel, table=True):
+    """LlmCacheEntry model - a cached LLM response keyed by a hash of the full request."""
+    __tablename__: str = "llm_cache_entries"
+
+    cache_key: str = Field(..., unique=True, index=True)  # SHA-256 of the normalized completion request
+    model: str = Field(...)  # LLM model that produced the response
+    content: str = Field(...)  # Message content of the response
+    expires_at: datetime = Field(..., sa_type=UTCDateTime, index=True)  # Entry is ignored and evicted after this time
+    last_hit_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=UTCDateTime, index=True)  # Least recently used entries are evicted first
+    hit_count: int = Field(default=0)  # Number of requests served from this entry
@@ -1,4 +1,5 @@
 from typing import Optional, TYPE_CHECKING, List
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship
 from models.base_model import BasicModel
 
@@ -10,6 +11,10 @@ if TYPE_CHECKING:
 class Storyboard(BasicModel, table=True):
     """Storyboard model with SQLModel for database and Pydantic validation."""
     __tablename__: str = "storyboards"
+    __table_args__ = (
+        # Most recently updated first listing of a user's storyboards
+        Index("ix_storyboards_user_id_updated_date", "user_id", text("updated_date DESC")),
+    )
 
     user_id: Optional[str] = Field(default=None, foreign_key="users.id", index=True)
     initial_line: str = Field(..., index=True)  # Required field - the initial concept/line for the storyboard
@@ -21,5 +26,5 @@ class Storyboard(BasicModel, table=True):
     user: Optional["User"] = Relationship(back_populates="storyboards")
 
     # One-to-many relationship: Storyboard has many scenes
-    scenes: List["StoryboardScene"] = Relationship(back_populates="storyboard", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
+    scenes: List["StoryboardScene"] = Relationship(back_populates="storyboard", sa_relationship_kwargs={"cascade": "all, delete-orphan", "order_by": "StoryboardScene.scene_number"})
 
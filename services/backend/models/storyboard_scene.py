@@ -20,5 +20,5 @@ class StoryboardScene(BasicModel, table=True):
     storyboard: Optional["Storyboard"] = Relationship(back_populates="scenes")
 
     # One-to-many relationship: Scene has many shots
-    shots: List["Shot"] = Relationship(back_populates="scene", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
+    shots: List["Shot"] = Relationship(back_populates="scene", sa_relationship_kwargs={"cascade": "all, delete-orphan", "order_by": "Shot.shot_number"})
 
@@ -1,19 +1,42 @@
 """Asset router for managing user assets."""
 from typing import List
 from fastapi import APIRouter, HTTPException, status, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.asset import Asset
 from schemas.auth_schemas import UserProfile
+from schemas.asset_schemas import UploadUrlRequest, UploadUrlResponse, UploadCompleteRequest
 from dependencies.auth_dependencies import get_current_user
+from dependencies.s3_dependencies import create_presigned_upload, complete_presigned_upload
+from services.derivative_service import thumbnail_url
+from services.generation_job_service import enqueue_derive_job
 from db.session import get_session
 
 asset_router = r = APIRouter()
 
 
+def _asset_to_dict(asset: Asset) -> dict:
+    """Convert an Asset model to response format."""
+    derivatives = asset.derivatives or {}
+    return {
+        "id": str(asset.id),
+        "user_id": asset.user_id,
+        "link": asset.link,
+        "type": asset.type,
+        "status": asset.status,
+        "thumbnail_url": thumbnail_url(derivatives),
+        "poster_url": derivatives.get("poster"),
+        "preview_url": derivatives.get("preview"),
+        "derivatives": derivatives,
+        "creation_date": asset.creation_date.isoformat() if asset.creation_date else None,
+        "updated_date": asset.updated_date.isoformat() if asset.updated_date else None,
+    }
+
+
 @r.get("/", response_model=List[dict])
 async def get_user_assets(
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Get all assets for the authenticated user.
@@ -27,21 +50,10 @@ async def get_user_assets(
             Asset.user_id == current_user.database_id,
             Asset.status == "active"
         )
-        assets = session.exec(statement).all()
+        assets = (await session.exec(statement)).all()
 
         # Convert to dictionaries for response
-        asset_list = [
-            {
-                "id": str(asset.id),
-                "user_id": asset.user_id,
-                "link": asset.link,
-                "type": asset.type,
-                "status": asset.status,
-                "creation_date": asset.creation_date.isoformat() if asset.creation_date else None,
-                "updated_date": asset.updated_date.isoformat() if asset.updated_date else None,
-            }
-            for asset in assets
-        ]
+        asset_list = [_asset_to_dict(asset) for asset in assets]
 
         return asset_list
 
@@ -57,7 +69,7 @@ async def upload_asset(
     link: str,
     asset_type: str,
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Create a new asset for the authenticated user.
@@ -86,32 +98,118 @@ async def upload_asset(
         )
 
         session.add(new_asset)
-        session.commit()
-        session.refresh(new_asset)
+        # Only links into our bucket get derivatives, stored under the asset's ID
+        enqueue_derive_job(session, link, f"assets/{new_asset.id}", asset_type, asset=new_asset)
+        await session.commit()
+        await session.refresh(new_asset)
 
-        return {
-            "id": str(new_asset.id),
-            "user_id": new_asset.user_id,
-            "link": new_asset.link,
-            "type": new_asset.type,
-            "status": new_asset.status,
-            "creation_date": new_asset.creation_date.isoformat() if new_asset.creation_date else None,
-            "updated_date": new_asset.updated_date.isoformat() if new_asset.updated_date else None,
-        }
+        return _asset_to_dict(new_asset)
 
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create asset: {str(e)}",
         )
 
 
+@r.post("/uploads", response_model=UploadUrlResponse)
+async def create_upload_url(
+    request: UploadUrlRequest,
+    current_user: UserProfile = Depends(get_current_user),
+):
+    """
+    Get presigned URLs for uploading a file directly to S3.
+
+    Small files are uploaded with a single presigned POST (send "fields" as form
+    fields, then the file). Large files are uploaded as multipart upload by PUTting
+    each part of "part_size" bytes to its URL and keeping the ETag response headers.
+    Register the finished upload with POST /api/assets/uploads/complete.
+
+    Args:
+        request: File name, content type and size
+        current_user: Authenticated user from dependency
+
+    Returns:
+        Presigned upload instructions
+    """
+    try:
+        presigned = await create_presigned_upload(
+            current_user.database_id,
+            request.filename,
+            request.content_type,
+            request.size,
+        )
+        return UploadUrlResponse(**presigned)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create upload URL: {str(e)}",
+        )
+
+
+@r.post("/uploads/complete", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def complete_upload(
+    request: UploadCompleteRequest,
+    current_user: UserProfile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Complete a direct upload and register it as an asset.
+
+    Args:
+        request: Object key, plus upload ID and parts for multipart uploads
+        current_user: Authenticated user from dependency
+
+    Returns:
+        Created asset information
+    """
+    try:
+        link, asset_type = await complete_presigned_upload(
+            current_user.database_id,
+            request.key,
+            request.upload_id,
+            request.parts,
+        )
+
+        # Completing the same upload twice returns the existing asset
+        statement = select(Asset).where(
+            Asset.user_id == current_user.database_id,
+            Asset.link == link
+        )
+        asset = (await session.exec(statement)).first()
+
+        if not asset:
+            asset = Asset(
+                user_id=current_user.database_id,
+                link=link,
+                type=asset_type,
+                status="active",
+            )
+            session.add(asset)
+            enqueue_derive_job(session, link, request.key, asset_type, asset=asset)
+            await session.commit()
+
+        return _asset_to_dict(asset)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to complete upload: {str(e)}",
+        )
+
+
 @r.delete("/{asset_id}", response_model=dict)
 async def delete_asset(
     asset_id: str,
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Soft delete an asset (set status to 'deleted').
@@ -126,7 +224,7 @@ async def delete_asset(
     try:
         # Get the asset
         statement = select(Asset).where(Asset.id == asset_id)
-        asset = session.exec(statement).first()
+        asset = (await session.exec(statement)).first()
 
         if not asset:
             raise HTTPException(
@@ -144,7 +242,7 @@ async def delete_asset(
         # Soft delete by setting status to 'deleted'
         asset.status = "deleted"
         session.add(asset)
-        session.commit()
+        await session.commit()
 
         return {
             "message": "Asset deleted successfully",
@@ -154,7 +252,7 @@ async def delete_asset(
     except HTTPException:
         raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete asset: {str(e)}",
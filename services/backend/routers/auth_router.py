@@ -2,7 +2,7 @@
 from typing import Optional
 from fastapi import APIRouter, HTTPException, status, Query, Depends
 from fastapi.responses import RedirectResponse
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from schemas.auth_schemas import (
     LoginResponse,
     AuthResponse,
@@ -22,6 +22,7 @@ from services.workos_service import (
     update_user_profile,
 )
 from services.user_service import get_or_create_user
+from services.identity_cache import identity_cache
 from dependencies.auth_dependencies import get_current_user, get_current_user_optional
 from db.session import get_session
 from config import CLIENT_URL
@@ -101,7 +102,7 @@ async def signup(
 async def auth_callback(
     code: str = Query(...),
     state: Optional[str] = Query(default=None),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Handle OAuth callback from WorkOS AuthKit.
@@ -131,7 +132,7 @@ async def auth_callback(
         
         # Create or update user in database
         user_profile = UserProfile(**auth_data['user'])
-        db_user = get_or_create_user(session, user_profile)
+        db_user = await get_or_create_user(session, user_profile)
         
         # Redirect to frontend success page with tokens
         # Note: In production, consider using httpOnly cookies for better security
@@ -194,6 +195,7 @@ async def logout(session_id: str = Query(...)):
         )
     
     try:
+        identity_cache.invalidate_session(session_id)
         logout_url = await get_logout_url(session_id)
         return LogoutResponse(
             logout_url=logout_url,
@@ -243,6 +245,7 @@ async def update_current_user_info(
             first_name=profile_update.first_name,
             last_name=profile_update.last_name,
         )
+        identity_cache.invalidate(current_user.id)
         return UserProfile(**updated_user)
     except Exception as e:
         raise HTTPException(
@@ -1,12 +1,97 @@
 """Asset router for managing user assets."""
 
-from fastapi import APIRouter
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from dependencies.bytedance_dependencies import generate_image
+from dependencies.http_client_dependencies import HttpClientRegistry, get_http_client_registry
+from dependencies.runware_pool import runware_pool
+from db.session import engine, get_session
+from db.pool_metrics import pool_metrics
+from models.generation_job import GenerationJob
+from services.output_mirror_service import transfer_metrics
+from services.provider_router import summarize_samples
+from config import get_settings
+
+settings = get_settings()
 
 debug_router = r = APIRouter()
 
 
 @r.get("/debug/bytedance")
 async def debug_bytedance(prompt: str):
-    return await generate_image(prompt)
\ No newline at end of file
+    return await generate_image(prompt)
+
+
+@r.get("/http-pools")
+async def debug_http_pools(registry: HttpClientRegistry = Depends(get_http_client_registry)):
+    """Connection pool statistics for the shared outbound HTTP clients."""
+    return registry.stats()
+
+
+@r.get("/runware-pool")
+async def debug_runware_pool():
+    """State and in-flight requests of the Runware websocket connections."""
+    return runware_pool.snapshot()
+
+
+@r.get("/providers")
+async def debug_providers(session: AsyncSession = Depends(get_session)):
+    """
+    Rolling latency percentiles and error rates of the model backends.
+
+    Generations run in the workers, each routing with its own statistics, so
+    the attempts the workers stored on recent generation jobs are aggregated.
+    """
+    since = datetime.now(timezone.utc) - timedelta(seconds=settings.provider_router_window_seconds)
+    statement = (
+        select(GenerationJob.payload)
+        .where(GenerationJob.job_type == "generation", GenerationJob.updated_date >= since)
+        .order_by(GenerationJob.updated_date)
+    )
+    payloads = (await session.exec(statement)).all()
+    samples = sorted((sample for payload in payloads for sample in payload.get("routing", [])), key=lambda sample: sample["at"])
+    return summarize_samples(samples)
+
+
+@r.get("/db-pool")
+async def debug_db_pool():
+    """Connection pool statistics for the application database engine."""
+    return pool_metrics.snapshot(engine.sync_engine.pool)
+
+
+@r.get("/transfers")
+async def debug_transfers(session: AsyncSession = Depends(get_session)):
+    """
+    Progress and throughput of the output mirroring pipeline.
+
+    Mirror jobs run in the generation workers, so queue state and the results of
+    recent transfers are read from generation_jobs; "process" covers transfers
+    run by this process.
+    """
+    count_statement = (
+        select(GenerationJob.status, func.count())
+        .where(GenerationJob.job_type == "mirror")
+        .group_by(GenerationJob.status)
+    )
+    counts = {job_status: count for job_status, count in (await session.exec(count_statement)).all()}
+
+    recent_statement = (
+        select(GenerationJob)
+        .where(GenerationJob.job_type == "mirror", GenerationJob.status == "completed")
+        .order_by(GenerationJob.updated_date.desc())
+        .limit(20)
+    )
+    results = [job.payload["result"] for job in (await session.exec(recent_statement)).all() if "result" in job.payload]
+    total_bytes = sum(result["bytes"] for result in results)
+    total_seconds = sum(result["seconds"] for result in results)
+
+    return {
+        "jobs": counts,
+        "recent": results,
+        "recent_avg_throughput_mb_per_s": round(total_bytes / max(total_seconds, 1e-6) / 1e6, 2),
+        "process": transfer_metrics.snapshot(),
+    }
@@ -0,0 +1,79 @@
+"""Event router for streaming generation and shot status changes."""
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from dependencies.auth_dependencies import get_current_user
+from db.session import async_session_maker
+from services.event_service import event_broker
+
+event_router = r = APIRouter()
+
+# Seconds between keep-alive comments, so proxies do not close idle streams
+KEEPALIVE_INTERVAL_SECONDS = 15
+
+
+@r.get("/stream")
+async def stream_events(
+    request: Request,
+    generation_id: Optional[str] = Query(default=None),
+    storyboard_id: Optional[str] = Query(default=None),
+    access_token: Optional[str] = Query(default=None),
+    authorization: Optional[str] = Header(None),
+):
+    """
+    Stream status transitions of the user's generations and storyboard shots as server-sent events.
+
+    Each event is named after its type ("generation" or "shot") and carries the
+    new status plus the resulting URLs, e.g. pending -> processing -> completed.
+    Browsers' EventSource cannot send headers, so the access token may also be
+    passed as the access_token query parameter.
+
+    Args:
+        request: Incoming request, used to detect client disconnects
+        generation_id: Optional filter for a single generation
+        storyboard_id: Optional filter for the shots of a single storyboard
+        access_token: Access token when the Authorization header cannot be set
+        authorization: Authorization header with Bearer token
+
+    Returns:
+        text/event-stream response
+    """
+    if not authorization and access_token:
+        authorization = f"Bearer {access_token}"
+
+    # Authenticate with a short-lived session so no connection is pinned for the stream
+    async with async_session_maker() as session:
+        current_user = await get_current_user(authorization, session)
+
+    user_id = current_user.database_id
+    queue = event_broker.subscribe(user_id)
+
+    def matches(event: dict) -> bool:
+        if generation_id and (event.get("type") != "generation" or event.get("id") != generation_id):
+            return False
+        if storyboard_id and (event.get("type") != "shot" or event.get("storyboard_id") != storyboard_id):
+            return False
+        return True
+
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if matches(event):
+                    yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            event_broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
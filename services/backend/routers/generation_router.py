@@ -4,11 +4,14 @@ This router now supports:
 1. Image upload to S3 via POST /api/generations/upload-image
 2. Using uploaded images as first_frame/last_frame in video generation
 3. Automatic integration with ByteDance video generation API
+4. Queued generations: POST /api/generations returns 202 and the generation
+   worker (worker.py) executes the job; GET /{generation_id}/status reports progress
 """
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File
-from sqlmodel import Session, select, desc
+from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Query, Header, Response
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.generation import Generation
 from schemas.auth_schemas import UserProfile
 from schemas.generation_schemas import (
@@ -19,9 +22,16 @@ from schemas.generation_schemas import (
 )
 from dependencies.auth_dependencies import get_current_user
 from db.session import get_session
-from dependencies.runware_dependencies import generate_image, generate_audio, generate_video
-from dependencies.bytedance_dependencies import generate_video as generate_bytedance_video
 from dependencies.s3_dependencies import upload_file_to_s3
+from services.generation_job_service import cancel_generation_jobs, enqueue_generation_job
+from services.generation_dedup_service import (
+    IdempotencyKeyMismatch,
+    find_duplicate_generation,
+    generation_request_hash,
+    lock_generation_request,
+)
+from services.pagination import apply_keyset, page_results
+from services.derivative_service import thumbnail_url
 
 logger = logging.getLogger(__name__)
 generation_router = r = APIRouter()
@@ -67,267 +77,161 @@ async def upload_image(
         )
 
 
-@r.post("/", response_model=GenerationResponse)
+@r.post("/", response_model=GenerationResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_generation(
     request: GenerationRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
-    Create a new generation request for image, video, or audio generation.
+    Queue a new generation request for image, video, or audio generation.
+
+    The generation is stored with status "pending" and executed by the generation
+    worker (worker.py). Use GET /api/generations/{generation_id}/status to follow it.
+
+    Duplicates are not queued again: a request with a known Idempotency-Key, or
+    identical to one of the user's in-flight or recently completed generations,
+    returns that generation with status 200 and an Idempotent-Replayed header.
 
     Args:
         request: Generation request with prompt and optional frame URLs
+        response: Outgoing response, used to mark replayed duplicates
+        idempotency_key: Optional Idempotency-Key header
         current_user: Authenticated user from dependency
 
     Returns:
-        Created generation information
+        Created (or duplicated) generation information
     """
     try:
-        # Generate content based on type
-        if request.generation_type == "image":
-            # Image generation parameters
-            model = request.model if request.model else "google:4@1"
-
-            width = request.width if request.width else 1024
-            height = request.height if request.height else 1024
-
-            generated_content_url = await generate_image(request.prompt, model, width, height)
-            
-            # Create new generation with the generated content URL
-            new_generation = Generation(
-                user_id=current_user.database_id,
-                prompt=request.prompt,
-                first_frame=request.first_frame,
-                last_frame=request.last_frame,
-                generation_type=request.generation_type,
-                status="completed",
-                generated_content_url=generated_content_url,
-            )
-            
-        elif request.generation_type == "video":
-            # Get model from request or use appropriate default
-            model = request.model if request.model else "seedance-1-0-lite-t2v-250428"
-
-            # Check if this is a ByteDance seedance model
-            is_seedance_model = model.startswith("seedance") or "seedance" in model
-
-            if is_seedance_model:
-                # Handle ByteDance seedance models using ByteDance API directly
-                duration = request.duration if request.duration else 5
-
-                # Get aspect ratio from request or use default
-                aspect_ratio = request.aspect_ratio if request.aspect_ratio else "16:9"
-
-                # Map resolution parameters to ByteDance format
-                resolution = "720p"  # Default resolution
-
-                if request.width and request.height:
-                    # Map common width/height combinations to ByteDance resolution
-                    width_height_map = {
-                        (864, 480): "720p",
-                        (1024, 576): "720p",
-                        (1280, 720): "720p",
-                        (1920, 1080): "1080p",
-                    }
-                    resolution = width_height_map.get((request.width, request.height), "720p")
-
-                # Camera fixed parameter (not in schema, so use default)
-                camera_fixed = False
-
-                print(f"🎥 ROUTER: Using ByteDance API for seedance model: {model}")
-                print(f"🎥 ROUTER: Prompt: {request.prompt[:50]}...")
-                print(f"🎥 ROUTER: Duration: {duration}s, Resolution: {resolution}, Aspect Ratio: {aspect_ratio}")
-                print(f"🎥 ROUTER: Camera Fixed: {camera_fixed}")
-                print(f"🎥 ROUTER: First frame: {request.first_frame}")
-                print(f"🎥 ROUTER: Last frame: {request.last_frame}")
-
-                # Use ByteDance API directly for seedance models
-                bytedance_response = await generate_bytedance_video(
-                    text=request.prompt,
-                    first_image=request.first_frame,
-                    last_image=request.last_frame,
-                    model=model,
-                    aspect_ratio=aspect_ratio,
-                    resolution=resolution,
-                    duration=duration,
-                    camera_fixed=camera_fixed,
-                )
-
-                # Handle ByteDance API response (async task)
-                if bytedance_response and isinstance(bytedance_response, dict):
-                    print(f"🎥 ROUTER: ByteDance task created: {bytedance_response}")
-
-                    # Extract task information for storage and future polling
-                    task_data = {
-                        "task_id": bytedance_response.get("id", ""),
-                        "status": bytedance_response.get("status", "processing"),
-                        "model": model,
-                        "prompt": request.prompt,
-                        "resolution": resolution,
-                        "duration": duration,
-                    }
-
-                    # Get the video URL from the response
-                    generated_content_url = bytedance_response.get('video_url')
-
-                    print(f"🎥 ROUTER: Task completed with video URL: {generated_content_url}")
-                else:
-                    generated_content_url = None
-                    print(f"🎥 ROUTER: ByteDance API call failed or returned None")
-
-            else:
-                # Handle other models (Runware, etc.)
-                width = request.width if request.width else 864
-                height = request.height if request.height else 480
-                duration = request.duration if request.duration else 5
-                fps = 24
-                output_format = "MP4"
-                output_quality = 85
-
-                generated_content_url = await generate_video(
-                    prompt=request.prompt,
-                    model=model,
-                    width=width,
-                    height=height,
-                    duration=duration,
-                    fps=fps,
-                    output_format=output_format,
-                    output_quality=output_quality,
-                    first_frame=request.first_frame,
-                    last_frame=request.last_frame,
-                )
-
-            # Create new generation with the generated content URL
-            # Set generation status based on model type and success
-            if is_seedance_model:
-                # For ByteDance models, check if generation was successful
-                if generated_content_url and generated_content_url != '-':
-                    generation_status = "completed"
-                    error_message = None
-                else:
-                    generation_status = "failed"
-                    if not generated_content_url:
-                        error_message = "ByteDance video generation failed - no video URL returned"
-                    else:
-                        error_message = None
-            else:
-                generation_status = "completed"
-                error_message = None
-
-            new_generation = Generation(
-                user_id=current_user.database_id,
-                prompt=request.prompt,
-                first_frame=request.first_frame,
-                last_frame=request.last_frame,
-                generation_type=request.generation_type,
-                status=generation_status,
-                generated_content_url=generated_content_url,
-                error_message=error_message if error_message else None,
-            )
-            
-        elif request.generation_type == "audio":
-            # Audio generation parameters
-            model = request.model if request.model else "elevenlabs:1@1"
-            duration = request.duration if request.duration else 10
-            output_format = "MP3"
-            bitrate = 128
-            sample_rate = 44100
-            
-            print(f"\n🎵 ROUTER: Starting audio generation for prompt: {request.prompt[:50]}...")
-            print(f"🎵 ROUTER: User ID: {current_user.database_id}")
-            print(f"🎵 ROUTER: Duration: {duration} seconds")
-            
-            generated_content_url = await generate_audio(
-                prompt=request.prompt,
-                model=model,
-                duration=duration,
-                output_format=output_format,
-                bitrate=bitrate,
-                sample_rate=sample_rate,
-            )
-            
-            print(f"🎵 ROUTER: Audio generation completed. URL: {generated_content_url}")
-            print(f"🎵 ROUTER: URL type: {type(generated_content_url)}")
-            print(f"🎵 ROUTER: URL is None: {generated_content_url is None}")
-            print(f"🎵 ROUTER: URL bool: {bool(generated_content_url)}")
-            
-            if not generated_content_url:
-                print(f"❌ ROUTER: No URL returned, raising exception")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Audio generation failed: No URL returned",
-                )
-            
-            print(f"✅ ROUTER: URL validated, creating generation record")
-            
-            # Create new generation with the generated content URL
-            new_generation = Generation(
-                user_id=current_user.database_id,
-                prompt=request.prompt,
-                first_frame=request.first_frame,
-                last_frame=request.last_frame,
-                generation_type=request.generation_type,
-                status="completed",
-                generated_content_url=generated_content_url,
-            )
-            
-            print(f"✅ ROUTER: Created generation record (not saved yet)")
-            
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid generation type: {request.generation_type}",
-            )
-
-        print(f"💾 ROUTER: Adding generation to session...")
-        session.add(new_generation)
-        
-        print(f"💾 ROUTER: Committing to database...")
-        session.commit()
-        
-        print(f"💾 ROUTER: Refreshing from database...")
-        session.refresh(new_generation)
-
-        print(f"💾 ROUTER: Saved to database - ID: {new_generation.id}, Type: {new_generation.generation_type}, URL: {new_generation.generated_content_url}")
-
-        response = GenerationResponse(
-            id=str(new_generation.id),
-            user_id=new_generation.user_id,
-            prompt=new_generation.prompt,
-            first_frame=new_generation.first_frame,
-            last_frame=new_generation.last_frame,
-            generation_type=new_generation.generation_type,
-            status=new_generation.status,
-            generated_content_url=new_generation.generated_content_url,
-            error_message=new_generation.error_message,
-            creation_date=new_generation.creation_date.isoformat() if new_generation.creation_date else "",
-            updated_date=new_generation.updated_date.isoformat() if new_generation.updated_date else "",
+        request_hash = generation_request_hash(request)
+        await lock_generation_request(session, current_user.database_id, request_hash, idempotency_key)
+
+        duplicate = await find_duplicate_generation(session, current_user.database_id, request_hash, idempotency_key)
+        if duplicate:
+            # Convert before the rollback expires the loaded generation
+            replayed = _generation_to_response(duplicate)
+            # Ending the transaction releases the advisory locks
+            await session.rollback()
+            logger.info(f"Generation request of user {current_user.database_id} duplicates generation {replayed.id} ({replayed.status})")
+            response.status_code = status.HTTP_200_OK
+            response.headers["Idempotent-Replayed"] = "true"
+            return replayed
+
+        new_generation = Generation(
+            user_id=current_user.database_id,
+            prompt=request.prompt,
+            first_frame=request.first_frame,
+            last_frame=request.last_frame,
+            generation_type=request.generation_type,
+            status="pending",
+            request_hash=request_hash,
+            idempotency_key=idempotency_key,
         )
-        
-        print(f"📤 ROUTER: Created response object")
-        print(f"📤 ROUTER: Response URL: {response.generated_content_url}")
-        print(f"📤 ROUTER: Response dict: {response.model_dump()}")
-        print(f"📤 ROUTER: Returning response to frontend\n")
-        return response
+        session.add(new_generation)
+        enqueue_generation_job(session, new_generation, request)
+        await session.commit()
+        await session.refresh(new_generation)
 
-    except HTTPException:
-        raise
+        logger.info(f"Queued {new_generation.generation_type} generation {new_generation.id} for user {current_user.database_id}")
+
+        return _generation_to_response(new_generation)
+
+    except IdempotencyKeyMismatch as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        )
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create generation: {str(e)}",
         )
 
 
+def _generation_to_response(gen: Generation) -> GenerationResponse:
+    """Convert a Generation model to response format."""
+    return GenerationResponse(
+        id=str(gen.id),
+        user_id=gen.user_id,
+        prompt=gen.prompt,
+        first_frame=gen.first_frame,
+        last_frame=gen.last_frame,
+        generation_type=gen.generation_type,
+        status=gen.status,
+        generated_content_url=gen.generated_content_url,
+        error_message=gen.error_message,
+        creation_date=gen.creation_date.isoformat() if gen.creation_date else "",
+        updated_date=gen.updated_date.isoformat() if gen.updated_date else "",
+        thumbnail_url=thumbnail_url(gen.derivatives),
+        poster_url=(gen.derivatives or {}).get("poster"),
+        preview_url=(gen.derivatives or {}).get("preview"),
+        derivatives=gen.derivatives or {},
+    )
+
+
+async def _list_generations(
+    session: AsyncSession,
+    user_id: str,
+    generation_type: Optional[str],
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+) -> GenerationListResponse:
+    """
+    Load one newest-first page of a user's generations, paginated and counted in SQL.
+
+    Args:
+        session: Database session
+        user_id: Database ID of the user
+        generation_type: Optional filter by generation type
+        skip: Offset for the first page when no cursor is given
+        limit: Page size
+        cursor: Cursor from the previous page's next_cursor
+
+    Returns:
+        The page with the total count and the cursor of the next page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    # Exclude deleted generations
+    filters = [Generation.user_id == user_id, Generation.status != "deleted"]
+    if generation_type:
+        filters.append(Generation.generation_type == generation_type)
+
+    count_statement = select(func.count()).select_from(Generation).where(*filters)
+    total = (await session.exec(count_statement)).one()
+
+    # Newest first on (creation_date, id), continuing after the cursor
+    statement = apply_keyset(select(Generation).where(*filters), Generation.creation_date, Generation.id, cursor, limit)
+    if not cursor and skip:
+        statement = statement.offset(skip)
+
+    generations, next_cursor = page_results(
+        (await session.exec(statement)).all(),
+        limit,
+        cursor_key=lambda gen: (gen.creation_date, gen.id),
+    )
+
+    return GenerationListResponse(
+        generations=[_generation_to_response(gen) for gen in generations],
+        total=total,
+        next_cursor=next_cursor,
+    )
+
+
 @r.get("/", response_model=GenerationListResponse)
 async def get_user_generations(
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(default=50, ge=1, le=200),
     generation_type: Optional[str] = None,
+    cursor: Optional[str] = None,
 ):
     """
     Get all generations for the authenticated user.
@@ -335,57 +239,29 @@ async def get_user_generations(
     Args:
         current_user: Authenticated user from dependency
         session: Database session
-        skip: Number of records to skip for pagination
+        skip: Number of records to skip (first page only, prefer cursor)
         limit: Maximum number of records to return
         generation_type: Optional filter by generation type (image, video, audio)
+        cursor: next_cursor of the previous page
 
     Returns:
-        List of user generations with total count
+        List of user generations with total count and the next page cursor
     """
     try:
-        # Build query with filters - exclude deleted generations
-        statement = select(Generation).where(
-            Generation.user_id == current_user.database_id,
-            Generation.status != "deleted"
+        return await _list_generations(
+            session=session,
+            user_id=current_user.database_id,
+            generation_type=generation_type,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
         )
-        
-        # Apply type filter if provided
-        if generation_type:
-            statement = statement.where(Generation.generation_type == generation_type)
-        
-        # Order by creation date descending (newest first)
-        statement = statement.order_by(desc(Generation.creation_date))
-        
-        # Execute query
-        generations = session.exec(statement).all()
-
-        # Apply pagination
-        total = len(generations)
-        paginated_generations = generations[skip:skip + limit]
-
-        # Convert to response format
-        generation_list = [
-            GenerationResponse(
-                id=str(gen.id),
-                user_id=gen.user_id,
-                prompt=gen.prompt,
-                first_frame=gen.first_frame,
-                last_frame=gen.last_frame,
-                generation_type=gen.generation_type,
-                status=gen.status,
-                generated_content_url=gen.generated_content_url,
-                error_message=gen.error_message,
-                creation_date=gen.creation_date.isoformat() if gen.creation_date else "",
-                updated_date=gen.updated_date.isoformat() if gen.updated_date else "",
-            )
-            for gen in paginated_generations
-        ]
 
-        return GenerationListResponse(
-            generations=generation_list,
-            total=total,
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
-
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -396,9 +272,10 @@ async def get_user_generations(
 @r.get("/images", response_model=GenerationListResponse)
 async def get_user_images(
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
 ):
     """
     Get all image generations for the authenticated user.
@@ -408,6 +285,7 @@ async def get_user_images(
         session: Database session
         skip: Number of records to skip for pagination
         limit: Maximum number of records to return
+        cursor: next_cursor of the previous page
 
     Returns:
         List of user image generations with total count
@@ -417,6 +295,7 @@ async def get_user_images(
         session=session,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         generation_type="image"
     )
 
@@ -424,9 +303,10 @@ async def get_user_images(
 @r.get("/videos", response_model=GenerationListResponse)
 async def get_user_videos(
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
 ):
     """
     Get all video generations for the authenticated user.
@@ -436,6 +316,7 @@ async def get_user_videos(
         session: Database session
         skip: Number of records to skip for pagination
         limit: Maximum number of records to return
+        cursor: next_cursor of the previous page
 
     Returns:
         List of user video generations with total count
@@ -445,6 +326,7 @@ async def get_user_videos(
         session=session,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         generation_type="video"
     )
 
@@ -452,9 +334,10 @@ async def get_user_videos(
 @r.get("/audios", response_model=GenerationListResponse)
 async def get_user_audios(
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
 ):
     """
     Get all audio generations for the authenticated user.
@@ -464,6 +347,7 @@ async def get_user_audios(
         session: Database session
         skip: Number of records to skip for pagination
         limit: Maximum number of records to return
+        cursor: next_cursor of the previous page
 
     Returns:
         List of user audio generations with total count
@@ -473,6 +357,7 @@ async def get_user_audios(
         session=session,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         generation_type="audio"
     )
 
@@ -481,7 +366,7 @@ async def get_user_audios(
 async def get_generation(
     generation_id: str,
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Get a specific generation by ID.
@@ -499,7 +384,7 @@ async def get_generation(
             Generation.id == generation_id,
             Generation.user_id == current_user.database_id
         )
-        generation = session.exec(statement).first()
+        generation = (await session.exec(statement)).first()
 
         if not generation:
             raise HTTPException(
@@ -507,19 +392,7 @@ async def get_generation(
                 detail="Generation not found",
             )
 
-        return GenerationResponse(
-            id=str(generation.id),
-            user_id=generation.user_id,
-            prompt=generation.prompt,
-            first_frame=generation.first_frame,
-            last_frame=generation.last_frame,
-            generation_type=generation.generation_type,
-            status=generation.status,
-            generated_content_url=generation.generated_content_url,
-            error_message=generation.error_message,
-            creation_date=generation.creation_date.isoformat() if generation.creation_date else "",
-            updated_date=generation.updated_date.isoformat() if generation.updated_date else "",
-        )
+        return _generation_to_response(generation)
 
     except HTTPException:
         raise
@@ -534,7 +407,7 @@ async def get_generation(
 async def get_generation_status(
     generation_id: str,
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Get the status of a specific generation.
@@ -552,7 +425,7 @@ async def get_generation_status(
             Generation.id == generation_id,
             Generation.user_id == current_user.database_id
         )
-        generation = session.exec(statement).first()
+        generation = (await session.exec(statement)).first()
 
         if not generation:
             raise HTTPException(
@@ -580,10 +453,10 @@ async def get_generation_status(
 async def delete_generation(
     generation_id: str,
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
-    Soft delete a generation (set status to 'deleted').
+    Soft delete a generation (set status to 'deleted') and cancel its queued jobs.
 
     Args:
         generation_id: ID of the generation to delete
@@ -598,7 +471,7 @@ async def delete_generation(
             Generation.id == generation_id,
             Generation.user_id == current_user.database_id
         )
-        generation = session.exec(statement).first()
+        generation = (await session.exec(statement)).first()
 
         if not generation:
             raise HTTPException(
@@ -616,7 +489,8 @@ async def delete_generation(
         # Soft delete by setting status to 'deleted'
         generation.status = "deleted"
         session.add(generation)
-        session.commit()
+        await cancel_generation_jobs(session, generation.id)
+        await session.commit()
 
         return {
             "message": "Generation deleted successfully",
@@ -626,7 +500,7 @@ async def delete_generation(
     except HTTPException:
         raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete generation: {str(e)}",
@@ -1,13 +1,16 @@
 """Generation router for image and video generation."""
+import json
 from typing import List
 from fastapi import APIRouter, HTTPException, status, Depends
-from sqlmodel import Session, select
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.generation import Generation
 from schemas.auth_schemas import UserProfile
 
 from dependencies.auth_dependencies import get_current_user
 from db.session import get_session
-from dependencies.llm_dependencies import generate_storyboard_options, generate_storyboard_scenes
+from dependencies.llm_dependencies import StoryBoard, generate_storyboard_options, generate_storyboard_scenes, stream_storyboard_scenes
 from schemas.storyboard_schemas import StoryBoardRequest, StoryBoardScenesRequest
 
 story_board_router = r = APIRouter()
@@ -17,7 +20,7 @@ story_board_router = r = APIRouter()
 async def create_storyboard(
     request: StoryBoardRequest,
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Create a new storyboard for the authenticated user.
@@ -27,7 +30,7 @@ async def create_storyboard(
         current_user: Authenticated user from dependency
         session: Database session
     """
-    storyboard_options = await generate_storyboard_options(request.prompt)
+    storyboard_options = await generate_storyboard_options(request.prompt, bypass_cache=request.bypass_cache)
     return storyboard_options
 
 
@@ -35,10 +38,36 @@ async def create_storyboard(
 async def create_storyboard_scenes(
     request: StoryBoardScenesRequest,
     # current_user: UserProfile = Depends(get_current_user),
-    # session: Session = Depends(get_session),
+    # session: AsyncSession = Depends(get_session),
 ):
     """
     Create a new storyboard for the authenticated user.
     """
-    storyboard_scenes = await generate_storyboard_scenes(request.storyline)
-    return storyboard_scenes
\ No newline at end of file
+    storyboard_scenes = await generate_storyboard_scenes(request.storyline, bypass_cache=request.bypass_cache)
+    return storyboard_scenes
+
+
+@r.post("/scenes/stream")
+async def stream_storyboard_scenes_events(
+    request: StoryBoardScenesRequest,
+):
+    """
+    Create storyboard scenes, streaming each scene as a server-sent event as soon as it is generated.
+
+    Emits a "scene" event per scene, then a "storyboard" event with the complete
+    storyboard. Failures after the stream started are sent as an "error" event.
+    """
+    async def event_stream():
+        try:
+            async for item in stream_storyboard_scenes(request.storyline, bypass_cache=request.bypass_cache):
+                event = "storyboard" if isinstance(item, StoryBoard) else "scene"
+                yield f"event: {event}\ndata: {item.model_dump_json()}\n\n"
+        except Exception as e:
+            error = {"detail": f"Failed to generate storyboard scenes: {str(e)}"}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,7 +1,12 @@
 """Storyboard v2 router for managing storyboards, scenes, and shots."""
-from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends
-from sqlmodel import Session, select
+from datetime import datetime, timezone
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from sqlalchemy import distinct, true, update
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import selectinload
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.storyboard import Storyboard
 from models.storyboard_scene import StoryboardScene
 from models.shot import Shot
@@ -18,20 +23,52 @@ from schemas.storyboard_v2_schemas import (
     ShotResponse,
     ShotAddRequest,
     ShotUpdateRequest,
+    StoryboardBatchRequest,
 )
 from dependencies.auth_dependencies import get_current_user
+from dependencies.storyboard_dependencies import get_owned_scene, get_owned_shot, resolve_storyboard_path
 from db.session import get_session
-from dependencies.runware_dependencies import generate_image
+from services.storyboard_image_service import generate_shot_images
+from services.provider_registry import DEFAULT_MODELS
+from services.event_service import publish_event, shot_event
+from services.pagination import apply_keyset, page_results
+from services.storyboard_batch_service import StoryboardBatchError, apply_storyboard_operations, bulk_insert
 
 storyboard_v2_router = r = APIRouter()
 
 
 # ============= Helper Functions =============
 
+# Eager-load the scene/shot tree in three queries (storyboards, scenes, shots), an AsyncSession
+# cannot lazy load relationships. Scenes and shots come back ordered by scene_number/shot_number
+# through the relationships' order_by.
+STORYBOARD_TREE_OPTIONS = (selectinload(Storyboard.scenes).selectinload(StoryboardScene.shots),)
+
+
+async def _load_storyboard_tree(session: AsyncSession, storyboard_id: str) -> Storyboard:
+    """Load a storyboard with all scenes and shots, replacing any stale state in the session."""
+    statement = (
+        select(Storyboard)
+        .where(Storyboard.id == storyboard_id)
+        .options(*STORYBOARD_TREE_OPTIONS)
+        .execution_options(populate_existing=True)
+    )
+    return (await session.exec(statement)).one()
+
+
+def _timestamp(value: Optional[datetime]) -> str:
+    """Format a timestamp as naive UTC, like the values read back from the database."""
+    if value is None:
+        return ""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
 def _storyboard_to_response(storyboard: Storyboard) -> StoryboardResponse:
     """Convert a Storyboard model to response format."""
     scenes = []
-    for scene in sorted(storyboard.scenes, key=lambda s: s.scene_number):
+    for scene in storyboard.scenes:
         shots = [
             ShotResponse(
                 id=str(shot.id),
@@ -42,10 +79,10 @@ def _storyboard_to_response(storyboard: Storyboard) -> StoryboardResponse:
                 end_image_url=shot.end_image_url,
                 video_url=shot.video_url,
                 status=shot.status,
-                creation_date=shot.creation_date.isoformat() if shot.creation_date else "",
-                updated_date=shot.updated_date.isoformat() if shot.updated_date else "",
+                creation_date=_timestamp(shot.creation_date),
+                updated_date=_timestamp(shot.updated_date),
             )
-            for shot in sorted(scene.shots, key=lambda sh: sh.shot_number)
+            for shot in scene.shots
         ]
         scenes.append(
             StoryboardSceneResponse(
@@ -55,8 +92,8 @@ def _storyboard_to_response(storyboard: Storyboard) -> StoryboardResponse:
                 description=scene.description,
                 duration=scene.duration,
                 shots=shots,
-                creation_date=scene.creation_date.isoformat() if scene.creation_date else "",
-                updated_date=scene.updated_date.isoformat() if scene.updated_date else "",
+                creation_date=_timestamp(scene.creation_date),
+                updated_date=_timestamp(scene.updated_date),
             )
         )
 
@@ -68,8 +105,8 @@ def _storyboard_to_response(storyboard: Storyboard) -> StoryboardResponse:
         title=storyboard.title,
         status=storyboard.status,
         scenes=scenes,
-        creation_date=storyboard.creation_date.isoformat() if storyboard.creation_date else "",
-        updated_date=storyboard.updated_date.isoformat() if storyboard.updated_date else "",
+        creation_date=_timestamp(storyboard.creation_date),
+        updated_date=_timestamp(storyboard.updated_date),
     )
 
 
@@ -88,7 +125,7 @@ def _scene_to_response(scene: StoryboardScene) -> StoryboardSceneResponse:
             creation_date=shot.creation_date.isoformat() if shot.creation_date else "",
             updated_date=shot.updated_date.isoformat() if shot.updated_date else "",
         )
-        for shot in sorted(scene.shots, key=lambda sh: sh.shot_number)
+        for shot in scene.shots
     ]
 
     return StoryboardSceneResponse(
@@ -109,7 +146,7 @@ def _scene_to_response(scene: StoryboardScene) -> StoryboardSceneResponse:
 async def create_storyboard(
     request: StoryboardCreateRequest,
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Create a new storyboard with optional scenes and shots.
@@ -123,51 +160,51 @@ async def create_storyboard(
         Created storyboard with all nested data
     """
     try:
-        # Create storyboard
+        # IDs are generated client-side, so the whole tree is built in memory and written
+        # with one multi-row INSERT per table instead of flushing row by row
+        scenes = [
+            StoryboardScene(
+                scene_number=scene_req.scene_number,
+                description=scene_req.description,
+                duration=scene_req.duration,
+                shots=[
+                    Shot(
+                        shot_number=shot_req.shot_number,
+                        user_prompt=shot_req.user_prompt,
+                        start_image_url=shot_req.start_image_url,
+                        end_image_url=shot_req.end_image_url,
+                        video_url=shot_req.video_url,
+                        status=shot_req.status or "pending",
+                    )
+                    for shot_req in sorted(scene_req.shots or [], key=lambda shot_req: shot_req.shot_number)
+                ],
+            )
+            for scene_req in sorted(request.scenes or [], key=lambda scene_req: scene_req.scene_number)
+        ]
         new_storyboard = Storyboard(
             user_id=current_user.database_id,
             initial_line=request.initial_line,
             storyline=request.storyline,
             title=request.title,
             status=request.status or "draft",
+            scenes=scenes,
         )
 
-        session.add(new_storyboard)
-        session.flush()  # Get the storyboard ID
-
-        # Create scenes if provided
-        if request.scenes:
-            for scene_req in request.scenes:
-                new_scene = StoryboardScene(
-                    storyboard_id=new_storyboard.id,
-                    scene_number=scene_req.scene_number,
-                    description=scene_req.description,
-                    duration=scene_req.duration,
-                )
-                session.add(new_scene)
-                session.flush()  # Get the scene ID
-
-                # Create shots if provided
-                if scene_req.shots:
-                    for shot_req in scene_req.shots:
-                        new_shot = Shot(
-                            scene_id=new_scene.id,
-                            shot_number=shot_req.shot_number,
-                            user_prompt=shot_req.user_prompt,
-                            start_image_url=shot_req.start_image_url,
-                            end_image_url=shot_req.end_image_url,
-                            video_url=shot_req.video_url,
-                            status=shot_req.status or "pending",
-                        )
-                        session.add(new_shot)
-
-        session.commit()
-        session.refresh(new_storyboard)
+        for scene in scenes:
+            scene.storyboard_id = new_storyboard.id
+            for shot in scene.shots:
+                shot.scene_id = scene.id
+
+        await bulk_insert(session, Storyboard, [new_storyboard])
+        await bulk_insert(session, StoryboardScene, scenes)
+        await bulk_insert(session, Shot, [shot for scene in scenes for shot in scene.shots])
+        await session.commit()
 
+        # The objects never joined the session, the response is built from the in-memory tree
         return _storyboard_to_response(new_storyboard)
 
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create storyboard: {str(e)}",
@@ -177,28 +214,55 @@ async def create_storyboard(
 @r.get("/", response_model=StoryboardListResponse)
 async def get_user_storyboards(
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
 ):
     """
-    Get all storyboards for the authenticated user.
+    Get all storyboards for the authenticated user, most recently updated first.
 
     Args:
         current_user: Authenticated user from dependency
         session: Database session
-        skip: Number of records to skip
+        skip: Number of records to skip (first page only, prefer cursor)
         limit: Maximum number of records to return
+        cursor: next_cursor of the previous page
 
     Returns:
-        List of storyboard summaries
+        List of storyboard summaries with total count and the next page cursor
     """
     try:
-        statement = select(Storyboard).where(Storyboard.user_id == current_user.database_id)
-        storyboards = session.exec(statement).all()
+        # Scene/shot counts per storyboard, evaluated only for the rows of the page
+        counts = (
+            select(
+                func.count(distinct(StoryboardScene.id)).label("scene_count"),
+                func.count(Shot.id).label("shot_count"),
+                func.count(Shot.id).filter(Shot.status == "completed").label("completed_shot_count"),
+            )
+            .select_from(StoryboardScene)
+            .outerjoin(Shot, Shot.scene_id == StoryboardScene.id)
+            .where(StoryboardScene.storyboard_id == Storyboard.id)
+            .lateral("storyboard_counts")
+        )
 
-        total = len(storyboards)
-        paginated_storyboards = storyboards[skip:skip + limit]
+        statement = (
+            select(Storyboard, counts.c.scene_count, counts.c.shot_count, counts.c.completed_shot_count)
+            .join(counts, true())
+            .where(Storyboard.user_id == current_user.database_id)
+        )
+        statement = apply_keyset(statement, Storyboard.updated_date, Storyboard.id, cursor, limit)
+        if not cursor and skip:
+            statement = statement.offset(skip)
+
+        rows, next_cursor = page_results(
+            (await session.exec(statement)).all(),
+            limit,
+            cursor_key=lambda row: (row[0].updated_date, row[0].id),
+        )
+
+        count_statement = select(func.count()).select_from(Storyboard).where(Storyboard.user_id == current_user.database_id)
+        total = (await session.exec(count_statement)).one()
 
         summaries = [
             StoryboardSummaryResponse(
@@ -208,15 +272,23 @@ async def get_user_storyboards(
                 storyline=sb.storyline,
                 title=sb.title,
                 status=sb.status,
-                scene_count=len(sb.scenes),
+                scene_count=scene_count,
+                shot_count=shot_count,
+                completed_shot_count=completed_shot_count,
+                completion_percentage=round(completed_shot_count * 100 / shot_count, 1) if shot_count else 0.0,
                 creation_date=sb.creation_date.isoformat() if sb.creation_date else "",
                 updated_date=sb.updated_date.isoformat() if sb.updated_date else "",
             )
-            for sb in paginated_storyboards
+            for sb, scene_count, shot_count, completed_shot_count in rows
         ]
 
-        return StoryboardListResponse(storyboards=summaries, total=total)
+        return StoryboardListResponse(storyboards=summaries, total=total, next_cursor=next_cursor)
 
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -228,7 +300,7 @@ async def get_user_storyboards(
 async def get_storyboard(
     storyboard_id: str,
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Get a specific storyboard with all scenes and shots.
@@ -245,8 +317,8 @@ async def get_storyboard(
         statement = select(Storyboard).where(
             Storyboard.id == storyboard_id,
             Storyboard.user_id == current_user.database_id
-        )
-        storyboard = session.exec(statement).first()
+        ).options(*STORYBOARD_TREE_OPTIONS)
+        storyboard = (await session.exec(statement)).first()
 
         if not storyboard:
             raise HTTPException(
@@ -270,7 +342,7 @@ async def update_storyboard(
     storyboard_id: str,
     request: StoryboardUpdateRequest,
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Update storyboard metadata (not scenes or shots).
@@ -288,8 +360,8 @@ async def update_storyboard(
         statement = select(Storyboard).where(
             Storyboard.id == storyboard_id,
             Storyboard.user_id == current_user.database_id
-        )
-        storyboard = session.exec(statement).first()
+        ).options(*STORYBOARD_TREE_OPTIONS)
+        storyboard = (await session.exec(statement)).first()
 
         if not storyboard:
             raise HTTPException(
@@ -308,15 +380,14 @@ async def update_storyboard(
             storyboard.status = request.status
 
         session.add(storyboard)
-        session.commit()
-        session.refresh(storyboard)
+        await session.commit()
 
         return _storyboard_to_response(storyboard)
 
     except HTTPException:
         raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update storyboard: {str(e)}",
@@ -327,7 +398,7 @@ async def update_storyboard(
 async def delete_storyboard(
     storyboard_id: str,
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Delete a storyboard and all its scenes and shots.
@@ -342,7 +413,7 @@ async def delete_storyboard(
             Storyboard.id == storyboard_id,
             Storyboard.user_id == current_user.database_id
         )
-        storyboard = session.exec(statement).first()
+        storyboard = (await session.exec(statement)).first()
 
         if not storyboard:
             raise HTTPException(
@@ -350,19 +421,86 @@ async def delete_storyboard(
                 detail="Storyboard not found",
             )
 
-        session.delete(storyboard)
-        session.commit()
+        await session.delete(storyboard)
+        await session.commit()
 
     except HTTPException:
         raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete storyboard: {str(e)}",
         )
 
 
+@r.patch("/{storyboard_id}/batch", response_model=StoryboardResponse)
+async def batch_update_storyboard(
+    storyboard_id: str,
+    request: StoryboardBatchRequest,
+    current_user: UserProfile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Apply an ordered list of scene and shot operations in one transaction.
+
+    Operations can add, update, delete and reorder scenes and shots. Scenes and
+    shots added in the batch can be referenced by later operations through their
+    "ref". Either all operations are applied or none.
+
+    Args:
+        storyboard_id: ID of the storyboard
+        request: Batch of operations
+        current_user: Authenticated user from dependency
+        session: Database session
+
+    Returns:
+        Complete storyboard after the batch
+    """
+    try:
+        # Lock the storyboard row so concurrent batches on it are applied one after another
+        statement = select(Storyboard.id).where(
+            Storyboard.id == storyboard_id,
+            Storyboard.user_id == current_user.database_id
+        ).with_for_update()
+        if not (await session.exec(statement)).first():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Storyboard not found",
+            )
+
+        changed_shot_ids = await apply_storyboard_operations(session, storyboard_id, request.operations)
+
+        storyboard = await _load_storyboard_tree(session, storyboard_id)
+        # Naive UTC, like the values of the tree read back from the database
+        storyboard.updated_date = datetime.now(timezone.utc).replace(tzinfo=None)
+        session.add(storyboard)
+
+        for scene in storyboard.scenes:
+            for shot in scene.shots:
+                if shot.id in changed_shot_ids:
+                    await publish_event(session, shot_event(shot, storyboard_id, current_user.database_id))
+
+        await session.commit()
+
+        return _storyboard_to_response(storyboard)
+
+    except StoryboardBatchError as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to apply storyboard operations: {str(e)}",
+        )
+
+
 # ============= Scene Endpoints =============
 
 @r.post("/{storyboard_id}/scenes", response_model=StoryboardSceneResponse, status_code=status.HTTP_201_CREATED)
@@ -370,7 +508,7 @@ async def add_scene_to_storyboard(
     storyboard_id: str,
     request: SceneAddRequest,
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Add a new scene to a storyboard.
@@ -390,7 +528,7 @@ async def add_scene_to_storyboard(
             Storyboard.id == storyboard_id,
             Storyboard.user_id == current_user.database_id
         )
-        storyboard = session.exec(statement).first()
+        storyboard = (await session.exec(statement)).first()
 
         if not storyboard:
             raise HTTPException(
@@ -404,18 +542,18 @@ async def add_scene_to_storyboard(
             scene_number=request.scene_number,
             description=request.description,
             duration=request.duration,
+            shots=[],
         )
 
         session.add(new_scene)
-        session.commit()
-        session.refresh(new_scene)
+        await session.commit()
 
         return _scene_to_response(new_scene)
 
     except HTTPException:
         raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to add scene: {str(e)}",
@@ -426,8 +564,7 @@ async def add_scene_to_storyboard(
 async def get_scene(
     storyboard_id: str,
     scene_id: str,
-    current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    scene: StoryboardScene = Depends(get_owned_scene),
 ):
     """
     Get a specific scene with all its shots.
@@ -435,43 +572,14 @@ async def get_scene(
     Args:
         storyboard_id: ID of the storyboard
         scene_id: ID of the scene
-        current_user: Authenticated user from dependency
-        session: Database session
+        scene: Scene resolved through the user's storyboard
 
     Returns:
         Scene data with shots
     """
     try:
-        # Verify storyboard belongs to user
-        storyboard_statement = select(Storyboard).where(
-            Storyboard.id == storyboard_id,
-            Storyboard.user_id == current_user.database_id
-        )
-        storyboard = session.exec(storyboard_statement).first()
-
-        if not storyboard:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Storyboard not found",
-            )
-
-        # Get scene
-        scene_statement = select(StoryboardScene).where(
-            StoryboardScene.id == scene_id,
-            StoryboardScene.storyboard_id == storyboard_id
-        )
-        scene = session.exec(scene_statement).first()
-
-        if not scene:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Scene not found",
-            )
-
         return _scene_to_response(scene)
 
-    except HTTPException:
-        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -484,8 +592,8 @@ async def update_scene(
     storyboard_id: str,
     scene_id: str,
     request: SceneUpdateRequest,
-    current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    scene: StoryboardScene = Depends(get_owned_scene),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Update a scene's metadata.
@@ -494,39 +602,13 @@ async def update_scene(
         storyboard_id: ID of the storyboard
         scene_id: ID of the scene
         request: Update request
-        current_user: Authenticated user from dependency
+        scene: Scene resolved through the user's storyboard
         session: Database session
 
     Returns:
         Updated scene data
     """
     try:
-        # Verify storyboard belongs to user
-        storyboard_statement = select(Storyboard).where(
-            Storyboard.id == storyboard_id,
-            Storyboard.user_id == current_user.database_id
-        )
-        storyboard = session.exec(storyboard_statement).first()
-
-        if not storyboard:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Storyboard not found",
-            )
-
-        # Get scene
-        scene_statement = select(StoryboardScene).where(
-            StoryboardScene.id == scene_id,
-            StoryboardScene.storyboard_id == storyboard_id
-        )
-        scene = session.exec(scene_statement).first()
-
-        if not scene:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Scene not found",
-            )
-
         # Update fields if provided
         if request.scene_number is not None:
             scene.scene_number = request.scene_number
@@ -536,15 +618,12 @@ async def update_scene(
             scene.duration = request.duration
 
         session.add(scene)
-        session.commit()
-        session.refresh(scene)
+        await session.commit()
 
         return _scene_to_response(scene)
 
-    except HTTPException:
-        raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update scene: {str(e)}",
@@ -555,8 +634,8 @@ async def update_scene(
 async def delete_scene(
     storyboard_id: str,
     scene_id: str,
-    current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    scene: StoryboardScene = Depends(get_owned_scene),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Delete a scene and all its shots.
@@ -564,43 +643,15 @@ async def delete_scene(
     Args:
         storyboard_id: ID of the storyboard
         scene_id: ID of the scene
-        current_user: Authenticated user from dependency
+        scene: Scene resolved through the user's storyboard
         session: Database session
     """
     try:
-        # Verify storyboard belongs to user
-        storyboard_statement = select(Storyboard).where(
-            Storyboard.id == storyboard_id,
-            Storyboard.user_id == current_user.database_id
-        )
-        storyboard = session.exec(storyboard_statement).first()
-
-        if not storyboard:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Storyboard not found",
-            )
-
-        # Get scene
-        scene_statement = select(StoryboardScene).where(
-            StoryboardScene.id == scene_id,
-            StoryboardScene.storyboard_id == storyboard_id
-        )
-        scene = session.exec(scene_statement).first()
-
-        if not scene:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Scene not found",
-            )
-
-        session.delete(scene)
-        session.commit()
+        await session.delete(scene)
+        await session.commit()
 
-    except HTTPException:
-        raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete scene: {str(e)}",
@@ -615,7 +666,7 @@ async def add_shot_to_scene(
     scene_id: str,
     request: ShotAddRequest,
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Add a new shot to a scene.
@@ -631,31 +682,8 @@ async def add_shot_to_scene(
         Created shot data
     """
     try:
-        # Verify storyboard belongs to user
-        storyboard_statement = select(Storyboard).where(
-            Storyboard.id == storyboard_id,
-            Storyboard.user_id == current_user.database_id
-        )
-        storyboard = session.exec(storyboard_statement).first()
-
-        if not storyboard:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Storyboard not found",
-            )
-
-        # Verify scene exists
-        scene_statement = select(StoryboardScene).where(
-            StoryboardScene.id == scene_id,
-            StoryboardScene.storyboard_id == storyboard_id
-        )
-        scene = session.exec(scene_statement).first()
-
-        if not scene:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Scene not found",
-            )
+        # Verify the scene belongs to one of the user's storyboards
+        await resolve_storyboard_path(session, current_user.database_id, storyboard_id, scene_id)
 
         # Create shot
         new_shot = Shot(
@@ -668,8 +696,8 @@ async def add_shot_to_scene(
         )
 
         session.add(new_shot)
-        session.commit()
-        session.refresh(new_shot)
+        await session.commit()
+        await session.refresh(new_shot)
 
         return ShotResponse(
             id=str(new_shot.id),
@@ -687,7 +715,7 @@ async def add_shot_to_scene(
     except HTTPException:
         raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to add shot: {str(e)}",
@@ -699,8 +727,7 @@ async def get_shot(
     storyboard_id: str,
     scene_id: str,
     shot_id: str,
-    current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    shot: Shot = Depends(get_owned_shot),
 ):
     """
     Get a specific shot.
@@ -709,52 +736,12 @@ async def get_shot(
         storyboard_id: ID of the storyboard
         scene_id: ID of the scene
         shot_id: ID of the shot
-        current_user: Authenticated user from dependency
-        session: Database session
+        shot: Shot resolved through the user's storyboard and scene
 
     Returns:
         Shot data
     """
     try:
-        # Verify storyboard belongs to user
-        storyboard_statement = select(Storyboard).where(
-            Storyboard.id == storyboard_id,
-            Storyboard.user_id == current_user.database_id
-        )
-        storyboard = session.exec(storyboard_statement).first()
-
-        if not storyboard:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Storyboard not found",
-            )
-
-        # Verify scene exists
-        scene_statement = select(StoryboardScene).where(
-            StoryboardScene.id == scene_id,
-            StoryboardScene.storyboard_id == storyboard_id
-        )
-        scene = session.exec(scene_statement).first()
-
-        if not scene:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Scene not found",
-            )
-
-        # Get shot
-        shot_statement = select(Shot).where(
-            Shot.id == shot_id,
-            Shot.scene_id == scene_id
-        )
-        shot = session.exec(shot_statement).first()
-
-        if not shot:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Shot not found",
-            )
-
         return ShotResponse(
             id=str(shot.id),
             scene_id=str(shot.scene_id),
@@ -768,8 +755,6 @@ async def get_shot(
             updated_date=shot.updated_date.isoformat() if shot.updated_date else "",
         )
 
-    except HTTPException:
-        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -783,8 +768,9 @@ async def update_shot(
     scene_id: str,
     shot_id: str,
     request: ShotUpdateRequest,
+    shot: Shot = Depends(get_owned_shot),
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Update a shot's data.
@@ -794,6 +780,7 @@ async def update_shot(
         scene_id: ID of the scene
         shot_id: ID of the shot
         request: Update request
+        shot: Shot resolved through the user's storyboard and scene
         current_user: Authenticated user from dependency
         session: Database session
 
@@ -801,45 +788,6 @@ async def update_shot(
         Updated shot data
     """
     try:
-        # Verify storyboard belongs to user
-        storyboard_statement = select(Storyboard).where(
-            Storyboard.id == storyboard_id,
-            Storyboard.user_id == current_user.database_id
-        )
-        storyboard = session.exec(storyboard_statement).first()
-
-        if not storyboard:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Storyboard not found",
-            )
-
-        # Verify scene exists
-        scene_statement = select(StoryboardScene).where(
-            StoryboardScene.id == scene_id,
-            StoryboardScene.storyboard_id == storyboard_id
-        )
-        scene = session.exec(scene_statement).first()
-
-        if not scene:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Scene not found",
-            )
-
-        # Get shot
-        shot_statement = select(Shot).where(
-            Shot.id == shot_id,
-            Shot.scene_id == scene_id
-        )
-        shot = session.exec(shot_statement).first()
-
-        if not shot:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Shot not found",
-            )
-
         # Update fields if provided
         if request.shot_number is not None:
             shot.shot_number = request.shot_number
@@ -855,8 +803,9 @@ async def update_shot(
             shot.status = request.status
 
         session.add(shot)
-        session.commit()
-        session.refresh(shot)
+        if request.status is not None or request.video_url is not None:
+            await publish_event(session, shot_event(shot, storyboard_id, current_user.database_id))
+        await session.commit()
 
         return ShotResponse(
             id=str(shot.id),
@@ -871,10 +820,8 @@ async def update_shot(
             updated_date=shot.updated_date.isoformat() if shot.updated_date else "",
         )
 
-    except HTTPException:
-        raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update shot: {str(e)}",
@@ -886,8 +833,8 @@ async def delete_shot(
     storyboard_id: str,
     scene_id: str,
     shot_id: str,
-    current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    shot: Shot = Depends(get_owned_shot),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Delete a shot.
@@ -896,56 +843,15 @@ async def delete_shot(
         storyboard_id: ID of the storyboard
         scene_id: ID of the scene
         shot_id: ID of the shot
-        current_user: Authenticated user from dependency
+        shot: Shot resolved through the user's storyboard and scene
         session: Database session
     """
     try:
-        # Verify storyboard belongs to user
-        storyboard_statement = select(Storyboard).where(
-            Storyboard.id == storyboard_id,
-            Storyboard.user_id == current_user.database_id
-        )
-        storyboard = session.exec(storyboard_statement).first()
-
-        if not storyboard:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Storyboard not found",
-            )
+        await session.delete(shot)
+        await session.commit()
 
-        # Verify scene exists
-        scene_statement = select(StoryboardScene).where(
-            StoryboardScene.id == scene_id,
-            StoryboardScene.storyboard_id == storyboard_id
-        )
-        scene = session.exec(scene_statement).first()
-
-        if not scene:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Scene not found",
-            )
-
-        # Get shot
-        shot_statement = select(Shot).where(
-            Shot.id == shot_id,
-            Shot.scene_id == scene_id
-        )
-        shot = session.exec(shot_statement).first()
-
-        if not shot:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Shot not found",
-            )
-
-        session.delete(shot)
-        session.commit()
-
-    except HTTPException:
-        raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete shot: {str(e)}",
@@ -959,11 +865,15 @@ async def delete_shot(
 async def generate_storyboard_images(
     storyboard_id: str,
     current_user: UserProfile = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Generate images for all shots in a storyboard that don't have images yet.
 
+    Shots are generated concurrently (see STORYBOARD_IMAGE_CONCURRENCY and
+    STORYBOARD_IMAGE_CONCURRENCY_PER_USER) and the results are saved in one commit;
+    shots deleted or changed during the generation are left as they are.
+
     Args:
         storyboard_id: ID of the storyboard
         current_user: Authenticated user from dependency
@@ -977,8 +887,8 @@ async def generate_storyboard_images(
         statement = select(Storyboard).where(
             Storyboard.id == storyboard_id,
             Storyboard.user_id == current_user.database_id
-        )
-        storyboard = session.exec(statement).first()
+        ).options(*STORYBOARD_TREE_OPTIONS)
+        storyboard = (await session.exec(statement)).first()
 
         if not storyboard:
             raise HTTPException(
@@ -987,56 +897,69 @@ async def generate_storyboard_images(
             )
 
         # Image generation parameters
-        model = "google:4@1"
+        model = DEFAULT_MODELS["image"]
         width = 1024
         height = 1024
 
-        # Loop through all scenes and shots
-        for scene in storyboard.scenes:
-            for shot in scene.shots:
-                # Only generate if no image exists yet
-                if not shot.start_image_url:
-                    try:
-                        # Update shot status to processing
-                        shot.status = "processing"
-                        session.add(shot)
-                        session.commit()
-
-                        # Generate image
-                        generated_image_url = await generate_image(
-                            prompt=shot.user_prompt,
-                            model=model,
-                            width=width,
-                            height=height
-                        )
-
-                        # Update shot with generated image
-                        if generated_image_url:
-                            shot.start_image_url = generated_image_url
-                            shot.status = "completed"
-                        else:
-                            shot.status = "failed"
-
-                        session.add(shot)
-                        session.commit()
-                        session.refresh(shot)
-
-                    except Exception as e:
-                        # Mark shot as failed but continue with other shots
-                        shot.status = "failed"
-                        session.add(shot)
-                        session.commit()
-                        print(f"Failed to generate image for shot {shot.id}: {str(e)}")
-
-        # Refresh storyboard to get all updated data
-        session.refresh(storyboard)
+        # Only generate for shots without an image yet
+        pending_shots = [
+            shot
+            for scene in storyboard.scenes
+            for shot in scene.shots
+            if not shot.start_image_url
+        ]
+
+        if pending_shots:
+            # Prompts for the generation fan-out, keyed by shot ID
+            shot_prompts = [(shot.id, shot.user_prompt) for shot in pending_shots]
+
+            for shot in pending_shots:
+                shot.status = "processing"
+                session.add(shot)
+                await publish_event(session, shot_event(shot, storyboard_id, current_user.database_id))
+            await session.commit()
+
+            # Fan the shots out concurrently, bounded per user and globally
+            generated_image_urls = await generate_shot_images(
+                shots=shot_prompts,
+                user_id=current_user.database_id,
+                model=model,
+                width=width,
+                height=height,
+            )
+
+            # Write all results in a single transaction. Shots may have been
+            # deleted or edited during the fan-out; only update those still
+            # processing, so one missing shot does not lose the other results.
+            for shot, (shot_id, _) in zip(pending_shots, shot_prompts):
+                generated_image_url = generated_image_urls.get(shot_id)
+                if generated_image_url:
+                    values = {"start_image_url": generated_image_url, "status": "completed"}
+                else:
+                    values = {"status": "failed"}
+                result = await session.execute(
+                    update(Shot)
+                    .where(Shot.id == shot_id, Shot.status == "processing")
+                    .values(**values)
+                )
+                if result.rowcount:
+                    await publish_event(session, shot_event(shot, storyboard_id, current_user.database_id))
+            await session.commit()
+
+            try:
+                storyboard = await _load_storyboard_tree(session, storyboard_id)
+            except NoResultFound:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Storyboard not found",
+                )
 
         return _storyboard_to_response(storyboard)
 
     except HTTPException:
         raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate images: {str(e)}",
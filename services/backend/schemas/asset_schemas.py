@@ -0,0 +1,35 @@
+"""Asset schemas for direct-to-S3 uploads."""
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class UploadUrlRequest(BaseModel):
+    """Request schema for starting a direct upload to S3."""
+    filename: str = Field(..., min_length=1, max_length=255, description="Original file name, used for the extension")
+    content_type: str = Field(..., description="MIME type of the file, e.g. 'image/png' or 'video/mp4'")
+    size: int = Field(..., gt=0, description="File size in bytes")
+
+
+class UploadUrlResponse(BaseModel):
+    """Response schema with the presigned request(s) for uploading the file bytes."""
+    key: str  # Object key, pass to the completion endpoint
+    method: str  # "post" (single presigned POST) or "multipart" (presigned part PUTs)
+    url: Optional[str] = None  # Presigned POST URL
+    fields: Dict[str, str] = {}  # Form fields to send with the presigned POST, before the file
+    upload_id: Optional[str] = None  # Multipart upload ID
+    part_size: Optional[int] = None  # Bytes per part, the last part may be smaller
+    part_urls: List[str] = []  # Presigned PUT URL per part, part numbers start at 1
+    expires_in: int  # Seconds the URLs stay valid
+
+
+class CompletedPart(BaseModel):
+    """An uploaded part of a multipart upload."""
+    part_number: int = Field(..., ge=1, le=10000)
+    etag: str = Field(..., description="ETag response header of the part PUT")
+
+
+class UploadCompleteRequest(BaseModel):
+    """Request schema for registering a finished direct upload as an asset."""
+    key: str = Field(..., description="Object key from the upload URL response")
+    upload_id: Optional[str] = Field(None, description="Multipart upload ID, for multipart uploads")
+    parts: Optional[List[CompletedPart]] = Field(None, description="Uploaded parts, for multipart uploads")
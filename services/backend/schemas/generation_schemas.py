@@ -1,5 +1,5 @@
 """Generation schemas for API requests and responses."""
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import BaseModel, Field
 from models.generation import Generation
 
@@ -10,7 +10,7 @@ class GenerationRequest(BaseModel):
     first_frame: Optional[str] = Field(None, description="Optional URL to first frame image")
     last_frame: Optional[str] = Field(None, description="Optional URL to last frame image")
     generation_type: str = Field(..., pattern="^(image|video|audio)$", description="Type of generation: 'image', 'video', or 'audio'")
-    model: Optional[str] = Field(None, description="Model to use for generation (e.g., 'seedance-1-0-lite-t2v-250428', 'google:4@1')")
+    model: Optional[str] = Field(None, description="Model to use for generation (e.g., 'seedance-1-0-lite', 'seedance-1-0-lite-t2v-250428', 'google:4@1'); equivalent models may be served by another provider")
     duration: Optional[int] = Field(None, ge=3, le=300, description="Duration in seconds for audio/video generation (10-300 seconds)")
     width: Optional[int] = Field(None, ge=200, le=4096, description="Width in pixels for image generation (1024-4096 pixels)")
     height: Optional[int] = Field(None, ge=200, le=4096, description="Height in pixels for image generation (1024-4096 pixels)")
@@ -30,6 +30,10 @@ class GenerationResponse(BaseModel):
     error_message: Optional[str]
     creation_date: str
     updated_date: str
+    thumbnail_url: Optional[str] = None  # Grid thumbnail (WebP), once derivatives are rendered
+    poster_url: Optional[str] = None  # Poster frame of a video
+    preview_url: Optional[str] = None  # Short low-bitrate preview of a video
+    derivatives: Dict[str, str] = {}  # All derivative URLs by name, e.g. thumb_256_avif
 
     class Config:
         from_attributes = True
@@ -47,3 +51,4 @@ class GenerationListResponse(BaseModel):
     """Response schema for list of generations."""
     generations: list[GenerationResponse]
     total: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page
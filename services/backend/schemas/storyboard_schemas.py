@@ -4,7 +4,9 @@ from pydantic import BaseModel, Field
 class StoryBoardRequest(BaseModel):
     """Request schema for creating a new generation."""
     prompt: str = Field(..., min_length=1, max_length=3000, description="Text prompt for generation")
+    bypass_cache: bool = Field(default=False, description="Skip cached LLM responses and generate fresh options")
 
 class StoryBoardScenesRequest(BaseModel):
     """Request schema for creating a new storyboard scenes."""
-    storyline: str = Field(..., min_length=1, max_length=3000, description="Text prompt for generation")
\ No newline at end of file
+    storyline: str = Field(..., min_length=1, max_length=3000, description="Text prompt for generation")
+    bypass_cache: bool = Field(default=False, description="Skip cached LLM responses and generate fresh scenes")
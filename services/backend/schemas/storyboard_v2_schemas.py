@@ -1,5 +1,5 @@
 """Storyboard v2 schemas for API requests and responses."""
-from typing import Optional, List
+from typing import Annotated, Optional, List, Literal, Union
 from pydantic import BaseModel, Field
 
 
@@ -101,6 +101,9 @@ class StoryboardSummaryResponse(BaseModel):
     title: Optional[str]
     status: str
     scene_count: int
+    shot_count: int = 0
+    completed_shot_count: int = 0
+    completion_percentage: float = 0.0  # Share of shots with status "completed"
     creation_date: str
     updated_date: str
 
@@ -112,6 +115,7 @@ class StoryboardListResponse(BaseModel):
     """Response schema for list of storyboards."""
     storyboards: List[StoryboardSummaryResponse]
     total: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page
 
 
 # ============= Scene-specific Schemas =============
@@ -150,4 +154,76 @@ class ShotUpdateRequest(BaseModel):
     status: Optional[str] = Field(None, pattern="^(pending|processing|completed|failed)$", description="Shot status")
 
 
+# ============= Batch Editing Schemas =============
 
+class AddSceneOperation(BaseModel):
+    """Add a scene to the storyboard."""
+    op: Literal["add_scene"]
+    ref: Optional[str] = Field(None, max_length=100, description="Temporary reference, usable as scene_id in later operations of the batch")
+    scene_number: int = Field(..., ge=1, description="Order of the scene in the storyboard")
+    description: Optional[str] = Field(None, max_length=2000, description="Description of the scene")
+    duration: Optional[float] = Field(None, ge=0, description="Expected duration in seconds")
+
+
+class UpdateSceneOperation(SceneUpdateRequest):
+    """Update a scene's metadata."""
+    op: Literal["update_scene"]
+    scene_id: str = Field(..., description="ID (or batch reference) of the scene")
+
+
+class DeleteSceneOperation(BaseModel):
+    """Delete a scene and all its shots."""
+    op: Literal["delete_scene"]
+    scene_id: str = Field(..., description="ID (or batch reference) of the scene")
+
+
+class ReorderScenesOperation(BaseModel):
+    """Renumber scenes 1..n in the given order; scenes not listed follow in their current order."""
+    op: Literal["reorder_scenes"]
+    scene_ids: List[str] = Field(..., min_length=1, description="Scene IDs (or batch references) in their new order")
+
+
+class AddShotOperation(ShotAddRequest):
+    """Add a shot to a scene."""
+    op: Literal["add_shot"]
+    scene_id: str = Field(..., description="ID (or batch reference) of the scene")
+    ref: Optional[str] = Field(None, max_length=100, description="Temporary reference, usable as shot_id in later operations of the batch")
+
+
+class UpdateShotOperation(ShotUpdateRequest):
+    """Update a shot's data."""
+    op: Literal["update_shot"]
+    shot_id: str = Field(..., description="ID (or batch reference) of the shot")
+
+
+class DeleteShotOperation(BaseModel):
+    """Delete a shot."""
+    op: Literal["delete_shot"]
+    shot_id: str = Field(..., description="ID (or batch reference) of the shot")
+
+
+class ReorderShotsOperation(BaseModel):
+    """Renumber shots 1..n in the given order, moving shots from other scenes into this one; unlisted shots follow."""
+    op: Literal["reorder_shots"]
+    scene_id: str = Field(..., description="ID (or batch reference) of the scene")
+    shot_ids: List[str] = Field(..., min_length=1, description="Shot IDs (or batch references) in their new order")
+
+
+StoryboardOperation = Annotated[
+    Union[
+        AddSceneOperation,
+        UpdateSceneOperation,
+        DeleteSceneOperation,
+        ReorderScenesOperation,
+        AddShotOperation,
+        UpdateShotOperation,
+        DeleteShotOperation,
+        ReorderShotsOperation,
+    ],
+    Field(discriminator="op"),
+]
+
+
+class StoryboardBatchRequest(BaseModel):
+    """Request schema for applying several scene/shot edits in one transaction."""
+    operations: List[StoryboardOperation] = Field(..., min_length=1, max_length=500, description="Operations, applied in order")
@@ -0,0 +1,72 @@
+"""Mirror a locally served file into S3 and verify the copy.
+
+Serves a file of random bytes from a local HTTP server (standing in for a
+provider CDN), runs mirror_to_s3 against it and compares the stored object with
+the source, reporting size and throughput.
+
+Usage (from services/backend, with the local MinIO container running):
+    docker compose up -d minio
+    S3_ENDPOINT_URL=http://localhost:9000 S3_BUCKET_NAME=videostack-uploads \\
+        AWS_ACCESS_KEY_ID=videostack_minio AWS_SECRET_ACCESS_KEY=videostack_minio_password \\
+        python scripts/check_mirror_transfer.py --size-mb 50
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import uuid
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import get_settings  # noqa: E402
+from dependencies.http_client_dependencies import http_clients  # noqa: E402
+from dependencies.s3_dependencies import get_s3_client  # noqa: E402
+from services.output_mirror_service import mirror_to_s3, transfer_metrics  # noqa: E402
+
+settings = get_settings()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=50, help="Size of the served file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        data = os.urandom(args.size_mb * 1024 * 1024)
+        with open(os.path.join(directory, "output.mp4"), "wb") as f:
+            f.write(data)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), partial(SimpleHTTPRequestHandler, directory=directory))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        source_url = f"http://127.0.0.1:{server.server_address[1]}/output.mp4"
+
+        s3_client = get_s3_client()
+        try:
+            s3_client.head_bucket(Bucket=settings.s3_bucket_name)
+        except Exception:
+            s3_client.create_bucket(Bucket=settings.s3_bucket_name)
+
+        try:
+            result = await mirror_to_s3(f"check-{uuid.uuid4()}", source_url)
+        finally:
+            server.shutdown()
+            await http_clients.aclose()
+
+    stored = s3_client.get_object(Bucket=settings.s3_bucket_name, Key=result["s3_key"])["Body"].read()
+    matches = hashlib.sha256(stored).digest() == hashlib.sha256(data).digest()
+    s3_client.delete_object(Bucket=settings.s3_bucket_name, Key=result["s3_key"])
+
+    print(f"Mirrored {result['bytes']} bytes in {result['seconds']}s "
+          f"({transfer_metrics.snapshot()['avg_throughput_mb_per_s']} MB/s), "
+          f"part retries: {transfer_metrics.part_retries}, content matches: {matches}")
+    if not matches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""Run concurrent image requests through the Runware pool against the local stub.
+
+Starts scripts/runware_stub_server.py in-process, optionally dropping
+connections at random, and reports how many requests succeeded, the peak number
+of requests in flight on one connection (must not exceed the per-connection
+limit) and the pool state after the run.
+
+Usage (from services/backend, no Runware account or network needed):
+    python scripts/check_runware_pool.py --requests 100 --drop-probability 0.05
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from runware import IImageInference  # noqa: E402
+from dependencies.runware_pool import RunwarePool  # noqa: E402
+from runware_stub_server import RunwareStub, serve  # noqa: E402
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--connections", type=int, default=2)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--drop-probability", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    stub = RunwareStub(latency=args.latency, drop_probability=args.drop_probability)
+    server = await serve(stub, port=args.port)
+    pool = RunwarePool(
+        api_key="stub",
+        url=f"ws://127.0.0.1:{args.port}",
+        size=args.connections,
+        max_in_flight=args.max_in_flight,
+        health_check_interval=0.5,
+        acquire_timeout=60,
+    )
+
+    async def request(i: int) -> str:
+        image_request = IImageInference(positivePrompt=f"check {i}", model="runware:100@1", width=512, height=512)
+        images = await pool.run(lambda runware: runware.imageInference(requestImage=image_request))
+        return images[0].imageURL
+
+    started = time.monotonic()
+    try:
+        await pool.start()
+        results = await asyncio.gather(*(request(i) for i in range(args.requests)), return_exceptions=True)
+        snapshot = pool.snapshot()
+    finally:
+        await pool.close()
+        server.close()
+        await server.wait_closed()
+
+    outcomes = Counter("ok" if isinstance(result, str) else type(result).__name__ for result in results)
+    print(f"{args.requests} requests in {time.monotonic() - started:.1f}s: {dict(outcomes)}")
+    print(f"Stub: {stub.connections} connections, {stub.messages} messages, peak in flight per connection {stub.peak_in_flight}")
+    print(f"Reconnects: {[connection['reconnects'] for connection in snapshot['connections']]}")
+    if stub.peak_in_flight > args.max_in_flight or (not args.drop_probability and outcomes["ok"] != args.requests):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
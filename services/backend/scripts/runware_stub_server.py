@@ -0,0 +1,151 @@
+"""Local stand-in for the Runware websocket API.
+
+Speaks enough of the protocol for the Runware SDK and the connection pool:
+authentication, ping/pong, imageInference, videoInference, audioInference and
+getResponse. Inference tasks are answered after a configurable latency with
+placeholder URLs. Connections can be dropped at random to exercise reconnects.
+
+Usage (from services/backend):
+    python scripts/runware_stub_server.py --port 8765 --latency 1.0
+    RUNWARE_WS_URL=ws://localhost:8765 RUNWARE_API_KEY=stub uvicorn main:app
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import uuid
+from typing import Any, Dict, List, Optional, Set
+import websockets
+
+logger = logging.getLogger("runware_stub")
+
+# Result URL field, result ID field and placeholder URL per inference task type.
+# The URLs do not resolve, so run the worker with MIRROR_OUTPUTS_ENABLED=false.
+RESULT_URLS = {
+    "imageInference": ("imageURL", "imageUUID", "https://stub.runware.invalid/images/{uuid}.jpg"),
+    "videoInference": ("videoURL", "videoUUID", "https://stub.runware.invalid/videos/{uuid}.mp4"),
+    "audioInference": ("audioURL", "audioUUID", "https://stub.runware.invalid/audio/{uuid}.mp3"),
+}
+
+
+class RunwareStub:
+    """Websocket handler answering Runware tasks with placeholder results."""
+
+    def __init__(self, latency: float = 1.0, drop_probability: float = 0.0, api_key: Optional[str] = None):
+        self.latency = latency
+        self.drop_probability = drop_probability
+        self.api_key = api_key
+        self.connections = 0
+        self.messages = 0
+        self.tasks: Dict[str, int] = {}
+        self.peak_in_flight = 0  # Most inference tasks running at once on one connection
+        self._results: Dict[str, List[Dict[str, Any]]] = {}
+        self._in_flight: Dict[int, int] = {}  # Running inference tasks per connection
+
+    async def handle(self, websocket) -> None:
+        self.connections += 1
+        pending: Set[asyncio.Task] = set()
+        try:
+            async for message in websocket:
+                self.messages += 1
+                pending = {answer for answer in pending if not answer.done()}
+                for task in json.loads(message):
+                    pending.add(asyncio.create_task(self._answer(websocket, task)))
+
+                if self.drop_probability and random.random() < self.drop_probability:
+                    logger.info("Dropping connection")
+                    await websocket.close(code=1011, reason="stub drop")
+                    return
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            for answer in pending:
+                answer.cancel()
+            self._in_flight.pop(id(websocket), None)
+
+    async def _answer(self, websocket, task: Dict[str, Any]) -> None:
+        task_type = task.get("taskType")
+        task_uuid = task.get("taskUUID")
+        self.tasks[task_type] = self.tasks.get(task_type, 0) + 1
+
+        if task_type == "authentication":
+            if self.api_key and task.get("apiKey") != self.api_key:
+                await self._send(websocket, {"errors": [{
+                    "taskType": "authentication", "code": "invalidApiKey", "message": "Invalid API key",
+                }]})
+                return
+            await self._send(websocket, {"data": [{
+                "taskType": "authentication",
+                "connectionSessionUUID": task.get("connectionSessionUUID") or str(uuid.uuid4()),
+            }]})
+        elif task_type == "ping":
+            await self._send(websocket, {"data": [{"taskType": "ping", "pong": True}]})
+        elif task_type in RESULT_URLS:
+            in_flight = self._in_flight.get(id(websocket), 0) + 1
+            self._in_flight[id(websocket)] = in_flight
+            self.peak_in_flight = max(self.peak_in_flight, in_flight)
+            try:
+                await asyncio.sleep(self.latency * random.uniform(0.5, 1.5))
+            finally:
+                if id(websocket) in self._in_flight:
+                    self._in_flight[id(websocket)] -= 1
+            url_field, uuid_field, url = RESULT_URLS[task_type]
+            results = []
+            for _ in range(task.get("numberResults") or 1):
+                result_uuid = str(uuid.uuid4())
+                results.append({
+                    "taskType": task_type,
+                    "taskUUID": task_uuid,
+                    "status": "success",
+                    uuid_field: result_uuid,
+                    url_field: url.format(uuid=result_uuid),
+                    "cost": 0.0,
+                })
+            self._results[task_uuid] = results
+            for result in results:
+                await self._send(websocket, {"data": [result]})
+        elif task_type == "getResponse":
+            await self._send(websocket, {"data": self._results.get(task_uuid) or [
+                {"taskType": task_type, "taskUUID": task_uuid, "status": "pending"}
+            ]})
+        else:
+            await self._send(websocket, {"errors": [{
+                "taskType": task_type, "taskUUID": task_uuid, "code": "unsupportedTaskType",
+                "message": f"Task type {task_type} is not supported by the stub",
+            }]})
+
+    @staticmethod
+    async def _send(websocket, message: Dict[str, Any]) -> None:
+        try:
+            await websocket.send(json.dumps(message))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+
+async def serve(stub: RunwareStub, host: str = "127.0.0.1", port: int = 8765):
+    """Start serving the stub; returns the websockets server (close() it to stop)."""
+    return await websockets.serve(stub.handle, host, port, max_size=None)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.0, help="Average seconds per inference task")
+    parser.add_argument("--drop-probability", type=float, default=0.0, help="Chance to drop the connection after a message")
+    parser.add_argument("--api-key", default=None, help="Only accept this API key (default: any)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    stub = RunwareStub(latency=args.latency, drop_probability=args.drop_probability, api_key=args.api_key)
+    server = await serve(stub, args.host, args.port)
+    logger.info(f"Runware stub listening on ws://{args.host}:{args.port}")
+    try:
+        await server.wait_closed()
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
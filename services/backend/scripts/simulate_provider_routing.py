@@ -0,0 +1,139 @@
+"""Exercise the provider router with simulated backends.
+
+Runs text-to-video requests for the seedance-1-0-lite family through a
+ProviderRouter whose clock is simulated, so no provider is called and no time
+passes. The simulated Ark and Runware backends change behaviour between phases
+(Ark slows down, then fails, then recovers, then times out) and the script
+checks that the router follows: it prefers the faster/cheaper backend, fails
+over within a request, routes around the failing backend, returns to it once
+its errors leave the rolling window, and never resubmits a timed out request.
+
+Usage (from services/backend):
+    python scripts/simulate_provider_routing.py
+"""
+import asyncio
+import os
+import random
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.provider_registry import TEXT_TO_VIDEO, ModelBackend, candidate_backends  # noqa: E402
+from services.provider_router import OutcomeUnknownError, ProviderRouter  # noqa: E402
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@dataclass
+class SimulatedBackend:
+    latency: float  # Mean seconds per request
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0  # Share of requests accepted but never answered
+
+
+async def run_phase(
+    name: str,
+    router: ProviderRouter,
+    clock: SimulatedClock,
+    behaviour: Dict[str, SimulatedBackend],
+    requests: int = 50,
+) -> Counter:
+    candidates = candidate_backends("video", "seedance-1-0-lite", TEXT_TO_VIDEO, duration=5)
+    timed_out: List[str] = []
+    served = Counter()
+
+    async def invoke(backend: ModelBackend) -> Optional[str]:
+        simulated = behaviour[backend.provider]
+        if timed_out:
+            # The timed out request may still be rendered and billed
+            served["resubmitted"] += 1
+        clock.now += simulated.latency * random.uniform(0.8, 1.2)
+        if random.random() < simulated.error_rate:
+            raise RuntimeError(f"simulated {backend.provider} error")
+        if random.random() < simulated.timeout_rate:
+            timed_out.append(backend.provider)
+            raise OutcomeUnknownError(f"simulated {backend.provider} timeout")
+        return f"https://{backend.provider}.invalid/video.mp4"
+
+    for _ in range(requests):
+        timed_out.clear()
+        try:
+            url, error = await router.execute(candidates, invoke, duration=5)
+        except RuntimeError:
+            url = None
+        served[url.split("//")[1].split(".")[0] if url else "failed"] += 1
+        clock.now += 5  # Time between requests
+
+    stats = router.snapshot()["backends"]
+    summary = ", ".join(
+        f"{key} p50={entry['p50_seconds'] and round(entry['p50_seconds'])}s "
+        f"p95={entry['p95_seconds'] and round(entry['p95_seconds'])}s errors={entry['error_rate']}"
+        for key, entry in stats.items()
+    )
+    print(f"{name}: served {dict(served)} | {summary}")
+    return served
+
+
+async def main() -> None:
+    random.seed(7)
+    clock = SimulatedClock()
+    router = ProviderRouter(window_size=50, window_seconds=1800, min_samples=5, error_threshold=0.5,
+                            cost_weight=60, max_attempts=2, clock=clock)
+    failures = []
+
+    served = await run_phase("both healthy", router, clock, {
+        "ark": SimulatedBackend(latency=50), "runware": SimulatedBackend(latency=70),
+    })
+    if served["ark"] < served["runware"]:
+        failures.append("expected the faster Ark backend to be preferred")
+
+    served = await run_phase("ark slow", router, clock, {
+        "ark": SimulatedBackend(latency=200), "runware": SimulatedBackend(latency=70),
+    })
+    if served["runware"] < served["ark"]:
+        failures.append("expected traffic to move to Runware while Ark is slow")
+
+    # Ark is back to normal speed but fails; make it preferred again to exercise failover
+    router = ProviderRouter(window_size=50, window_seconds=1800, min_samples=5, error_threshold=0.5,
+                            cost_weight=60, max_attempts=2, clock=clock)
+    served = await run_phase("ark failing", router, clock, {
+        "ark": SimulatedBackend(latency=10, error_rate=1.0), "runware": SimulatedBackend(latency=70),
+    })
+    if served["failed"]:
+        failures.append("expected every request to fail over to Runware")
+
+    clock.now += 3600  # Ark's failures leave the rolling window
+    served = await run_phase("ark recovered", router, clock, {
+        "ark": SimulatedBackend(latency=50), "runware": SimulatedBackend(latency=70),
+    })
+    if served["ark"] < served["runware"]:
+        failures.append("expected Ark to be preferred again after recovering")
+
+    # Ark accepts requests but never answers; they must not be resubmitted to Runware
+    router = ProviderRouter(window_size=50, window_seconds=1800, min_samples=5, error_threshold=0.5,
+                            cost_weight=60, max_attempts=2, clock=clock)
+    served = await run_phase("ark timing out", router, clock, {
+        "ark": SimulatedBackend(latency=300, timeout_rate=1.0), "runware": SimulatedBackend(latency=70),
+    })
+    if not served["failed"] or served["resubmitted"]:
+        failures.append("expected timed out Ark requests to fail without failing over")
+    if served["runware"] < served["failed"]:
+        failures.append("expected new requests to move to Runware while Ark times out")
+
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,182 @@
+"""Thumbnails, poster frames and previews for generated and uploaded media.
+
+Grids render small derivatives instead of full-size images and MP4s. Images get
+WebP and AVIF thumbnails per THUMBNAIL_SIZES. Videos get a poster frame, a
+short low-bitrate preview (both with ffmpeg) and the same thumbnails cut from
+the poster. The CPU-bound work runs in a process pool so it never stalls the
+worker's event loop, and the derivatives are stored next to the original, e.g.
+generations/<id>.mp4 -> generations/<id>.poster.jpg.
+
+Originals may be user uploads, so only files in our bucket are fetched, up to
+DERIVATIVE_MAX_SOURCE_MB, Pillow only opens common image formats up to
+MAX_IMAGE_PIXELS, and ffmpeg only reads the local file as MP4/MOV, Matroska or
+WebM (no playlists or other protocols that could read further files or URLs).
+"""
+import asyncio
+import logging
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+from dependencies.http_client_dependencies import get_http_client
+from dependencies.s3_dependencies import get_s3_client, get_public_url
+from services.output_mirror_service import is_mirrored
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Content types of the derivative files, by extension
+CONTENT_TYPES = {".webp": "image/webp", ".avif": "image/avif", ".jpg": "image/jpeg", ".mp4": "video/mp4"}
+
+# Image formats Pillow may open, and the largest image it decodes
+IMAGE_FORMATS = ["JPEG", "PNG", "WEBP", "GIF", "AVIF"]
+MAX_IMAGE_PIXELS = 50_000_000
+
+# ffmpeg input options: read the local file only, as one of the container formats providers and uploads use
+FFMPEG_INPUT_OPTIONS = ["-protocol_whitelist", "file", "-format_whitelist", "mov,mp4,m4a,3gp,3g2,mj2,matroska,webm"]
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Get the process pool, starting it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.derivative_process_workers)
+    return _executor
+
+
+def shutdown_derivative_executor() -> None:
+    """Stop the process pool, waiting for running derivations."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+# ============= Process pool functions =============
+
+def _render_thumbnails(source_path: str, output_dir: str) -> Dict[str, str]:
+    """Write a WebP and an AVIF thumbnail per configured size. Runs in the process pool."""
+    import warnings
+    from PIL import Image
+
+    # Pillow only warns below twice the limit
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    warnings.simplefilter("error", Image.DecompressionBombWarning)
+
+    outputs = {}
+    with Image.open(source_path, formats=IMAGE_FORMATS) as image:
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        for size in settings.thumbnail_sizes:
+            thumbnail = image.copy()
+            thumbnail.thumbnail((size, size))
+            for extension, options in ((".webp", {"quality": 80, "method": 4}), (".avif", {"quality": 60})):
+                path = os.path.join(output_dir, f"thumb-{size}{extension}")
+                thumbnail.save(path, **options)
+                outputs[f"thumb_{size}_{extension[1:]}"] = path
+    return outputs
+
+
+def _render_video_derivatives(source_path: str, output_dir: str) -> Dict[str, str]:
+    """Write a poster frame, a short preview and poster thumbnails with ffmpeg. Runs in the process pool."""
+    poster_path = os.path.join(output_dir, "poster.jpg")
+    preview_path = os.path.join(output_dir, "preview.mp4")
+
+    # Take the poster one second in, falling back to the first frame for very short videos.
+    # Seeking past the end either writes no frame or fails, depending on the container.
+    for offset in ("1", "0"):
+        result = subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-ss", offset, *FFMPEG_INPUT_OPTIONS, "-i", source_path,
+             "-frames:v", "1", "-vf", "scale='min(1280,iw)':-2", "-q:v", "3", poster_path],
+            check=False,
+        )
+        if result.returncode == 0 and os.path.exists(poster_path) and os.path.getsize(poster_path) > 0:
+            break
+    else:
+        raise RuntimeError(f"ffmpeg could not extract a poster frame (exit code {result.returncode})")
+
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", *FFMPEG_INPUT_OPTIONS, "-i", source_path,
+         "-t", str(settings.preview_seconds), "-an",
+         "-vf", "scale='min(480,iw)':-2", "-c:v", "libx264", "-preset", "veryfast",
+         "-b:v", settings.preview_bitrate, "-movflags", "+faststart", preview_path],
+        check=True,
+    )
+
+    outputs = {"poster": poster_path, "preview": preview_path}
+    outputs.update(_render_thumbnails(poster_path, output_dir))
+    return outputs
+
+
+# ============= Pipeline =============
+
+def derivative_key(key_base: str, path: str) -> str:
+    """Object key of a derivative file stored next to the original (key_base is the original's key without extension)."""
+    return f"{key_base}.{os.path.basename(path)}"
+
+
+async def create_derivatives(source_url: str, key_base: str, media_type: str) -> Dict[str, str]:
+    """
+    Render and store the derivatives of an image or video.
+
+    Args:
+        source_url: URL of the original in our bucket
+        key_base: Object key of the original without extension
+        media_type: "image" or "video"
+
+    Returns:
+        Public URL per derivative name (thumb_<size>_webp, thumb_<size>_avif, poster, preview)
+
+    Raises:
+        ValueError: If the original is not in our bucket or exceeds DERIVATIVE_MAX_SOURCE_MB
+    """
+    if not is_mirrored(source_url):
+        raise ValueError(f"Derivatives are only rendered for originals in the bucket, not {source_url}")
+
+    render = _render_video_derivatives if media_type == "video" else _render_thumbnails
+    s3_client = get_s3_client()
+    max_bytes = settings.derivative_max_source_mb * 1024 * 1024
+
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = os.path.join(directory, "source")
+        async with get_http_client(source_url).stream("GET", source_url) as response:
+            response.raise_for_status()
+            if int(response.headers.get("content-length") or 0) > max_bytes:
+                raise ValueError(f"Original is larger than {settings.derivative_max_source_mb} MB")
+            size = 0
+            with open(source_path, "wb") as f:
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise ValueError(f"Original is larger than {settings.derivative_max_source_mb} MB")
+                    f.write(chunk)
+
+        output_dir = os.path.join(directory, "derivatives")
+        os.mkdir(output_dir)
+        loop = asyncio.get_running_loop()
+        paths = await loop.run_in_executor(_get_executor(), render, source_path, output_dir)
+
+        derivatives = {}
+        for name, path in paths.items():
+            s3_key = derivative_key(key_base, path)
+            await asyncio.to_thread(
+                s3_client.upload_file,
+                path,
+                settings.s3_bucket_name,
+                s3_key,
+                ExtraArgs={"ContentType": CONTENT_TYPES[os.path.splitext(path)[1]]},
+            )
+            derivatives[name] = get_public_url(s3_key)
+
+    return derivatives
+
+
+def thumbnail_url(derivatives: Optional[Dict[str, str]]) -> Optional[str]:
+    """Pick the grid thumbnail from a derivatives map (the largest WebP thumbnail)."""
+    if not derivatives:
+        return None
+    return derivatives.get(f"thumb_{max(settings.thumbnail_sizes)}_webp")
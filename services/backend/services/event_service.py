@@ -0,0 +1,187 @@
+"""Status events for generations and shots, delivered through Postgres LISTEN/NOTIFY.
+
+Any process (API or worker) publishes an event with pg_notify inside the
+transaction that changes the row, so the event is only delivered once the
+change is committed. Each API process keeps one LISTEN connection and fans the
+events out to the server-sent-event streams of the owning user.
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Set
+import psycopg2
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.generation import Generation
+from models.shot import Shot
+from services.derivative_service import thumbnail_url
+from config import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "videostack_events"
+
+# Events buffered per subscriber before the oldest ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Longest error message sent in an event. Postgres rejects NOTIFY payloads of
+# 8000 bytes or more, which would roll back the status change being published;
+# the full message stays on the generation.
+EVENT_ERROR_MESSAGE_MAX_CHARS = 500
+
+
+def _truncate(value: Optional[str], max_chars: int) -> Optional[str]:
+    if value is None or len(value) <= max_chars:
+        return value
+    return value[:max_chars - 3] + "..."
+
+
+def generation_event(generation: Generation) -> Dict[str, Any]:
+    """Build the status event for a generation."""
+    return {
+        "type": "generation",
+        "id": str(generation.id),
+        "user_id": generation.user_id,
+        "status": generation.status,
+        "generated_content_url": generation.generated_content_url,
+        "thumbnail_url": thumbnail_url(generation.derivatives),
+        "error_message": _truncate(generation.error_message, EVENT_ERROR_MESSAGE_MAX_CHARS),
+    }
+
+
+def shot_event(shot: Shot, storyboard_id: str, user_id: Optional[str]) -> Dict[str, Any]:
+    """Build the status event for a storyboard shot."""
+    return {
+        "type": "shot",
+        "id": str(shot.id),
+        "user_id": user_id,
+        "storyboard_id": storyboard_id,
+        "scene_id": str(shot.scene_id),
+        "status": shot.status,
+        "start_image_url": shot.start_image_url,
+        "end_image_url": shot.end_image_url,
+        "video_url": shot.video_url,
+    }
+
+
+async def publish_event(session: AsyncSession, event: Dict[str, Any]) -> None:
+    """
+    Queue an event for delivery when the session's transaction commits.
+
+    Args:
+        session: Database session holding the status change
+        event: Event built with generation_event or shot_event
+    """
+    await session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": EVENTS_CHANNEL, "payload": json.dumps(event)},
+    )
+
+
+class EventBroker:
+    """Listens on the events channel and fans events out to per-user subscriber queues."""
+
+    def __init__(self, database_url: str = DATABASE_URL):
+        self.database_url = database_url
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._connection = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        """Register a subscriber queue for a user's events."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        """Remove a subscriber queue."""
+        queues = self._subscribers.get(user_id)
+        if not queues:
+            return
+        queues.discard(queue)
+        if not queues:
+            self._subscribers.pop(user_id, None)
+
+    def dispatch(self, event: Dict[str, Any]) -> None:
+        """Deliver an event to every subscriber of its user, dropping the oldest event for slow readers."""
+        for queue in self._subscribers.get(event.get("user_id"), ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def start(self) -> None:
+        """Open the LISTEN connection, retrying in the background if the database is unreachable."""
+        try:
+            await self._listen()
+        except Exception as e:
+            logger.error(f"Could not start event listener, retrying: {str(e)}")
+            self._schedule_reconnect()
+
+    def _connect(self):
+        # Blocking; run in a thread so a slow database does not stall the event loop
+        connection = psycopg2.connect(self.database_url, connect_timeout=10)
+        connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {EVENTS_CHANNEL};")
+        return connection
+
+    async def _listen(self) -> None:
+        connection = await asyncio.to_thread(self._connect)
+        self._connection = connection
+        asyncio.get_running_loop().add_reader(connection.fileno(), self._on_notify)
+        logger.info(f"Listening for events on channel {EVENTS_CHANNEL}")
+
+    async def close(self) -> None:
+        """Stop listening and close the LISTEN connection."""
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self._disconnect()
+
+    def _on_notify(self) -> None:
+        try:
+            self._connection.poll()
+        except Exception as e:
+            logger.error(f"Event listener connection lost: {str(e)}")
+            self._disconnect()
+            self._schedule_reconnect()
+            return
+
+        while self._connection.notifies:
+            notify = self._connection.notifies.pop(0)
+            try:
+                self.dispatch(json.loads(notify.payload))
+            except ValueError:
+                logger.warning(f"Ignoring malformed event payload: {notify.payload}")
+
+    def _disconnect(self) -> None:
+        if self._connection is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self._connection.fileno())
+        except Exception:
+            pass
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+    def _schedule_reconnect(self) -> None:
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 1.0
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self._listen()
+                return
+            except Exception as e:
+                logger.error(f"Could not reconnect event listener: {str(e)}")
+                delay = min(delay * 2, 30.0)
+
+
+# Process-wide broker, started in the application lifespan
+event_broker = EventBroker()
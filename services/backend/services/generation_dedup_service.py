@@ -0,0 +1,125 @@
+"""Deduplication of identical generation requests.
+
+Double submits and retries of a generation request resolve to the existing
+Generation instead of paying for another provider call. A request is
+identified by its Idempotency-Key header when given, and always by a hash of
+the normalized request. Checks are serialized per user and key with
+transaction-scoped advisory locks, so concurrent duplicates across API
+processes see each other's row.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import and_, or_, text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.generation import Generation
+from schemas.generation_schemas import GenerationRequest
+from config import get_settings
+
+settings = get_settings()
+
+# Duplicates of these generations attach to the running job
+IN_FLIGHT_STATUSES = ("pending", "processing")
+
+
+class IdempotencyKeyMismatch(ValueError):
+    """The Idempotency-Key was already used for a different request."""
+
+
+def generation_request_hash(request: GenerationRequest) -> str:
+    """
+    Hash a generation request, ignoring differences in prompt whitespace.
+
+    Args:
+        request: Generation request
+
+    Returns:
+        Hex SHA-256 of the normalized request
+    """
+    normalized = request.model_dump()
+    normalized["prompt"] = " ".join(request.prompt.split())
+    canonical = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+async def lock_generation_request(
+    session: AsyncSession,
+    user_id: str,
+    request_hash: str,
+    idempotency_key: Optional[str] = None,
+) -> None:
+    """
+    Serialize duplicate checks for a user's request until the transaction ends.
+
+    The key lock is always taken before the hash lock, so two transactions
+    never wait on each other's locks in opposite order.
+
+    Args:
+        session: Database session
+        user_id: Database ID of the user
+        request_hash: Hash from generation_request_hash
+        idempotency_key: Optional Idempotency-Key header
+    """
+    lock_keys = [f"generation-key:{user_id}:{idempotency_key}"] if idempotency_key else []
+    lock_keys.append(f"generation-hash:{user_id}:{request_hash}")
+
+    for lock_key in lock_keys:
+        await session.execute(
+            text("SELECT pg_advisory_xact_lock(hashtextextended(:lock_key, 0))"),
+            {"lock_key": lock_key},
+        )
+
+
+async def find_duplicate_generation(
+    session: AsyncSession,
+    user_id: str,
+    request_hash: str,
+    idempotency_key: Optional[str] = None,
+) -> Optional[Generation]:
+    """
+    Find the generation a request duplicates.
+
+    A generation created with the same Idempotency-Key is returned whatever its
+    status. Otherwise an identical request that is still in flight, or that
+    completed within GENERATION_DEDUP_WINDOW_SECONDS, is returned.
+
+    Args:
+        session: Database session
+        user_id: Database ID of the user
+        request_hash: Hash from generation_request_hash
+        idempotency_key: Optional Idempotency-Key header
+
+    Returns:
+        The existing Generation, or None if the request is new
+
+    Raises:
+        IdempotencyKeyMismatch: If the key was used for a different request
+    """
+    if idempotency_key:
+        statement = select(Generation).where(
+            Generation.user_id == user_id,
+            Generation.idempotency_key == idempotency_key,
+        )
+        generation = (await session.exec(statement)).first()
+        if generation:
+            if generation.request_hash != request_hash:
+                raise IdempotencyKeyMismatch("Idempotency-Key was already used for a different generation request")
+            return generation
+
+    completed_after = datetime.now(timezone.utc) - timedelta(seconds=settings.generation_dedup_window_seconds)
+    statement = (
+        select(Generation)
+        .where(
+            Generation.user_id == user_id,
+            Generation.request_hash == request_hash,
+            or_(
+                Generation.status.in_(IN_FLIGHT_STATUSES),
+                and_(Generation.status == "completed", Generation.updated_date >= completed_after),
+            ),
+        )
+        .order_by(Generation.creation_date.desc())
+        .limit(1)
+    )
+    return (await session.exec(statement)).first()
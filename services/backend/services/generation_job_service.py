@@ -0,0 +1,448 @@
+"""Generation job queue backed by the generation_jobs table.
+
+Workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+worker processes can pull from the same queue without handing out a job twice.
+While a job runs its worker bumps locked_at (heartbeat_generation_jobs); a job
+whose lock goes stale is re-queued, and a result from a worker that no longer
+holds the job is dropped.
+
+Besides "generation" jobs, which call the model providers, the queue holds
+"mirror" jobs that copy a completed generation's output into our bucket and
+"derive" jobs that render thumbnails and previews of generations and assets.
+These never change a generation's status, only its URLs once they exist.
+
+A deleted generation keeps its "deleted" status: DELETE cancels its queued jobs,
+and the results of jobs already running are dropped.
+"""
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.generation import Generation
+from models.generation_job import GenerationJob
+from models.asset import Asset
+from schemas.generation_schemas import GenerationRequest
+from services.event_service import publish_event, generation_event
+from services.output_mirror_service import is_mirrored
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Base delay for retrying a failed attempt, doubled on every attempt
+RETRY_BACKOFF_SECONDS = 15
+
+
+def enqueue_generation_job(session: AsyncSession, generation: Generation, request: GenerationRequest) -> GenerationJob:
+    """
+    Add a job for a pending generation to the session.
+
+    The caller commits, so the generation row and its job are written in the same transaction.
+
+    Args:
+        session: Database session
+        generation: Pending generation the job will execute
+        request: Generation request to store as the job payload
+
+    Returns:
+        The queued GenerationJob
+    """
+    job = GenerationJob(
+        generation_id=generation.id,
+        payload=request.model_dump(),
+        max_attempts=settings.generation_job_max_attempts,
+    )
+    session.add(job)
+    return job
+
+
+def enqueue_mirror_job(session: AsyncSession, generation: Generation, source_url: str) -> GenerationJob:
+    """
+    Add a job copying a generation's provider-hosted output into our bucket.
+
+    Args:
+        session: Database session
+        generation: Completed generation
+        source_url: Provider URL of the output
+
+    Returns:
+        The queued GenerationJob
+    """
+    job = GenerationJob(
+        generation_id=generation.id,
+        job_type="mirror",
+        payload={"source_url": source_url},
+        max_attempts=settings.generation_job_max_attempts,
+    )
+    session.add(job)
+    return job
+
+
+def enqueue_derive_job(
+    session: AsyncSession,
+    source_url: str,
+    s3_key: str,
+    media_type: str,
+    generation: Optional[Generation] = None,
+    asset: Optional[Asset] = None,
+) -> Optional[GenerationJob]:
+    """
+    Add a job rendering the thumbnails (and for videos poster and preview) of a generation or asset.
+
+    Only originals in our bucket are rendered, the worker never fetches
+    provider or user-supplied URLs for it.
+
+    Args:
+        session: Database session
+        source_url: URL of the original in our bucket
+        s3_key: Object key of the original, derivatives are stored next to it
+        media_type: "image" or "video", other media types get no derivatives
+        generation: Generation the original belongs to
+        asset: Asset the original belongs to
+
+    Returns:
+        The queued GenerationJob, or None if no derivatives apply
+    """
+    if not settings.derivatives_enabled or media_type not in ("image", "video") or not is_mirrored(source_url):
+        return None
+
+    job = GenerationJob(
+        generation_id=generation.id if generation else None,
+        asset_id=asset.id if asset else None,
+        job_type="derive",
+        payload={"source_url": source_url, "key_base": os.path.splitext(s3_key)[0], "media_type": media_type},
+        max_attempts=settings.generation_job_max_attempts,
+    )
+    session.add(job)
+    return job
+
+
+async def cancel_generation_jobs(session: AsyncSession, generation_id: str) -> None:
+    """
+    Cancel the queued jobs of a generation that is being deleted.
+
+    The caller commits, so the generation is deleted and its jobs are cancelled in the same transaction.
+
+    Args:
+        session: Database session
+        generation_id: ID of the deleted generation
+    """
+    await session.execute(
+        update(GenerationJob)
+        .where(GenerationJob.generation_id == generation_id, GenerationJob.status == "queued")
+        .values(status="cancelled", last_error="Generation was deleted")
+    )
+
+
+async def claim_generation_job(session: AsyncSession, worker_id: str) -> Optional[GenerationJob]:
+    """
+    Claim the oldest available job and mark its generation as processing.
+
+    Args:
+        session: Database session
+        worker_id: Identifier of the claiming worker
+
+    Returns:
+        The claimed GenerationJob, or None if the queue is empty
+    """
+    now = datetime.now(timezone.utc)
+    statement = (
+        select(GenerationJob)
+        .where(GenerationJob.status == "queued", GenerationJob.available_at <= now)
+        .order_by(GenerationJob.available_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = (await session.exec(statement)).first()
+
+    if not job:
+        await session.rollback()
+        return None
+
+    job.status = "running"
+    job.attempts += 1
+    job.locked_at = now
+    job.locked_by = worker_id
+    session.add(job)
+
+    if job.job_type == "generation":
+        generation = await session.get(Generation, job.generation_id)
+        if generation and generation.status != "deleted":
+            generation.status = "processing"
+            session.add(generation)
+            await publish_event(session, generation_event(generation))
+
+    await session.commit()
+    await session.refresh(job)
+    return job
+
+
+async def heartbeat_generation_jobs(session: AsyncSession, job_ids: List[str], worker_id: str) -> None:
+    """
+    Refresh the lock of the jobs a worker is running, so they are not considered stale.
+
+    Args:
+        session: Database session
+        job_ids: IDs of the worker's in-flight jobs
+        worker_id: Identifier of the worker
+    """
+    await session.execute(
+        update(GenerationJob)
+        .where(
+            GenerationJob.id.in_(job_ids),
+            GenerationJob.status == "running",
+            GenerationJob.locked_by == worker_id,
+        )
+        .values(locked_at=datetime.now(timezone.utc))
+    )
+    await session.commit()
+
+
+async def _get_owned_job(session: AsyncSession, job_id: str, worker_id: str) -> Optional[GenerationJob]:
+    """Lock and return a job if the worker still holds it, i.e. it was not re-queued, cancelled or claimed by another worker."""
+    job = await session.get(GenerationJob, job_id, with_for_update=True)
+    if not job or job.status != "running" or job.locked_by != worker_id:
+        logger.warning(f"Dropping the result of job {job_id}, worker {worker_id} no longer holds it")
+        await session.rollback()
+        return None
+    return job
+
+
+def _store_routing_samples(job: GenerationJob, samples: Optional[List[Dict[str, Any]]]) -> None:
+    """Append the routing samples of an attempt to the job payload, for GET /api/debug/providers."""
+    if samples:
+        job.payload = {**job.payload, "routing": [*job.payload.get("routing", []), *samples]}
+
+
+async def complete_generation_job(
+    session: AsyncSession,
+    job_id: str,
+    worker_id: str,
+    generated_content_url: Optional[str],
+    error_message: Optional[str] = None,
+    routing_samples: Optional[List[Dict[str, Any]]] = None,
+) -> bool:
+    """
+    Record the provider result on the generation and close the job.
+
+    Args:
+        session: Database session
+        job_id: ID of the finished job
+        worker_id: Identifier of the worker that ran the job
+        generated_content_url: URL of the generated content, if any
+        error_message: Provider error if the generation did not produce content
+        routing_samples: Provider router samples of the attempt
+
+    Returns:
+        False if the worker no longer held the job and the result was dropped
+    """
+    job = await _get_owned_job(session, job_id, worker_id)
+    if not job:
+        return False
+
+    job.status = "completed" if generated_content_url else "failed"
+    job.last_error = error_message
+    job.locked_at = None
+    _store_routing_samples(job, routing_samples)
+    session.add(job)
+
+    generation = await session.get(Generation, job.generation_id)
+    if generation and generation.status != "deleted":
+        generation.status = "completed" if generated_content_url else "failed"
+        generation.generated_content_url = generated_content_url
+        generation.error_message = error_message
+        session.add(generation)
+        await publish_event(session, generation_event(generation))
+
+        if generated_content_url and settings.mirror_outputs_enabled and not is_mirrored(generated_content_url):
+            # Derivatives are rendered once the output is mirrored
+            enqueue_mirror_job(session, generation, generated_content_url)
+        elif generated_content_url:
+            enqueue_derive_job(
+                session,
+                generated_content_url,
+                f"generations/{generation.id}",
+                generation.generation_type,
+                generation=generation,
+            )
+
+    await session.commit()
+    return True
+
+
+async def complete_mirror_job(session: AsyncSession, job_id: str, worker_id: str, result: dict) -> bool:
+    """
+    Point the generation at its mirrored copy and close the job.
+
+    The URL is only swapped while the generation still references the mirrored
+    source URL.
+
+    Args:
+        session: Database session
+        job_id: ID of the finished mirror job
+        worker_id: Identifier of the worker that ran the job
+        result: Result of mirror_to_s3 (url, s3_key, bytes, seconds)
+
+    Returns:
+        False if the worker no longer held the job and the result was dropped
+    """
+    job = await _get_owned_job(session, job_id, worker_id)
+    if not job:
+        return False
+
+    job.status = "completed"
+    job.last_error = None
+    job.locked_at = None
+    job.payload = {**job.payload, "result": result}
+    session.add(job)
+
+    generation = await session.get(Generation, job.generation_id)
+    if generation and generation.status != "deleted" and generation.generated_content_url == job.payload["source_url"]:
+        generation.generated_content_url = result["url"]
+        session.add(generation)
+        await publish_event(session, generation_event(generation))
+        enqueue_derive_job(session, result["url"], result["s3_key"], generation.generation_type, generation=generation)
+
+    await session.commit()
+    return True
+
+
+async def complete_derive_job(session: AsyncSession, job_id: str, worker_id: str, derivatives: Dict[str, str]) -> bool:
+    """
+    Store the derivative URLs on the generation or asset and close the job.
+
+    Args:
+        session: Database session
+        job_id: ID of the finished derive job
+        worker_id: Identifier of the worker that ran the job
+        derivatives: Result of create_derivatives
+
+    Returns:
+        False if the worker no longer held the job and the result was dropped
+    """
+    job = await _get_owned_job(session, job_id, worker_id)
+    if not job:
+        return False
+
+    job.status = "completed"
+    job.last_error = None
+    job.locked_at = None
+    session.add(job)
+
+    if job.generation_id:
+        generation = await session.get(Generation, job.generation_id)
+        if generation and generation.status != "deleted":
+            generation.derivatives = derivatives
+            session.add(generation)
+            await publish_event(session, generation_event(generation))
+
+    if job.asset_id:
+        asset = await session.get(Asset, job.asset_id)
+        if asset:
+            asset.derivatives = derivatives
+            session.add(asset)
+
+    await session.commit()
+    return True
+
+
+async def fail_generation_job(
+    session: AsyncSession,
+    job_id: str,
+    worker_id: str,
+    error: str,
+    routing_samples: Optional[List[Dict[str, Any]]] = None,
+) -> bool:
+    """
+    Handle an unexpected error, re-queueing the job with backoff while attempts remain.
+
+    Args:
+        session: Database session
+        job_id: ID of the failed job
+        worker_id: Identifier of the worker that ran the job
+        error: Error description
+        routing_samples: Provider router samples of the attempt, for generation jobs
+
+    Returns:
+        False if the worker no longer held the job and the error was dropped
+    """
+    job = await _get_owned_job(session, job_id, worker_id)
+    if not job:
+        return False
+
+    # A failed mirror keeps the provider URL, the generation itself succeeded
+    generation = await session.get(Generation, job.generation_id) if job.job_type == "generation" else None
+    job.last_error = error
+    job.locked_at = None
+    job.locked_by = None
+    _store_routing_samples(job, routing_samples)
+
+    if generation and generation.status == "deleted":
+        job.status = "cancelled"
+        generation = None
+    elif job.attempts < job.max_attempts:
+        job.status = "queued"
+        job.available_at = datetime.now(timezone.utc) + timedelta(seconds=RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1))
+        if generation:
+            generation.status = "pending"
+    else:
+        job.status = "failed"
+        if generation:
+            generation.status = "failed"
+            generation.error_message = error
+
+    session.add(job)
+    if generation:
+        session.add(generation)
+        await publish_event(session, generation_event(generation))
+    await session.commit()
+    return True
+
+
+async def requeue_stale_generation_jobs(session: AsyncSession) -> int:
+    """
+    Put jobs back on the queue whose worker stopped without finishing them.
+
+    Running jobs are kept fresh by their worker's heartbeat, so a stale lock
+    means the worker is gone.
+
+    Args:
+        session: Database session
+
+    Returns:
+        Number of re-queued jobs
+    """
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.generation_job_stale_after_seconds)
+    statement = (
+        select(GenerationJob)
+        .where(GenerationJob.status == "running", GenerationJob.locked_at < stale_before)
+        .with_for_update(skip_locked=True)
+    )
+    jobs = (await session.exec(statement)).all()
+
+    for job in jobs:
+        job.status = "queued" if job.attempts < job.max_attempts else "failed"
+        job.last_error = f"Worker {job.locked_by} did not finish the job"
+        job.locked_at = None
+        job.locked_by = None
+        session.add(job)
+
+        if job.job_type != "generation":
+            continue
+
+        generation = await session.get(Generation, job.generation_id)
+        if generation and generation.status == "deleted":
+            job.status = "cancelled"
+        elif generation:
+            generation.status = "pending" if job.status == "queued" else "failed"
+            if job.status == "failed":
+                generation.error_message = job.last_error
+            session.add(generation)
+            await publish_event(session, generation_event(generation))
+
+    await session.commit()
+    return len(jobs)
@@ -0,0 +1,155 @@
+"""Generation service that calls the model providers for a generation request."""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from runware import RunwareAPIError
+from schemas.generation_schemas import GenerationRequest
+from dependencies.runware_dependencies import generate_image, generate_audio, generate_video
+from dependencies.runware_pool import RunwareRequestLostError
+from dependencies.bytedance_dependencies import ArkTaskOutcomeUnknownError, generate_video as generate_bytedance_video
+from services.provider_registry import ModelBackend, UnsupportedModelError, candidate_backends, generation_mode
+from services.provider_router import OutcomeUnknownError, provider_router
+
+logger = logging.getLogger(__name__)
+
+# Errors the Runware SDK raises when the request was sent but no result arrived in time.
+# They are plain Exceptions or RunwareAPIErrors without a code, so they are told apart by message.
+RUNWARE_TIMEOUT_MESSAGES = ("Message could not be received", "Video generation timed out", "Unexpected polling response")
+
+
+async def _run_runware_image(backend: ModelBackend, request: GenerationRequest) -> Optional[str]:
+    return await generate_image(request.prompt, backend.model, request.width or 1024, request.height or 1024)
+
+
+async def _run_runware_video(backend: ModelBackend, request: GenerationRequest) -> Optional[str]:
+    return await generate_video(
+        prompt=request.prompt,
+        model=backend.model,
+        width=request.width if request.width else 864,
+        height=request.height if request.height else 480,
+        duration=request.duration or 5,
+        fps=24,
+        output_format="MP4",
+        output_quality=85,
+        first_frame=request.first_frame,
+        last_frame=request.last_frame,
+    )
+
+
+async def _run_ark_video(backend: ModelBackend, request: GenerationRequest) -> Optional[str]:
+    # Map common width/height combinations to ByteDance resolution
+    resolution = "720p"
+    if request.width and request.height:
+        width_height_map = {
+            (864, 480): "720p",
+            (1024, 576): "720p",
+            (1280, 720): "720p",
+            (1920, 1080): "1080p",
+        }
+        resolution = width_height_map.get((request.width, request.height), "720p")
+
+    aspect_ratio = request.aspect_ratio if request.aspect_ratio else "16:9"
+    duration = request.duration or 5
+
+    logger.info(f"Using ByteDance API for model: {backend.model} ({duration}s, {resolution}, {aspect_ratio})")
+
+    bytedance_response = await generate_bytedance_video(
+        text=request.prompt,
+        first_image=request.first_frame,
+        last_image=request.last_frame,
+        model=backend.model,
+        aspect_ratio=aspect_ratio,
+        resolution=resolution,
+        duration=duration,
+        camera_fixed=False,
+    )
+
+    generated_content_url = bytedance_response.get("video_url") if isinstance(bytedance_response, dict) else None
+    if not generated_content_url or generated_content_url == "-":
+        return None
+    return generated_content_url
+
+
+async def _run_runware_audio(backend: ModelBackend, request: GenerationRequest) -> Optional[str]:
+    return await generate_audio(
+        prompt=request.prompt,
+        model=backend.model,
+        duration=request.duration if request.duration else 10,
+        output_format="MP3",
+        bitrate=128,
+        sample_rate=44100,
+    )
+
+
+# Request runner per (provider, generation type)
+BACKEND_RUNNERS: Dict[Tuple[str, str], Callable[[ModelBackend, GenerationRequest], Awaitable[Optional[str]]]] = {
+    ("runware", "image"): _run_runware_image,
+    ("runware", "video"): _run_runware_video,
+    ("ark", "video"): _run_ark_video,
+    ("runware", "audio"): _run_runware_audio,
+}
+
+
+def _outcome_unknown(error: Exception) -> bool:
+    """
+    Whether the provider may have accepted the request despite the error.
+
+    Only errors raised after the request was sent and before a result arrived
+    qualify: an Ark task without a result, a Runware connection lost mid
+    request, and batcher or SDK timeouts. Anything else, i.e. rejections,
+    errors before sending and bugs, fails over or propagates for a job retry.
+    """
+    if isinstance(error, (ArkTaskOutcomeUnknownError, RunwareRequestLostError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, RunwareAPIError):
+        # Errors Runware reported itself carry a code
+        message = "" if error.code else str(error.error_data.get("message", ""))
+    elif type(error) is Exception:
+        message = str(error)
+    else:
+        return False
+    return any(timeout_message in message for timeout_message in RUNWARE_TIMEOUT_MESSAGES)
+
+
+async def _run_backend(backend: ModelBackend, request: GenerationRequest) -> Optional[str]:
+    try:
+        return await BACKEND_RUNNERS[(backend.provider, backend.generation_type)](backend, request)
+    except Exception as e:
+        if _outcome_unknown(e):
+            raise OutcomeUnknownError(str(e)) from e
+        raise
+
+
+async def run_generation(
+    request: GenerationRequest,
+    samples: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Run a generation request on the best backend for its model, failing over to equivalent ones.
+
+    A request is only failed over if the provider rejected it or reported it as
+    failed; after a timeout it may still be rendered (and billed), so it fails.
+
+    Args:
+        request: Generation request with prompt and optional frame URLs
+        samples: Optional list receiving the routing sample of every attempt
+
+    Returns:
+        Tuple of (generated_content_url, error_message). Exactly one of them is set.
+
+    Raises:
+        Exception: Provider errors raised before the request was accepted are propagated
+            so the job can be retried
+    """
+    mode = generation_mode(request.generation_type, request.first_frame, request.last_frame)
+    try:
+        candidates = candidate_backends(request.generation_type, request.model, mode, request.duration)
+    except UnsupportedModelError as e:
+        return None, str(e)
+
+    return await provider_router.execute(
+        candidates,
+        lambda backend: _run_backend(backend, request),
+        duration=request.duration,
+        samples=samples,
+    )
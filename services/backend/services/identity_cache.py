@@ -0,0 +1,136 @@
+"""In-process cache of verified identities used by get_current_user.
+
+Maps a WorkOS user ID (token "sub") to the user's profile including the
+database ID, so authenticated requests skip the WorkOS profile call and the
+user upsert. Entries expire after a TTL, the least recently used entries are
+evicted beyond a size limit, and entries close to expiry are refreshed in the
+background while the cached value keeps being served.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional, Set
+from schemas.auth_schemas import UserProfile
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+@dataclass
+class _CachedIdentity:
+    profile: UserProfile
+    fetched_at: float
+    session_ids: Set[str] = field(default_factory=set)
+
+
+class IdentityCache:
+    """TTL + LRU cache of UserProfile (with database_id) keyed by WorkOS user ID."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = settings.identity_cache_ttl_seconds,
+        refresh_after_seconds: float = settings.identity_cache_refresh_after_seconds,
+        max_entries: int = settings.identity_cache_max_entries,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.refresh_after_seconds = refresh_after_seconds
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, _CachedIdentity]" = OrderedDict()
+        self._session_index: Dict[str, str] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    def get(self, user_id: str, session_id: Optional[str] = None) -> Optional[UserProfile]:
+        """
+        Get a cached profile.
+
+        Args:
+            user_id: WorkOS user ID from the token "sub" claim
+            session_id: WorkOS session ID from the token "sid" claim
+
+        Returns:
+            Copy of the cached UserProfile, or None if missing or expired
+        """
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+
+        if time.monotonic() - entry.fetched_at > self.ttl_seconds:
+            self.invalidate(user_id)
+            return None
+
+        self._entries.move_to_end(user_id)
+        if session_id and session_id not in entry.session_ids:
+            entry.session_ids.add(session_id)
+            self._session_index[session_id] = user_id
+
+        return entry.profile.model_copy()
+
+    def set(self, user_id: str, profile: UserProfile, session_id: Optional[str] = None) -> None:
+        """Store a verified profile, evicting the least recently used entries beyond the size limit."""
+        previous = self._entries.pop(user_id, None)
+        entry = _CachedIdentity(
+            profile=profile.model_copy(),
+            fetched_at=time.monotonic(),
+            session_ids=previous.session_ids if previous else set(),
+        )
+        if session_id:
+            entry.session_ids.add(session_id)
+            self._session_index[session_id] = user_id
+        self._entries[user_id] = entry
+
+        while len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._drop_sessions(evicted)
+
+    def refresh_in_background(self, user_id: str, loader: Callable[[], Awaitable[UserProfile]]) -> None:
+        """
+        Reload an entry in the background once it is older than the refresh threshold.
+
+        At most one refresh runs per user; the cached profile keeps being served meanwhile.
+
+        Args:
+            user_id: WorkOS user ID
+            loader: Coroutine factory returning a freshly verified UserProfile
+        """
+        entry = self._entries.get(user_id)
+        if entry is None or user_id in self._refreshing:
+            return
+        if time.monotonic() - entry.fetched_at < self.refresh_after_seconds:
+            return
+
+        async def refresh() -> None:
+            try:
+                profile = await loader()
+                if user_id in self._entries:
+                    self.set(user_id, profile)
+            except Exception as e:
+                logger.warning(f"Background identity refresh failed for {user_id}: {str(e)}")
+            finally:
+                self._refreshing.pop(user_id, None)
+
+        self._refreshing[user_id] = asyncio.create_task(refresh())
+
+    def invalidate(self, user_id: str) -> None:
+        """Remove a user's cached profile."""
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self._drop_sessions(entry)
+
+    def invalidate_session(self, session_id: str) -> None:
+        """Remove the cached profile of the user owning a WorkOS session."""
+        user_id = self._session_index.pop(session_id, None)
+        if user_id:
+            self.invalidate(user_id)
+
+    def _drop_sessions(self, entry: _CachedIdentity) -> None:
+        for session_id in entry.session_ids:
+            self._session_index.pop(session_id, None)
+
+
+# Process-wide cache used by get_current_user
+identity_cache = IdentityCache()
@@ -0,0 +1,131 @@
+"""Local verification of WorkOS access tokens against the cached WorkOS JWKS.
+
+The key set is fetched once and cached. Each signing key is parsed into a
+PyJWK once per key ID and reused for every token signed with it. An unknown
+key ID triggers a rate-limited refresh, so key rotation is picked up without
+refetching the JWKS on every request.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+import jwt
+from dependencies.http_client_dependencies import get_http_client
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class JwksVerifier:
+    """Verifies RS256 JWTs with keys from a JWKS endpoint."""
+
+    def __init__(
+        self,
+        jwks_url: str = settings.workos_jwks_url,
+        issuer: Optional[str] = settings.workos_jwt_issuer or None,
+        algorithms: Sequence[str] = ("RS256",),
+        cache_ttl_seconds: float = settings.jwks_cache_ttl_seconds,
+        min_refresh_interval_seconds: float = 60.0,
+        leeway_seconds: float = 30.0,
+        fetch_jwks: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None,
+    ):
+        """
+        Args:
+            jwks_url: URL of the JWKS document
+            issuer: Expected "iss" claim, or None to skip the issuer check
+            algorithms: Accepted signing algorithms
+            cache_ttl_seconds: Maximum age of the cached key set
+            min_refresh_interval_seconds: Minimum time between refreshes caused by unknown key IDs
+            leeway_seconds: Allowed clock skew for "exp"/"iat"
+            fetch_jwks: Optional coroutine factory returning the JWKS document (e.g. a local fixture)
+        """
+        self.jwks_url = jwks_url
+        self.issuer = issuer
+        self.algorithms = list(algorithms)
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.min_refresh_interval_seconds = min_refresh_interval_seconds
+        self.leeway_seconds = leeway_seconds
+        self._fetch_jwks = fetch_jwks or self._fetch_remote_jwks
+
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._fetched_at: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a token's signature and standard claims.
+
+        Args:
+            token: Encoded JWT
+
+        Returns:
+            Decoded token claims
+
+        Raises:
+            jwt.InvalidTokenError: If the token is malformed, expired, or not signed by a known key
+        """
+        header = jwt.get_unverified_header(token)
+
+        if header.get("alg") not in self.algorithms:
+            raise jwt.InvalidAlgorithmError(f"Unsupported token algorithm: {header.get('alg')}")
+
+        signing_key = await self._get_signing_key(header.get("kid"))
+
+        return jwt.decode(
+            token,
+            key=signing_key.key,
+            algorithms=self.algorithms,
+            issuer=self.issuer,
+            leeway=self.leeway_seconds,
+            options={"verify_aud": False, "require": ["exp", "sub"]},
+        )
+
+    def load_jwks(self, jwks: Dict[str, Any]) -> None:
+        """Replace the cached keys with the signing keys of a JWKS document."""
+        keys: Dict[str, jwt.PyJWK] = {}
+        for key_data in jwks.get("keys", []):
+            if key_data.get("use", "sig") != "sig" or not key_data.get("kid"):
+                continue
+            try:
+                keys[key_data["kid"]] = jwt.PyJWK(key_data)
+            except jwt.PyJWKError as e:
+                logger.warning(f"Skipping unusable JWKS key {key_data.get('kid')}: {str(e)}")
+
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+
+    async def refresh(self) -> None:
+        """Fetch the JWKS document and replace the cached keys."""
+        fetched_at = self._fetched_at
+        async with self._refresh_lock:
+            # Another caller refreshed while we were waiting for the lock
+            if self._fetched_at != fetched_at:
+                return
+            self.load_jwks(await self._fetch_jwks())
+            logger.info(f"Loaded {len(self._keys)} signing keys from JWKS")
+
+    async def _get_signing_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        if self._fetched_at is None or time.monotonic() - self._fetched_at > self.cache_ttl_seconds:
+            await self.refresh()
+
+        signing_key = self._keys.get(kid)
+        if signing_key is None and time.monotonic() - self._fetched_at >= self.min_refresh_interval_seconds:
+            # Unknown key ID, the keys may have been rotated
+            await self.refresh()
+            signing_key = self._keys.get(kid)
+
+        if signing_key is None:
+            raise jwt.InvalidTokenError("Token signed with an unknown key")
+
+        return signing_key
+
+    async def _fetch_remote_jwks(self) -> Dict[str, Any]:
+        response = await get_http_client(self.jwks_url).get(self.jwks_url)
+        response.raise_for_status()
+        return response.json()
+
+
+# Process-wide verifier for WorkOS access tokens
+jwks_verifier = JwksVerifier()
@@ -0,0 +1,202 @@
+"""Content-addressed cache of LLM responses stored in Postgres.
+
+Responses are keyed by a hash of the complete completion request (model,
+messages with the system and master prompts, temperature and response schema),
+so any change to a prompt or schema naturally misses the cache. Entries expire
+after a TTL and the least recently used entries are evicted beyond a size
+limit. Concurrent identical requests within a process share one upstream call.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from sqlalchemy import delete, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from db.session import async_session_maker
+from models.llm_cache_entry import LlmCacheEntry
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+def llm_cache_key(request: Dict[str, Any]) -> str:
+    """
+    Hash a completion request into a cache key.
+
+    Args:
+        request: Keyword arguments of the chat completion call
+
+    Returns:
+        Hex SHA-256 of the request serialized as canonical JSON
+    """
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class LlmCache:
+    """Postgres-backed TTL + LRU cache of LLM responses with in-process single-flight."""
+
+    def __init__(
+        self,
+        enabled: bool = settings.llm_cache_enabled,
+        ttl_seconds: int = settings.llm_cache_ttl_seconds,
+        max_entries: int = settings.llm_cache_max_entries,
+    ):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response and mark it as recently used.
+
+        Args:
+            key: Cache key from llm_cache_key
+
+        Returns:
+            Cached message content, or None if missing, expired or the cache is unavailable
+        """
+        if not self.enabled:
+            return None
+
+        now = datetime.now(timezone.utc)
+        try:
+            async with async_session_maker() as session:
+                statement = select(LlmCacheEntry.content).where(
+                    LlmCacheEntry.cache_key == key,
+                    LlmCacheEntry.expires_at > now,
+                )
+                content = (await session.exec(statement)).first()
+                if content is None:
+                    return None
+
+                await session.execute(
+                    update(LlmCacheEntry)
+                    .where(LlmCacheEntry.cache_key == key)
+                    .values(last_hit_at=now, hit_count=LlmCacheEntry.hit_count + 1)
+                )
+                await session.commit()
+                return content
+        except Exception as e:
+            # The cache only saves LLM calls, it must never fail a request
+            logger.warning("LLM cache lookup failed: %s", e)
+            return None
+
+    async def set(self, key: str, model: str, content: str) -> None:
+        """
+        Store a response, replacing an existing entry, and evict expired and surplus entries.
+
+        Args:
+            key: Cache key from llm_cache_key
+            model: LLM model that produced the response
+            content: Message content of the response
+        """
+        if not self.enabled:
+            return
+
+        now = datetime.now(timezone.utc)
+        entry = LlmCacheEntry(
+            cache_key=key,
+            model=model,
+            content=content,
+            expires_at=now + timedelta(seconds=self.ttl_seconds),
+        )
+        statement = insert(LlmCacheEntry).values(entry.model_dump())
+        statement = statement.on_conflict_do_update(
+            index_elements=[LlmCacheEntry.cache_key],
+            set_={
+                "model": statement.excluded.model,
+                "content": statement.excluded.content,
+                "expires_at": statement.excluded.expires_at,
+                "last_hit_at": statement.excluded.last_hit_at,
+                "updated_date": statement.excluded.updated_date,
+            },
+        )
+        surplus = (
+            select(LlmCacheEntry.id)
+            .order_by(LlmCacheEntry.last_hit_at.desc())
+            .offset(self.max_entries)
+        )
+
+        try:
+            async with async_session_maker() as session:
+                await session.execute(statement)
+                await session.execute(
+                    delete(LlmCacheEntry).where(
+                        or_(LlmCacheEntry.expires_at <= now, LlmCacheEntry.id.in_(surplus))
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning("LLM cache write failed: %s", e)
+
+    async def get_or_create(
+        self,
+        key: str,
+        model: str,
+        create: Callable[[], Awaitable[str]],
+        parse: Callable[[str], T],
+        bypass: bool = False,
+    ) -> T:
+        """
+        Get a cached response or create it, sharing one call between concurrent identical requests.
+
+        Only responses that parse are cached, so a malformed reply is not served
+        again until the TTL runs out; a cached entry that no longer parses is
+        replaced.
+
+        Args:
+            key: Cache key from llm_cache_key
+            model: LLM model used by create
+            create: Performs the upstream call and returns the message content
+            parse: Converts the message content into the caller's result, raising if it is unusable
+            bypass: Skip the cache lookup and fetch a fresh response (which is then cached)
+
+        Returns:
+            The parsed message content
+
+        Raises:
+            Exception: Whatever create or parse raise for a fresh response
+        """
+        if not bypass:
+            cached = await self.get(key)
+            if cached is not None:
+                try:
+                    return parse(cached)
+                except Exception as e:
+                    logger.warning("Discarding unusable cached LLM response: %s", e)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._create_and_store(key, model, create, parse))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # A caller disconnecting must not cancel the call the other callers wait for.
+        # Each caller parses its own copy, so callers never share a mutable result.
+        return parse(await asyncio.shield(task))
+
+    async def _create_and_store(
+        self,
+        key: str,
+        model: str,
+        create: Callable[[], Awaitable[str]],
+        parse: Callable[[str], Any],
+    ) -> str:
+        content = await create()
+        parse(content)
+        await self.set(key, model, content)
+        return content
+
+
+# Process-wide LLM response cache
+llm_cache = LlmCache()
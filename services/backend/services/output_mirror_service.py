@@ -0,0 +1,218 @@
+"""Mirror provider-hosted generation outputs into our S3 bucket.
+
+Provider URLs (Runware imageURL/videoURL, Ark video_url) expire and every view
+hits a third-party CDN. After a generation completes, a "mirror" job streams
+the output into the bucket as a multipart upload: the download is cut into
+part-sized chunks and up to MIRROR_PART_CONCURRENCY parts are uploaded
+concurrently, each retried with backoff. Reading pauses while all upload slots
+are busy, so at most concurrency + 1 parts are held in memory.
+"""
+import asyncio
+import logging
+import mimetypes
+import time
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+from botocore.exceptions import BotoCoreError, ClientError
+from dependencies.http_client_dependencies import get_http_client
+from dependencies.s3_dependencies import get_s3_client, get_public_url
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Base delay before retrying a failed part upload, doubled on every attempt
+PART_RETRY_BACKOFF_SECONDS = 0.5
+
+
+@dataclass
+class TransferProgress:
+    """Progress of one running transfer."""
+    source_url: str
+    s3_key: str
+    total_bytes: Optional[int] = None  # From Content-Length, if the provider sends it
+    transferred_bytes: int = 0  # Bytes uploaded to S3
+    started_at: float = field(default_factory=time.monotonic)
+
+
+class TransferMetrics:
+    """Progress of running transfers and totals of finished ones in this process."""
+
+    def __init__(self):
+        self.active: Dict[str, TransferProgress] = {}
+        self.completed = 0
+        self.failed = 0
+        self.part_retries = 0
+        self.total_bytes = 0
+        self.total_seconds = 0.0
+
+    def start(self, s3_key: str, source_url: str) -> TransferProgress:
+        progress = TransferProgress(source_url=source_url, s3_key=s3_key)
+        self.active[s3_key] = progress
+        return progress
+
+    def finish(self, progress: TransferProgress, succeeded: bool) -> None:
+        self.active.pop(progress.s3_key, None)
+        if succeeded:
+            self.completed += 1
+            self.total_bytes += progress.transferred_bytes
+            self.total_seconds += time.monotonic() - progress.started_at
+        else:
+            self.failed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get transfer metrics.
+
+        Returns:
+            Dictionary with running transfers and totals of finished transfers
+        """
+        now = time.monotonic()
+        active = []
+        for progress in self.active.values():
+            elapsed = max(now - progress.started_at, 1e-6)
+            active.append({
+                "source_url": progress.source_url,
+                "s3_key": progress.s3_key,
+                "transferred_bytes": progress.transferred_bytes,
+                "total_bytes": progress.total_bytes,
+                "percent": round(100 * progress.transferred_bytes / progress.total_bytes, 1) if progress.total_bytes else None,
+                "throughput_mb_per_s": round(progress.transferred_bytes / elapsed / 1e6, 2),
+            })
+
+        return {
+            "active": active,
+            "completed": self.completed,
+            "failed": self.failed,
+            "part_retries": self.part_retries,
+            "total_bytes": self.total_bytes,
+            "avg_throughput_mb_per_s": round(self.total_bytes / max(self.total_seconds, 1e-6) / 1e6, 2),
+        }
+
+
+# Process-wide transfer metrics
+transfer_metrics = TransferMetrics()
+
+
+def mirror_key(generation_id: str, source_url: str, content_type: Optional[str] = None) -> str:
+    """Object key of a generation's mirrored output, keeping the source file extension."""
+    extension = PurePosixPath(urlsplit(source_url).path).suffix.lower()
+    if not extension and content_type:
+        extension = mimetypes.guess_extension(content_type.split(";")[0].strip()) or ""
+    return f"generations/{generation_id}{extension}"
+
+
+def is_mirrored(url: str) -> bool:
+    """Whether a URL already points into our bucket."""
+    return url.startswith(get_public_url(""))
+
+
+async def _upload_part(
+    upload: Dict[str, str],
+    part_number: int,
+    data: bytes,
+    progress: TransferProgress,
+) -> Dict[str, Any]:
+    """Upload one part, retrying with backoff."""
+    s3_client = get_s3_client()
+    for attempt in range(1, settings.mirror_part_attempts + 1):
+        try:
+            result = await asyncio.to_thread(
+                s3_client.upload_part,
+                Bucket=upload["Bucket"],
+                Key=upload["Key"],
+                UploadId=upload["UploadId"],
+                PartNumber=part_number,
+                Body=data,
+            )
+            progress.transferred_bytes += len(data)
+            return {"PartNumber": part_number, "ETag": result["ETag"]}
+        except (BotoCoreError, ClientError) as e:
+            if attempt == settings.mirror_part_attempts:
+                raise
+            transfer_metrics.part_retries += 1
+            logger.warning(f"Retrying part {part_number} of {upload['Key']} after error: {e}")
+            await asyncio.sleep(PART_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+
+async def mirror_to_s3(generation_id: str, source_url: str) -> Dict[str, Any]:
+    """
+    Stream a provider-hosted output into the bucket.
+
+    Args:
+        generation_id: ID of the generation the output belongs to
+        source_url: Provider URL of the output
+
+    Returns:
+        Dictionary with the public URL, key, size in bytes and duration in seconds
+
+    Raises:
+        Exception: Download or upload errors, after the multipart upload was aborted
+    """
+    s3_client = get_s3_client()
+    part_size = settings.s3_multipart_chunk_size
+    slots = asyncio.Semaphore(settings.mirror_part_concurrency)
+
+    # Output URLs are chosen by the provider, on CDN or storage hosts we do not keep clients for
+    async with get_http_client(source_url, untrusted=True).stream("GET", source_url) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("content-type", "application/octet-stream")
+        s3_key = mirror_key(generation_id, source_url, content_type)
+
+        progress = transfer_metrics.start(s3_key, source_url)
+        if response.headers.get("content-length", "").isdigit():
+            progress.total_bytes = int(response.headers["content-length"])
+
+        created = await asyncio.to_thread(
+            s3_client.create_multipart_upload,
+            Bucket=settings.s3_bucket_name,
+            Key=s3_key,
+            ContentType=content_type,
+        )
+        upload = {"Bucket": settings.s3_bucket_name, "Key": s3_key, "UploadId": created["UploadId"]}
+        tasks: List[asyncio.Task] = []
+
+        async def upload_in_slot(part_number: int, data: bytes) -> Dict[str, Any]:
+            try:
+                return await _upload_part(upload, part_number, data, progress)
+            finally:
+                slots.release()
+
+        async def start_part(data: bytes) -> None:
+            await slots.acquire()
+            tasks.append(asyncio.create_task(upload_in_slot(len(tasks) + 1, data)))
+
+        try:
+            buffer = bytearray()
+            async for chunk in response.aiter_bytes():
+                buffer += chunk
+                while len(buffer) >= part_size:
+                    await start_part(bytes(buffer[:part_size]))
+                    del buffer[:part_size]
+
+            # Last (possibly smaller) part; an empty output still needs one part
+            if buffer or not tasks:
+                await start_part(bytes(buffer))
+
+            parts = await asyncio.gather(*tasks)
+            await asyncio.to_thread(s3_client.complete_multipart_upload, **upload, MultipartUpload={"Parts": parts})
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            transfer_metrics.finish(progress, succeeded=False)
+            try:
+                await asyncio.to_thread(s3_client.abort_multipart_upload, **upload)
+            except Exception as e:
+                logger.warning(f"Failed to abort multipart upload of {s3_key}: {e}")
+            raise
+
+    transfer_metrics.finish(progress, succeeded=True)
+    return {
+        "url": get_public_url(s3_key),
+        "s3_key": s3_key,
+        "bytes": progress.transferred_bytes,
+        "seconds": round(time.monotonic() - progress.started_at, 3),
+    }
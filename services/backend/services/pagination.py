@@ -0,0 +1,85 @@
+"""Keyset (cursor) pagination helpers for newest-first listings.
+
+Pages are ordered by (timestamp, id) descending. The cursor encodes the
+(timestamp, id) of the last row of a page, and the next page continues with
+rows strictly before it, so deep pages cost the same as the first one and rows
+inserted meanwhile do not shift the page boundaries.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+from sqlalchemy import tuple_
+
+T = TypeVar("T")
+
+
+def encode_cursor(timestamp: datetime, row_id: str) -> str:
+    """Encode the position after a row as an opaque cursor."""
+    raw = json.dumps([timestamp.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), str(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def apply_keyset(statement: Any, timestamp_column: Any, id_column: Any, cursor: Optional[str], limit: int) -> Any:
+    """
+    Order a select newest first and restrict it to one page after the cursor.
+
+    One extra row is fetched to detect whether another page follows, pass the
+    result to page_results.
+
+    Args:
+        statement: Select statement with the listing's filters applied
+        timestamp_column: Column holding the sort timestamp
+        id_column: Primary key column, breaks ties between equal timestamps
+        cursor: Cursor from the previous page, or None for the first page
+        limit: Page size
+
+    Returns:
+        The paginated select statement
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if cursor:
+        cursor_timestamp, cursor_id = decode_cursor(cursor)
+        statement = statement.where(tuple_(timestamp_column, id_column) < tuple_(cursor_timestamp, cursor_id))
+
+    return statement.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def page_results(
+    rows: Sequence[T],
+    limit: int,
+    cursor_key: Callable[[T], Tuple[datetime, str]],
+) -> Tuple[List[T], Optional[str]]:
+    """
+    Split the rows of an apply_keyset query into the page and the next cursor.
+
+    Args:
+        rows: Rows returned by the paginated statement
+        limit: Page size passed to apply_keyset
+        cursor_key: Returns the (timestamp, id) sort key of a row
+
+    Returns:
+        Tuple of (rows of the page, cursor for the next page or None)
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+
+    return page, encode_cursor(*cursor_key(page[-1]))
@@ -0,0 +1,200 @@
+"""Registry of the model backends we can generate with.
+
+A backend is one model at one provider. Backends of the same family are
+interchangeable: a request naming the family, or any backend's model ID,
+may be served by any backend of that family that supports the request, and
+services/provider_router.py picks between them. Each backend declares the
+generation modes it supports, its duration limits, an approximate price and a
+typical latency used until real latencies have been measured.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional
+
+# Generation modes, derived from the request's inputs
+TEXT_TO_IMAGE = "text_to_image"
+TEXT_TO_AUDIO = "text_to_audio"
+TEXT_TO_VIDEO = "text_to_video"
+IMAGE_TO_VIDEO = "image_to_video"  # First frame given
+FIRST_LAST_FRAME = "first_last_frame"  # First and last frames given
+
+MODES_BY_TYPE = {
+    "image": frozenset({TEXT_TO_IMAGE}),
+    "video": frozenset({TEXT_TO_VIDEO, IMAGE_TO_VIDEO, FIRST_LAST_FRAME}),
+    "audio": frozenset({TEXT_TO_AUDIO}),
+}
+
+# Model (family) used when a request does not name one
+DEFAULT_MODELS = {
+    "image": "google:4@1",
+    "video": "seedance-1-0-lite",
+    "audio": "elevenlabs:1@1",
+}
+
+# Typical latency of models that are not in the registry
+DEFAULT_LATENCY_SECONDS = {"image": 10.0, "video": 90.0, "audio": 20.0}
+
+# Runware AIR model identifiers, e.g. "runware:100@1"
+RUNWARE_AIR_ID = re.compile(r"^[a-z0-9_-]+:\d+@\d+$")
+
+# Ark Seedance model IDs, e.g. "seedance-1-0-pro-250528"
+ARK_SEEDANCE_ID = re.compile(r"^seedance[a-z0-9._-]*$")
+
+
+class UnsupportedModelError(ValueError):
+    """No backend can serve the requested model with the request's inputs and limits."""
+
+
+@dataclass(frozen=True)
+class ModelBackend:
+    """One model at one provider."""
+    provider: str  # "runware" or "ark"
+    model: str  # The provider's model ID
+    family: str  # Provider-independent model ID shared by interchangeable backends
+    generation_type: str  # "image", "video" or "audio"
+    modes: FrozenSet[str]
+    min_duration: Optional[int] = None  # Seconds, for video and audio
+    max_duration: Optional[int] = None
+    price_usd: float = 0.0  # Approximate list price per price unit
+    price_unit: str = "request"  # "request" or "second" (of output)
+    typical_latency_seconds: float = 60.0  # Prior until latencies are measured
+
+    @property
+    def key(self) -> str:
+        return f"{self.provider}/{self.model}"
+
+    def supports(self, mode: str, duration: Optional[int] = None) -> bool:
+        """Whether the backend can serve a request with this mode and duration."""
+        if mode not in self.modes:
+            return False
+        if duration is not None:
+            if self.min_duration is not None and duration < self.min_duration:
+                return False
+            if self.max_duration is not None and duration > self.max_duration:
+                return False
+        return True
+
+    def estimated_price(self, duration: Optional[int] = None) -> float:
+        """Approximate price of one request in USD."""
+        if self.price_unit == "second":
+            return self.price_usd * (duration or self.min_duration or 1)
+        return self.price_usd
+
+
+# Prices are approximate 720p list prices, only used to rank equivalent
+# backends; keep them roughly in line with the providers' pricing pages.
+MODEL_BACKENDS: List[ModelBackend] = [
+    # Seedance 1.0 Lite: Ark has separate text-to-video and image-to-video models
+    ModelBackend(
+        provider="ark", model="seedance-1-0-lite-t2v-250428", family="seedance-1-0-lite",
+        generation_type="video", modes=frozenset({TEXT_TO_VIDEO}),
+        min_duration=3, max_duration=12, price_usd=0.036, price_unit="second", typical_latency_seconds=60.0,
+    ),
+    ModelBackend(
+        provider="ark", model="seedance-1-0-lite-i2v-250428", family="seedance-1-0-lite",
+        generation_type="video", modes=frozenset({IMAGE_TO_VIDEO, FIRST_LAST_FRAME}),
+        min_duration=3, max_duration=12, price_usd=0.036, price_unit="second", typical_latency_seconds=60.0,
+    ),
+    ModelBackend(
+        provider="runware", model="bytedance:1@1", family="seedance-1-0-lite",
+        generation_type="video", modes=frozenset({TEXT_TO_VIDEO, IMAGE_TO_VIDEO, FIRST_LAST_FRAME}),
+        min_duration=3, max_duration=12, price_usd=0.032, price_unit="second", typical_latency_seconds=70.0,
+    ),
+    # Seedance 1.0 Pro
+    ModelBackend(
+        provider="ark", model="seedance-1-0-pro-250528", family="seedance-1-0-pro",
+        generation_type="video", modes=frozenset({TEXT_TO_VIDEO, IMAGE_TO_VIDEO, FIRST_LAST_FRAME}),
+        min_duration=3, max_duration=12, price_usd=0.05, price_unit="second", typical_latency_seconds=90.0,
+    ),
+    ModelBackend(
+        provider="runware", model="bytedance:2@1", family="seedance-1-0-pro",
+        generation_type="video", modes=frozenset({TEXT_TO_VIDEO, IMAGE_TO_VIDEO}),
+        min_duration=3, max_duration=12, price_usd=0.05, price_unit="second", typical_latency_seconds=100.0,
+    ),
+    # Images and audio are only available on Runware
+    ModelBackend(
+        provider="runware", model="google:4@1", family="google:4@1",
+        generation_type="image", modes=frozenset({TEXT_TO_IMAGE}),
+        price_usd=0.04, typical_latency_seconds=10.0,
+    ),
+    ModelBackend(
+        provider="runware", model="elevenlabs:1@1", family="elevenlabs:1@1",
+        generation_type="audio", modes=frozenset({TEXT_TO_AUDIO}),
+        min_duration=10, max_duration=300, price_usd=0.002, price_unit="second", typical_latency_seconds=20.0,
+    ),
+]
+
+_FAMILY_BY_MODEL: Dict[str, str] = {}
+for _backend in MODEL_BACKENDS:
+    _FAMILY_BY_MODEL[_backend.model] = _backend.family
+    _FAMILY_BY_MODEL[_backend.family] = _backend.family
+
+
+def generation_mode(generation_type: str, first_frame: Optional[str] = None, last_frame: Optional[str] = None) -> str:
+    """Get the generation mode of a request from its type and frame inputs."""
+    if generation_type == "image":
+        return TEXT_TO_IMAGE
+    if generation_type == "audio":
+        return TEXT_TO_AUDIO
+    if last_frame:
+        return FIRST_LAST_FRAME
+    if first_frame:
+        return IMAGE_TO_VIDEO
+    return TEXT_TO_VIDEO
+
+
+def candidate_backends(
+    generation_type: str,
+    model: Optional[str],
+    mode: str,
+    duration: Optional[int] = None,
+) -> List[ModelBackend]:
+    """
+    Get the backends that can serve a request, in registry order.
+
+    Args:
+        generation_type: "image", "video" or "audio"
+        model: Requested model family or provider model ID (default: DEFAULT_MODELS)
+        mode: Generation mode from generation_mode()
+        duration: Requested output duration in seconds, for video and audio
+
+    Returns:
+        Interchangeable backends supporting the request
+
+    Raises:
+        UnsupportedModelError: If no backend supports the request
+    """
+    if generation_type not in MODES_BY_TYPE:
+        raise UnsupportedModelError(f"Invalid generation type: {generation_type}")
+
+    model = model or DEFAULT_MODELS[generation_type]
+    family = _FAMILY_BY_MODEL.get(model)
+
+    if family is None:
+        # Runware hosts far more models than we register, and Ark releases new
+        # dated Seedance versions; pass their model IDs through unvalidated
+        if RUNWARE_AIR_ID.match(model):
+            provider = "runware"
+        elif ARK_SEEDANCE_ID.match(model) and generation_type == "video":
+            provider = "ark"
+        else:
+            raise UnsupportedModelError(f"Unknown {generation_type} model: {model}")
+        return [ModelBackend(
+            provider=provider, model=model, family=model, generation_type=generation_type,
+            modes=MODES_BY_TYPE[generation_type], typical_latency_seconds=DEFAULT_LATENCY_SECONDS[generation_type],
+        )]
+
+    backends = [
+        backend for backend in MODEL_BACKENDS
+        if backend.family == family and backend.generation_type == generation_type
+    ]
+    if not backends:
+        raise UnsupportedModelError(f"Model {model} does not generate {generation_type}")
+
+    supported = [backend for backend in backends if backend.supports(mode, duration)]
+    if not supported:
+        raise UnsupportedModelError(
+            f"Model {model} does not support {mode.replace('_', ' ')}"
+            + (f" with a duration of {duration}s" if duration is not None else "")
+        )
+    return supported
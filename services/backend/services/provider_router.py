@@ -0,0 +1,286 @@
+"""Latency, error and cost aware routing between equivalent model backends.
+
+For every backend the router keeps a rolling window of recent requests (at
+most PROVIDER_ROUTER_WINDOW_SIZE, none older than PROVIDER_ROUTER_WINDOW_SECONDS)
+and derives p50/p95 latency and the error rate from it. Candidates are ranked by
+expected cost of a successful request: p95 latency (or the registry's typical
+latency until enough samples exist) plus the price weighted by
+PROVIDER_ROUTER_COST_WEIGHT, divided by the success rate. Backends whose error
+rate reaches PROVIDER_ROUTER_ERROR_THRESHOLD are only tried after all others,
+until their failures age out of the window. A failed request fails over to the
+next candidate, up to PROVIDER_ROUTER_MAX_ATTEMPTS backends, unless the backend
+may have accepted it (OutcomeUnknownError): that request may still be rendered
+and billed, so it is not submitted again elsewhere.
+
+Statistics are kept per process, and generations run in the workers. Each
+attempt can also be returned as a sample, which the worker stores on the
+generation job, so summarize_samples can report the statistics of all workers.
+
+The clock is injectable, so the ranking and failover can be exercised with
+simulated backends (see scripts/simulate_provider_routing.py).
+"""
+import logging
+import math
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from services.provider_registry import ModelBackend
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class OutcomeUnknownError(Exception):
+    """The backend may have accepted the request (e.g. it timed out after submission), so it is not failed over."""
+
+
+class BackendStats:
+    """Rolling window of (finished at, seconds, succeeded) samples of one backend."""
+
+    def __init__(self, window_size: int, window_seconds: float, clock: Callable[[], float]):
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._samples: Deque[Tuple[float, float, bool]] = deque(maxlen=window_size)
+
+    def record(self, seconds: float, succeeded: bool) -> None:
+        self._samples.append((self._clock(), seconds, succeeded))
+
+    def _prune(self) -> None:
+        cutoff = self._clock() - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+
+    @property
+    def count(self) -> int:
+        self._prune()
+        return len(self._samples)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Latency of successful requests at the given percentile (nearest rank), or None without samples."""
+        self._prune()
+        latencies = sorted(seconds for _, seconds, succeeded in self._samples if succeeded)
+        if not latencies:
+            return None
+        return latencies[max(math.ceil(percentile / 100 * len(latencies)) - 1, 0)]
+
+    def error_rate(self) -> Optional[float]:
+        """Share of failed requests, or None without samples."""
+        self._prune()
+        if not self._samples:
+            return None
+        return sum(1 for _, _, succeeded in self._samples if not succeeded) / len(self._samples)
+
+
+class ProviderRouter:
+    """Ranks interchangeable backends and runs requests with failover."""
+
+    def __init__(
+        self,
+        window_size: int = settings.provider_router_window_size,
+        window_seconds: float = settings.provider_router_window_seconds,
+        min_samples: int = settings.provider_router_min_samples,
+        error_threshold: float = settings.provider_router_error_threshold,
+        cost_weight: float = settings.provider_router_cost_weight,
+        max_attempts: int = settings.provider_router_max_attempts,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window_size = window_size
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self.error_threshold = error_threshold
+        self.cost_weight = cost_weight
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self._stats: Dict[str, BackendStats] = {}
+        self._backends: Dict[str, ModelBackend] = {}
+
+    def stats(self, backend: ModelBackend) -> BackendStats:
+        stats = self._stats.get(backend.key)
+        if stats is None:
+            stats = BackendStats(self.window_size, self.window_seconds, self._clock)
+            self._stats[backend.key] = stats
+            self._backends[backend.key] = backend
+        return stats
+
+    def record(self, backend: ModelBackend, seconds: float, succeeded: bool) -> None:
+        """Record the outcome of a request to a backend."""
+        self.stats(backend).record(seconds, succeeded)
+
+    def _record_attempt(
+        self,
+        backend: ModelBackend,
+        started: float,
+        succeeded: bool,
+        samples: Optional[List[Dict[str, Any]]],
+    ) -> None:
+        seconds = self._clock() - started
+        self.record(backend, seconds, succeeded)
+        if samples is not None:
+            samples.append({
+                "backend": backend.key,
+                "seconds": round(seconds, 3),
+                "succeeded": succeeded,
+                "at": datetime.now(timezone.utc).isoformat(),
+            })
+
+    def is_degraded(self, backend: ModelBackend) -> bool:
+        """Whether the backend's recent error rate reached the threshold."""
+        stats = self.stats(backend)
+        return stats.count >= self.min_samples and stats.error_rate() >= self.error_threshold
+
+    def score(self, backend: ModelBackend, duration: Optional[int] = None) -> float:
+        """Expected cost of a successful request in latency-seconds; lower is better."""
+        stats = self.stats(backend)
+        latency = backend.typical_latency_seconds
+        error_rate = 0.0
+        if stats.count >= self.min_samples:
+            latency = stats.latency_percentile(95) or latency
+            error_rate = stats.error_rate()
+
+        expected = latency + self.cost_weight * backend.estimated_price(duration)
+        return expected / max(1.0 - error_rate, 0.05)
+
+    def rank(self, candidates: List[ModelBackend], duration: Optional[int] = None) -> List[ModelBackend]:
+        """
+        Order candidates by preference.
+
+        Args:
+            candidates: Interchangeable backends, in registry order
+            duration: Requested output duration in seconds, for per-second prices
+
+        Returns:
+            Healthy backends by score, then degraded backends by score; ties keep registry order
+        """
+        order = {backend.key: index for index, backend in enumerate(candidates)}
+        return sorted(
+            candidates,
+            key=lambda backend: (self.is_degraded(backend), self.score(backend, duration), order[backend.key]),
+        )
+
+    async def execute(
+        self,
+        candidates: List[ModelBackend],
+        invoke: Callable[[ModelBackend], Awaitable[Optional[str]]],
+        duration: Optional[int] = None,
+        samples: Optional[List[Dict[str, Any]]] = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Run a request on the best backend, failing over to the next ones.
+
+        Only requests that a backend rejected or reported as failed are failed over.
+        If invoke raises OutcomeUnknownError, the request is reported as failed
+        without trying another backend.
+
+        Args:
+            candidates: Interchangeable backends that support the request
+            invoke: Function running the request on a backend, returning the output URL or None
+            duration: Requested output duration in seconds
+            samples: Optional list receiving a sample (backend, seconds, succeeded, at) per attempt
+
+        Returns:
+            Tuple of (output URL, error message). Exactly one of them is set.
+
+        Raises:
+            Exception: The last error, if every attempted backend raised
+        """
+        attempts = self.rank(candidates, duration)[:max(self.max_attempts, 1)]
+        errors: List[str] = []
+        last_exception: Optional[Exception] = None
+        all_raised = True
+
+        for backend in attempts:
+            started = self._clock()
+            try:
+                url = await invoke(backend)
+            except OutcomeUnknownError as e:
+                self._record_attempt(backend, started, False, samples)
+                logger.warning(f"Generation on {backend.key} has an unknown outcome, not failing over: {e}")
+                errors.append(f"{backend.key}: {e}")
+                return None, f"{backend.generation_type.capitalize()} generation outcome unknown - {'; '.join(errors)}"
+            except Exception as e:
+                self._record_attempt(backend, started, False, samples)
+                logger.warning(f"Generation on {backend.key} failed: {e!r}")
+                errors.append(f"{backend.key}: {e}")
+                last_exception = e
+                continue
+
+            self._record_attempt(backend, started, bool(url), samples)
+            if url:
+                if errors:
+                    logger.info(f"Generation failed over to {backend.key} after: {'; '.join(errors)}")
+                return url, None
+
+            logger.warning(f"Generation on {backend.key} returned no output")
+            errors.append(f"{backend.key}: no output returned")
+            all_raised = False
+
+        # Unexpected errors everywhere propagate, so the generation job is retried later
+        if all_raised and last_exception is not None:
+            raise last_exception
+        return None, f"{attempts[0].generation_type.capitalize()} generation failed - {'; '.join(errors)}"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get routing statistics.
+
+        Returns:
+            Dictionary with latency percentiles, error rate and state per backend
+        """
+        backends = {}
+        for key, stats in self._stats.items():
+            backend = self._backends[key]
+            error_rate = stats.error_rate()
+            backends[key] = {
+                "family": backend.family,
+                "samples": stats.count,
+                "p50_seconds": stats.latency_percentile(50),
+                "p95_seconds": stats.latency_percentile(95),
+                "error_rate": round(error_rate, 3) if error_rate is not None else None,
+                "degraded": self.is_degraded(backend),
+                "score": round(self.score(backend), 1),
+            }
+        return {"backends": backends}
+
+
+def summarize_samples(
+    samples: Iterable[Dict[str, Any]],
+    window_size: int = settings.provider_router_window_size,
+    window_seconds: float = settings.provider_router_window_seconds,
+) -> Dict[str, Any]:
+    """
+    Get routing statistics of attempt samples recorded by any process (see ProviderRouter.execute).
+
+    Args:
+        samples: Attempt samples, oldest first
+        window_size: Most recent samples kept per backend
+        window_seconds: Age of the oldest sample kept
+
+    Returns:
+        Dictionary with sample count, latency percentiles and error rate per backend
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=window_seconds)
+    now = time.monotonic()
+    stats: Dict[str, BackendStats] = {}
+    for sample in samples:
+        if datetime.fromisoformat(sample["at"]) < cutoff:
+            continue
+        backend_stats = stats.setdefault(sample["backend"], BackendStats(window_size, window_seconds, lambda: now))
+        backend_stats.record(sample["seconds"], sample["succeeded"])
+
+    backends = {}
+    for key, backend_stats in stats.items():
+        error_rate = backend_stats.error_rate()
+        backends[key] = {
+            "samples": backend_stats.count,
+            "p50_seconds": backend_stats.latency_percentile(50),
+            "p95_seconds": backend_stats.latency_percentile(95),
+            "error_rate": round(error_rate, 3) if error_rate is not None else None,
+        }
+    return {"backends": backends}
+
+
+# Process-wide router; statistics are kept per process
+provider_router = ProviderRouter()
@@ -0,0 +1,218 @@
+"""Batch editing of a storyboard's scenes and shots.
+
+The operations of a batch are resolved in memory first (batch references,
+shot moves, deletes of rows added earlier in the same batch). The result is
+then written with a fixed number of bulk statements in the caller's
+transaction: a multi-row INSERT per table, executemany UPDATEs by primary key
+and a DELETE per table.
+"""
+from typing import Any, Dict, List, Sequence, Set, Type
+from sqlalchemy import delete, insert, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.base_model import BasicModel
+from models.storyboard_scene import StoryboardScene
+from models.shot import Shot
+from schemas.storyboard_v2_schemas import (
+    AddSceneOperation,
+    UpdateSceneOperation,
+    DeleteSceneOperation,
+    ReorderScenesOperation,
+    AddShotOperation,
+    UpdateShotOperation,
+    DeleteShotOperation,
+    ReorderShotsOperation,
+)
+
+
+class StoryboardBatchError(ValueError):
+    """An operation of a batch cannot be applied to the storyboard."""
+
+
+async def bulk_insert(session: AsyncSession, model: Type[BasicModel], objects: Sequence[BasicModel]) -> None:
+    """
+    Insert model instances with one multi-row INSERT, bypassing the unit of work.
+
+    IDs and timestamps are generated client-side, so the objects are complete
+    before the INSERT and nothing has to be read back.
+
+    Args:
+        session: Database session
+        model: Table model of the objects
+        objects: Instances to insert
+    """
+    if objects:
+        await session.execute(insert(model).values([obj.model_dump() for obj in objects]))
+
+
+async def apply_storyboard_operations(session: AsyncSession, storyboard_id: str, operations: List[Any]) -> Set[str]:
+    """
+    Apply batch operations to a storyboard's scenes and shots.
+
+    The caller verifies ownership of the storyboard and commits.
+
+    Args:
+        session: Database session
+        storyboard_id: ID of the storyboard
+        operations: Operations from StoryboardBatchRequest, applied in order
+
+    Returns:
+        IDs of existing shots whose status or video changed
+
+    Raises:
+        StoryboardBatchError: If an operation references a scene or shot outside the storyboard
+    """
+    statement = (
+        select(StoryboardScene.id, StoryboardScene.scene_number, Shot.id, Shot.shot_number)
+        .select_from(StoryboardScene)
+        .outerjoin(Shot, Shot.scene_id == StoryboardScene.id)
+        .where(StoryboardScene.storyboard_id == storyboard_id)
+    )
+    rows = (await session.exec(statement)).all()
+
+    scene_ids: Set[str] = {scene_id for scene_id, _, _, _ in rows}
+    shot_scenes: Dict[str, str] = {shot_id: scene_id for scene_id, _, shot_id, _ in rows if shot_id}
+    # Current numbers, so reorders can place the children they do not list
+    scene_numbers: Dict[str, int] = {scene_id: scene_number for scene_id, scene_number, _, _ in rows}
+    shot_numbers: Dict[str, int] = {shot_id: shot_number for _, _, shot_id, shot_number in rows if shot_id}
+
+    refs: Dict[str, str] = {}
+    new_scenes: Dict[str, StoryboardScene] = {}
+    new_shots: Dict[str, Shot] = {}
+    scene_updates: Dict[str, Dict[str, Any]] = {}
+    shot_updates: Dict[str, Dict[str, Any]] = {}
+    deleted_scenes: Set[str] = set()
+    deleted_shots: Set[str] = set()
+    changed_shots: Set[str] = set()
+
+    def resolve_scene(scene_id: str) -> str:
+        scene_id = refs.get(scene_id, scene_id)
+        if scene_id not in scene_ids:
+            raise StoryboardBatchError(f"Scene not found: {scene_id}")
+        return scene_id
+
+    def resolve_shot(shot_id: str) -> str:
+        shot_id = refs.get(shot_id, shot_id)
+        if shot_id not in shot_scenes:
+            raise StoryboardBatchError(f"Shot not found: {shot_id}")
+        return shot_id
+
+    def set_scene_values(scene_id: str, values: Dict[str, Any]) -> None:
+        if "scene_number" in values:
+            scene_numbers[scene_id] = values["scene_number"]
+        if scene_id in new_scenes:
+            for key, value in values.items():
+                setattr(new_scenes[scene_id], key, value)
+        else:
+            scene_updates.setdefault(scene_id, {}).update(values)
+
+    def set_shot_values(shot_id: str, values: Dict[str, Any]) -> None:
+        if "shot_number" in values:
+            shot_numbers[shot_id] = values["shot_number"]
+        if shot_id in new_shots:
+            for key, value in values.items():
+                setattr(new_shots[shot_id], key, value)
+        else:
+            shot_updates.setdefault(shot_id, {}).update(values)
+
+    def remove_shot(shot_id: str) -> None:
+        shot_scenes.pop(shot_id)
+        shot_numbers.pop(shot_id, None)
+        shot_updates.pop(shot_id, None)
+        changed_shots.discard(shot_id)
+        if new_shots.pop(shot_id, None) is None:
+            deleted_shots.add(shot_id)
+
+    def reorder(listed: List[str], children: Set[str], numbers: Dict[str, int], kind: str) -> List[str]:
+        """Listed children first, then the unlisted ones in their current order."""
+        if len(set(listed)) != len(listed):
+            raise StoryboardBatchError(f"{kind} listed more than once")
+        unlisted = sorted(children - set(listed), key=lambda child_id: (numbers.get(child_id, 0), child_id))
+        return listed + unlisted
+
+    for index, operation in enumerate(operations):
+        try:
+            if isinstance(operation, AddSceneOperation):
+                new_scene = StoryboardScene(
+                    storyboard_id=storyboard_id,
+                    scene_number=operation.scene_number,
+                    description=operation.description,
+                    duration=operation.duration,
+                )
+                new_scenes[new_scene.id] = new_scene
+                scene_ids.add(new_scene.id)
+                scene_numbers[new_scene.id] = new_scene.scene_number
+                if operation.ref:
+                    refs[operation.ref] = new_scene.id
+
+            elif isinstance(operation, UpdateSceneOperation):
+                values = operation.model_dump(exclude={"op", "scene_id"}, exclude_none=True)
+                set_scene_values(resolve_scene(operation.scene_id), values)
+
+            elif isinstance(operation, DeleteSceneOperation):
+                scene_id = resolve_scene(operation.scene_id)
+                for shot_id in [shot_id for shot_id, owner in shot_scenes.items() if owner == scene_id]:
+                    remove_shot(shot_id)
+                scene_ids.discard(scene_id)
+                scene_numbers.pop(scene_id, None)
+                scene_updates.pop(scene_id, None)
+                if new_scenes.pop(scene_id, None) is None:
+                    deleted_scenes.add(scene_id)
+
+            elif isinstance(operation, ReorderScenesOperation):
+                listed = [resolve_scene(scene_id) for scene_id in operation.scene_ids]
+                for scene_number, scene_id in enumerate(reorder(listed, scene_ids, scene_numbers, "Scene"), start=1):
+                    set_scene_values(scene_id, {"scene_number": scene_number})
+
+            elif isinstance(operation, AddShotOperation):
+                new_shot = Shot(
+                    scene_id=resolve_scene(operation.scene_id),
+                    shot_number=operation.shot_number,
+                    user_prompt=operation.user_prompt,
+                    start_image_url=operation.start_image_url,
+                    end_image_url=operation.end_image_url,
+                    status="pending",
+                )
+                new_shots[new_shot.id] = new_shot
+                shot_scenes[new_shot.id] = new_shot.scene_id
+                shot_numbers[new_shot.id] = new_shot.shot_number
+                if operation.ref:
+                    refs[operation.ref] = new_shot.id
+
+            elif isinstance(operation, UpdateShotOperation):
+                shot_id = resolve_shot(operation.shot_id)
+                values = operation.model_dump(exclude={"op", "shot_id"}, exclude_none=True)
+                set_shot_values(shot_id, values)
+                if shot_id not in new_shots and ("status" in values or "video_url" in values):
+                    changed_shots.add(shot_id)
+
+            elif isinstance(operation, DeleteShotOperation):
+                remove_shot(resolve_shot(operation.shot_id))
+
+            elif isinstance(operation, ReorderShotsOperation):
+                scene_id = resolve_scene(operation.scene_id)
+                listed = [resolve_shot(shot_id) for shot_id in operation.shot_ids]
+                children = {shot_id for shot_id, owner in shot_scenes.items() if owner == scene_id}
+                for shot_number, shot_id in enumerate(reorder(listed, children, shot_numbers, "Shot"), start=1):
+                    shot_scenes[shot_id] = scene_id
+                    set_shot_values(shot_id, {"scene_id": scene_id, "shot_number": shot_number})
+
+        except StoryboardBatchError as e:
+            raise StoryboardBatchError(f"Operation {index} ({operation.op}): {str(e)}") from e
+
+    # Shots are deleted first and scenes last, so moved shots never reference a deleted scene
+    if deleted_shots:
+        await session.execute(delete(Shot).where(Shot.id.in_(deleted_shots)))
+
+    await bulk_insert(session, StoryboardScene, list(new_scenes.values()))
+    if scene_updates:
+        await session.execute(update(StoryboardScene), [{"id": scene_id, **values} for scene_id, values in scene_updates.items()])
+
+    await bulk_insert(session, Shot, list(new_shots.values()))
+    if shot_updates:
+        await session.execute(update(Shot), [{"id": shot_id, **values} for shot_id, values in shot_updates.items()])
+
+    if deleted_scenes:
+        await session.execute(delete(StoryboardScene).where(StoryboardScene.id.in_(deleted_scenes)))
+
+    return changed_shots
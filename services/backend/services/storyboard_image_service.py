@@ -0,0 +1,61 @@
+"""Storyboard image service that generates shot images concurrently."""
+import asyncio
+import logging
+import weakref
+from typing import Dict, List, Optional, Tuple
+from dependencies.runware_dependencies import generate_image
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Limits in-flight image inferences across all users of this process
+_global_semaphore = asyncio.Semaphore(settings.storyboard_image_concurrency)
+
+# Limits in-flight image inferences per user, so one large board cannot starve the others.
+# Entries live only while a generate_shot_images call of the user holds the semaphore.
+_user_semaphores: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = weakref.WeakValueDictionary()
+
+
+def _get_user_semaphore(user_id: str) -> asyncio.Semaphore:
+    semaphore = _user_semaphores.get(user_id)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.storyboard_image_concurrency_per_user)
+        _user_semaphores[user_id] = semaphore
+    return semaphore
+
+
+async def generate_shot_images(
+    shots: List[Tuple[str, str]],
+    user_id: str,
+    model: str,
+    width: int,
+    height: int,
+) -> Dict[str, Optional[str]]:
+    """
+    Generate one image per shot, running the inferences concurrently.
+
+    Args:
+        shots: List of (shot_id, prompt) tuples
+        user_id: Database ID of the user the images are generated for
+        model: Image model to use
+        width: Image width in pixels
+        height: Image height in pixels
+
+    Returns:
+        Dictionary mapping shot ID to the generated image URL, or None if generation failed
+    """
+    user_semaphore = _get_user_semaphore(user_id)
+
+    async def generate(shot_id: str, prompt: str) -> Tuple[str, Optional[str]]:
+        async with user_semaphore, _global_semaphore:
+            try:
+                return shot_id, await generate_image(prompt=prompt, model=model, width=width, height=height)
+            except Exception as e:
+                # Mark shot as failed but continue with other shots
+                logger.error(f"Failed to generate image for shot {shot_id}: {str(e)}")
+                return shot_id, None
+
+    results = await asyncio.gather(*(generate(shot_id, prompt) for shot_id, prompt in shots))
+    return dict(results)
@@ -1,10 +1,11 @@
 """User service for managing database users linked to WorkOS."""
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.user import User
 from schemas.auth_schemas import UserProfile
 
 
-def get_or_create_user(session: Session, user_profile: UserProfile) -> User:
+async def get_or_create_user(session: AsyncSession, user_profile: UserProfile) -> User:
     """
     Get or create a database user from WorkOS user profile.
     
@@ -17,7 +18,7 @@ def get_or_create_user(session: Session, user_profile: UserProfile) -> User:
     """
     # Try to find existing user by workos_user_id
     statement = select(User).where(User.workos_user_id == user_profile.id)
-    user = session.exec(statement).first()
+    user = (await session.exec(statement)).first()
     
     if user:
         # Update user info if changed
@@ -42,8 +43,8 @@ def get_or_create_user(session: Session, user_profile: UserProfile) -> User:
         
         if updated:
             session.add(user)
-            session.commit()
-            session.refresh(user)
+            await session.commit()
+            await session.refresh(user)
         
         return user
     
@@ -63,8 +64,8 @@ def get_or_create_user(session: Session, user_profile: UserProfile) -> User:
     )
     
     session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    await session.commit()
+    await session.refresh(new_user)
     
     return new_user
 
@@ -1,4 +1,5 @@
 """WorkOS service for authentication and user management."""
+import asyncio
 from typing import Optional, Literal
 from workos import WorkOSClient
 from config import WORKOS_API_KEY, WORKOS_CLIENT_ID
@@ -85,7 +86,8 @@ async def get_user_profile(user_id: str) -> dict:
     Returns:
         User profile dictionary
     """
-    user = workos_client.user_management.get_user(user_id)
+    # The WorkOS SDK is synchronous, keep it off the event loop
+    user = await asyncio.to_thread(workos_client.user_management.get_user, user_id)
     
     return {
         "id": user.id,
@@ -117,7 +119,8 @@ async def update_user_profile(user_id: str, first_name: Optional[str] = None, la
     if last_name is not None:
         update_data["last_name"] = last_name
     
-    user = workos_client.user_management.update_user(
+    user = await asyncio.to_thread(
+        workos_client.user_management.update_user,
         user_id=user_id,
         **update_data
     )
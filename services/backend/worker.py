@@ -0,0 +1,207 @@
+"""Generation worker entry point.
+
+Pulls queued generation jobs from Postgres and runs them against the model
+providers, so API requests never wait on a generation. Mirror jobs copy the
+provider-hosted outputs of completed generations into our bucket, and derive
+jobs render thumbnails, poster frames and previews in a process pool.
+
+Usage:
+    python worker.py
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+from typing import Dict, List
+from db.session import engine, async_session_maker
+# Register every model the relationships refer to
+from models import asset, generation, generation_job, shot, storyboard, storyboard_scene, user  # noqa: F401
+from schemas.generation_schemas import GenerationRequest
+from services.generation_service import run_generation
+from services.output_mirror_service import mirror_to_s3, transfer_metrics
+from services.derivative_service import create_derivatives, shutdown_derivative_executor
+from dependencies.ark_task_poller import ark_task_poller
+from dependencies.http_client_dependencies import http_clients
+from dependencies.runware_pool import runware_pool
+from dependencies.runware_image_batcher import image_batcher
+from services.generation_job_service import (
+    claim_generation_job,
+    complete_generation_job,
+    complete_mirror_job,
+    complete_derive_job,
+    fail_generation_job,
+    heartbeat_generation_jobs,
+    requeue_stale_generation_jobs,
+)
+from config import get_settings
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# How often the worker looks for jobs abandoned by crashed workers
+STALE_JOB_SWEEP_INTERVAL_SECONDS = 60
+
+# Longest pause between queue polls while the database is unreachable
+DB_ERROR_MAX_BACKOFF_SECONDS = 30
+
+# How often the worker refreshes the locks of its in-flight jobs, well within the stale threshold
+JOB_HEARTBEAT_INTERVAL_SECONDS = min(60, settings.generation_job_stale_after_seconds / 3)
+
+
+async def process_mirror_job(job_id: str, worker_id: str, generation_id: str, payload: dict) -> None:
+    """Copy a generation's output into the bucket and point the generation at the copy."""
+    try:
+        result = await mirror_to_s3(generation_id, payload["source_url"])
+    except Exception as e:
+        logger.exception(f"Mirror job {job_id} failed")
+        async with async_session_maker() as session:
+            await fail_generation_job(session, job_id, worker_id, str(e))
+        return
+
+    async with async_session_maker() as session:
+        if not await complete_mirror_job(session, job_id, worker_id, result):
+            return
+
+    logger.info(
+        f"Mirror job {job_id} copied {result['bytes']} bytes to {result['s3_key']} in {result['seconds']}s "
+        f"(worker average {transfer_metrics.snapshot()['avg_throughput_mb_per_s']} MB/s)"
+    )
+
+
+async def process_derive_job(job_id: str, worker_id: str, payload: dict) -> None:
+    """Render and store the derivatives of a generation's or asset's media."""
+    try:
+        derivatives = await create_derivatives(payload["source_url"], payload["key_base"], payload["media_type"])
+    except Exception as e:
+        logger.exception(f"Derive job {job_id} failed")
+        async with async_session_maker() as session:
+            await fail_generation_job(session, job_id, worker_id, str(e))
+        return
+
+    async with async_session_maker() as session:
+        if not await complete_derive_job(session, job_id, worker_id, derivatives):
+            return
+
+    logger.info(f"Derive job {job_id} stored {len(derivatives)} derivatives for {payload['key_base']}")
+
+
+async def process_job(job_id: str, worker_id: str, payload: dict) -> None:
+    """Run one claimed job and store its result."""
+    samples: List[dict] = []
+    try:
+        request = GenerationRequest(**payload)
+        generated_content_url, error_message = await run_generation(request, samples)
+    except Exception as e:
+        logger.exception(f"Generation job {job_id} failed")
+        async with async_session_maker() as session:
+            await fail_generation_job(session, job_id, worker_id, str(e), routing_samples=samples)
+        return
+
+    async with async_session_maker() as session:
+        if not await complete_generation_job(
+            session, job_id, worker_id, generated_content_url, error_message, routing_samples=samples
+        ):
+            return
+
+    logger.info(f"Generation job {job_id} finished: {generated_content_url or error_message}")
+
+
+async def wait_for_stop(stop_event: asyncio.Event, timeout: float) -> None:
+    """Sleep for up to timeout seconds, waking up early on shutdown."""
+    try:
+        await asyncio.wait_for(stop_event.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+
+
+async def heartbeat(worker_id: str, in_flight: Dict[asyncio.Task, str]) -> None:
+    """Refresh the locks of the in-flight jobs until cancelled, so long jobs are not re-queued as stale."""
+    while True:
+        await asyncio.sleep(JOB_HEARTBEAT_INTERVAL_SECONDS)
+        if not in_flight:
+            continue
+        try:
+            async with async_session_maker() as session:
+                await heartbeat_generation_jobs(session, list(in_flight.values()), worker_id)
+        except Exception as e:
+            logger.error(f"Error refreshing the locks of {len(in_flight)} in-flight jobs: {e!r}")
+
+
+async def run_worker() -> None:
+    """Claim and run jobs until SIGINT/SIGTERM, keeping at most the configured number in flight."""
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    concurrency = settings.generation_worker_concurrency
+    in_flight: Dict[asyncio.Task, str] = {}  # Task -> ID of the job it runs
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await runware_pool.start()
+    logger.info(f"Generation worker {worker_id} started with concurrency {concurrency}")
+    heartbeat_task = asyncio.create_task(heartbeat(worker_id, in_flight))
+    last_sweep = 0.0
+    db_failures = 0  # Consecutive failed sweeps/claims
+
+    while not stop_event.is_set():
+        if len(in_flight) >= concurrency:
+            await asyncio.wait(in_flight.keys(), return_when=asyncio.FIRST_COMPLETED)
+            continue
+
+        # A transient database error (connection reset, failover) must not stop the worker
+        try:
+            if loop.time() - last_sweep >= STALE_JOB_SWEEP_INTERVAL_SECONDS:
+                async with async_session_maker() as session:
+                    requeued = await requeue_stale_generation_jobs(session)
+                if requeued:
+                    logger.warning(f"Re-queued {requeued} stale generation jobs")
+                last_sweep = loop.time()
+
+            async with async_session_maker() as session:
+                job = await claim_generation_job(session, worker_id)
+                claimed = (job.id, job.job_type, job.generation_id, job.payload) if job else None
+        except Exception as e:
+            db_failures += 1
+            backoff = min(settings.generation_worker_poll_interval * 2 ** db_failures, DB_ERROR_MAX_BACKOFF_SECONDS)
+            logger.error(f"Error polling the job queue (attempt {db_failures}), retrying in {backoff:.1f}s: {e!r}")
+            await wait_for_stop(stop_event, backoff)
+            continue
+        db_failures = 0
+
+        if not claimed:
+            await wait_for_stop(stop_event, settings.generation_worker_poll_interval)
+            continue
+
+        job_id, job_type, generation_id, payload = claimed
+        if job_type == "mirror":
+            task = asyncio.create_task(process_mirror_job(job_id, worker_id, generation_id, payload))
+        elif job_type == "derive":
+            task = asyncio.create_task(process_derive_job(job_id, worker_id, payload))
+        else:
+            task = asyncio.create_task(process_job(job_id, worker_id, payload))
+        in_flight[task] = job_id
+        task.add_done_callback(lambda done: in_flight.pop(done, None))
+
+    if in_flight:
+        logger.info(f"Waiting for {len(in_flight)} in-flight generation jobs to finish")
+        await asyncio.gather(*in_flight, return_exceptions=True)
+    heartbeat_task.cancel()
+
+    await asyncio.to_thread(shutdown_derivative_executor)
+    await image_batcher.close()
+    await runware_pool.close()
+    await ark_task_poller.close()
+    await http_clients.aclose()
+    await engine.dispose()
+    logger.info(f"Generation worker {worker_id} stopped")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())